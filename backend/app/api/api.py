@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, reports, media, social, comments, alerts, map_admin, ai_analysis, map_resources, map_data
+from app.api.v1.endpoints import auth, reports, media, social, comments, alerts, map_admin, ai_analysis, map_resources, map_data, metrics, webhooks
 
 api_router = APIRouter()
 
@@ -31,4 +31,10 @@ api_router.include_router(map_admin.router, prefix="/map", tags=["map"])
 api_router.include_router(map_resources.router, prefix="/map", tags=["map-resources"])
 
 #Map Data (Optimized for map view)
-api_router.include_router(map_data.router, prefix="/map", tags=["map-data"])
\ No newline at end of file
+api_router.include_router(map_data.router, prefix="/map", tags=["map-data"])
+
+#Admin metrics (DB pools, caches, background jobs)
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+
+#Webhooks (AWS SNS notifications)
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
\ No newline at end of file
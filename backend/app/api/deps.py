@@ -1,7 +1,9 @@
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.security import ALGORITHM
 from app.db.session import get_db
@@ -13,25 +15,101 @@ from typing import Optional
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
+# Resolved users keyed by token subject (email). Entries are detached snapshots that are
+# merged into the request session without a SELECT; mutating endpoints use
+# get_current_user_for_update, which always reads the row and drops the entry.
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """
+    Who is calling, straight from the token claims (no DB lookup).
+
+    Claims are a snapshot from when the token was issued: a deleted or demoted
+    user keeps them until the token expires, and district/state go stale until
+    the client stores the token returned by update-location. Use it only to scope
+    reads; endpoints that grant privileges or filter by the caller's current
+    location depend on get_current_user / get_current_user_optional instead.
+    """
+    id: int
+    email: str
+    role: str
+    district: Optional[str] = None
+    state: Optional[str] = None
+
+
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    
+        return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+def _principal_from_claims(payload: dict) -> Optional[TokenPrincipal]:
+    if "uid" not in payload or "role" not in payload:
+        return None
+    return TokenPrincipal(
+        id=payload["uid"], email=payload["sub"], role=payload["role"],
+        district=payload.get("district"), state=payload.get("state"),
+    )
+
+def _snapshot(user: User) -> User:
+    """Detached copy of the loaded column values, safe to share between requests"""
+    copy = User(**{c.key: getattr(user, c.key) for c in User.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
+
+def invalidate_cached_user(email: str):
+    _user_cache.delete(email)
+
+def user_cache_stats():
+    return _user_cache.stats()
+
+def _resolve_user(db: Session, email: str) -> Optional[User]:
+    cached = _user_cache.get(email)
+    if cached is not None:
+        # Attach a copy to this request's session; no round trip
+        return db.merge(cached, load=False)
+
     user = crud_user.get_user_by_email(db, email=email)
+    if user is not None:
+        _user_cache.set(email, _snapshot(user))
+    return user
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    payload = _decode_token(token)
+    if payload is None:
+        raise _credentials_exception()
+
+    user = _resolve_user(db, payload["sub"])
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    return user
+
+def get_current_user_for_update(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """Always reads the row; use on endpoints that change the user"""
+    payload = _decode_token(token)
+    if payload is None:
+        raise _credentials_exception()
+
+    invalidate_cached_user(payload["sub"])
+    user = crud_user.get_user_by_email(db, email=payload["sub"])
+    if user is None:
+        raise _credentials_exception()
     return user
 
 def get_current_user_optional(
@@ -40,12 +118,49 @@ def get_current_user_optional(
     """Optional authentication - returns None if no token or invalid token"""
     if not token:
         return None
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        user = crud_user.get_user_by_email(db, email=email)
-        return user
-    except JWTError:
-        return None
\ No newline at end of file
+    payload = _decode_token(token)
+    if payload is None:
+        return None
+    return _resolve_user(db, payload["sub"])
+
+def get_current_principal(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> TokenPrincipal:
+    """
+    Identity for read-only endpoints. Tokens that carry uid/role claims skip the
+    user lookup entirely; older tokens fall back to the cached lookup.
+    """
+    payload = _decode_token(token)
+    if payload is None:
+        raise _credentials_exception()
+
+    principal = _principal_from_claims(payload)
+    if principal is not None:
+        return principal
+
+    user = _resolve_user(db, payload["sub"])
+    if user is None:
+        raise _credentials_exception()
+    return principal_for(user)
+
+def get_current_principal_optional(
+    db: Session = Depends(get_db), token: Optional[str] = Depends(oauth2_scheme_optional)
+) -> Optional[TokenPrincipal]:
+    if not token:
+        return None
+    payload = _decode_token(token)
+    if payload is None:
+        return None
+
+    principal = _principal_from_claims(payload)
+    if principal is not None:
+        return principal
+
+    user = _resolve_user(db, payload["sub"])
+    return principal_for(user) if user else None
+
+def principal_for(user: User) -> TokenPrincipal:
+    return TokenPrincipal(
+        id=user.id, email=user.email, role=user.role,
+        district=user.district, state=user.state,
+    )
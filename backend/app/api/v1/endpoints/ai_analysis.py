@@ -1,83 +1,99 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-from geoalchemy2.shape import to_shape
+from sqlalchemy import text
 from app.db.session import get_db
 from app.api import deps
-from app.models.report import Report
 from app.models.user import User
-import math
+import json
 
 router = APIRouter()
 
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-    # Clamp 'a' to prevent floating-point errors causing domain error in asin
-    return R * 2 * math.asin(math.sqrt(min(1.0, a)))
+# Clusters are maintained incrementally by the cluster job; this only
+# aggregates their pending, scored members (one GROUP BY on reports.cluster_id).
+# Clusters the models have not analyzed yet fall back to their best member's verdict.
+# Scored pending reports the job has not attached yet (scored since its last
+# run, or older than its lookback) are listed as singleton rows so none drop
+# out of triage.
+CLUSTER_SUMMARY_SQL = text("""
+    WITH members AS (
+        SELECT
+            cluster_id,
+            ARRAY_AGG(id ORDER BY created_at, id)                                           AS report_ids,
+            AVG(ai_authenticity_score)                                                      AS avg_score,
+            MAX(created_at)                                                                 AS latest_report,
+            (ARRAY_AGG(ai_analysis_summary ORDER BY ai_authenticity_score DESC))[1]   AS best_summary,
+            (ARRAY_AGG(ai_analysis_breakdown ORDER BY ai_authenticity_score DESC))[1] AS best_breakdown
+        FROM reports
+        WHERE status = 'pending'
+          AND cluster_id IS NOT NULL
+          AND ai_authenticity_score IS NOT NULL
+        GROUP BY cluster_id
+    )
+    SELECT
+        'cluster'                                        AS kind,
+        c.id,
+        c.hazard_type,
+        c.center_lat,
+        c.center_lon,
+        c.max_severity,
+        COALESCE(c.authenticity_score, m.avg_score)      AS authenticity_score,
+        COALESCE(c.ai_summary, m.best_summary)           AS ai_summary,
+        COALESCE(c.analysis_breakdown, m.best_breakdown) AS analysis_breakdown,
+        m.report_ids,
+        m.latest_report
+    FROM report_clusters c
+    JOIN members m ON m.cluster_id = c.id
+
+    UNION ALL
+
+    SELECT
+        'report'                 AS kind,
+        r.id,
+        r.hazard_type,
+        ST_Y(r.location)         AS center_lat,
+        ST_X(r.location)         AS center_lon,
+        r.severity               AS max_severity,
+        r.ai_authenticity_score  AS authenticity_score,
+        r.ai_analysis_summary    AS ai_summary,
+        r.ai_analysis_breakdown  AS analysis_breakdown,
+        ARRAY[r.id]              AS report_ids,
+        r.created_at             AS latest_report
+    FROM reports r
+    WHERE r.status = 'pending'
+      AND r.cluster_id IS NULL
+      AND r.ai_authenticity_score IS NOT NULL
+
+    ORDER BY authenticity_score DESC
+""")
 
 @router.get("/clusters")
 def get_ai_cluster_summaries(
     db: Session = Depends(get_db),
     admin: User = Depends(deps.get_current_user)
 ):
-    # Get reports with AI scores
-    reports = db.query(Report).filter(
-        Report.ai_authenticity_score != None,  # noqa
-        Report.status == "pending"
-    ).all()
-
-    # Re-cluster for display
     clusters = []
-    assigned = set()
-
-    for i, report in enumerate(reports):
-        if i in assigned:
-            continue
-        shape = to_shape(report.location)
-        lat1, lon1 = shape.y, shape.x
-        cluster = [report]
-        assigned.add(i)
-
-        for j, other in enumerate(reports):
-            if j in assigned or j == i:
-                continue
-            other_shape = to_shape(other.location)
-            if haversine(lat1, lon1, other_shape.y, other_shape.x) <= 2.0:
-                if other.hazard_type == report.hazard_type:
-                    cluster.append(other)
-                    assigned.add(j)
-
-        # Use the highest-confidence score in the cluster
-        best = max(cluster, key=lambda r: r.ai_authenticity_score or 0)
-        avg_score = sum(r.ai_authenticity_score or 0 for r in cluster) / len(cluster)
-        
-        # Parse analysis breakdown from the best report
+    for row in db.execute(CLUSTER_SUMMARY_SQL).all():
+        # Parse analysis breakdown stored as JSON text
         analysis_breakdown = None
-        if best.ai_analysis_breakdown:
+        if row.analysis_breakdown:
             try:
-                import json
-                analysis_breakdown = json.loads(best.ai_analysis_breakdown)
-            except:
+                analysis_breakdown = json.loads(row.analysis_breakdown)
+            except ValueError:
                 pass
 
         clusters.append({
-            "cluster_id": f"cluster_{i}",
-            "hazard_type": report.hazard_type,
-            "report_count": len(cluster),
-            "report_ids": [r.id for r in cluster],
-            "center_lat": lat1,
-            "center_lon": lon1,
-            "ai_summary": best.ai_analysis_summary,
-            "authenticity_score": round(avg_score, 2),
+            "cluster_id": f"{row.kind}_{row.id}",
+            "hazard_type": row.hazard_type,
+            "report_count": len(row.report_ids),
+            "report_ids": list(row.report_ids),
+            "center_lat": row.center_lat,
+            "center_lon": row.center_lon,
+            "ai_summary": row.ai_summary,
+            "authenticity_score": round(row.authenticity_score or 0, 2),
             "analysis_breakdown": analysis_breakdown,
-            "max_severity": max(cluster, key=lambda r: ["low","medium","high","critical"].index(r.severity or "low")).severity,
-            "latest_report": max(cluster, key=lambda r: r.created_at).created_at.isoformat(),
+            "max_severity": row.max_severity,
+            "latest_report": row.latest_report.isoformat(),
         })
 
-    # Sort by authenticity score descending (most credible first)
-    clusters.sort(key=lambda c: c["authenticity_score"], reverse=True)
-    return clusters
\ No newline at end of file
+    # Already sorted by authenticity score descending (most credible first)
+    return clusters
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.api import deps
 from app.models.user  import User
 from app.models.alert import Alert
@@ -18,11 +20,13 @@ def require_admin(current_user: User = Depends(deps.get_current_user)) -> User:
 
 # GET alerts — filtered by user's location (district/state) or all if not authenticated
 @router.get("/", response_model=List[AlertResponse])
-def get_alerts(
-    db: Session = Depends(get_db),
+async def get_alerts(
+    db: AsyncSession = Depends(get_async_db),
+    # Resolved user rather than token claims: a citizen's district/state change
+    # takes effect immediately (update-location invalidates the cached user)
     current_user: Optional[User] = Depends(deps.get_current_user_optional)
 ):
-    query = db.query(Alert).filter(Alert.is_active == True)
+    query = select(Alert).options(joinedload(Alert.issued_by_admin)).filter(Alert.is_active == True)
 
     # Filter alerts based on user's location if authenticated
     if current_user and current_user.role == "citizen":
@@ -40,10 +44,9 @@ def get_alerts(
         if current_user.district and current_user.state:
             filters.append((Alert.district == current_user.district) & (Alert.state == current_user.state))
         
-        from sqlalchemy import or_
         query = query.filter(or_(*filters))
 
-    alerts = query.order_by(Alert.created_at.desc()).limit(20).all()
+    alerts = (await db.execute(query.order_by(Alert.created_at.desc()).limit(20))).scalars().all()
 
     result = []
     for a in alerts:
@@ -25,6 +25,19 @@ class OTPVerify(BaseModel):
     phone: str
     otp: str
 
+def _issue_token(user: User) -> str:
+    """JWT with role/district claims so read-only endpoints can skip the user lookup"""
+    return create_access_token(
+        data={
+            "sub": user.email,
+            "uid": user.id,
+            "role": user.role,
+            "district": user.district,
+            "state": user.state,
+        },
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
 @router.post("/google", response_model=Token)
 def google_login(payload: dict, db: Session = Depends(get_db)):
     """
@@ -72,10 +85,7 @@ def google_login(payload: dict, db: Session = Depends(get_db)):
         )
     
     # Issue JWT token - same as normal login
-    access_token = create_access_token(
-        data={"sub": user.email},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    access_token = _issue_token(user)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/signup", response_model=UserResponse)
@@ -109,10 +119,7 @@ def login(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm =
             detail="Admin accounts cannot login through citizen portal. Please use the Admin login."
         )
     
-    access_token = create_access_token(
-        data={"sub": user.email},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    access_token = _issue_token(user)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/admin-login", response_model=Token)
@@ -134,11 +141,9 @@ def admin_login(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestF
         user.profile_photo = "/Admin DP.jpeg"
         db.commit()
         db.refresh(user)
+        deps.invalidate_cached_user(user.email)
     
-    access_token = create_access_token(
-        data={"sub": user.email},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    access_token = _issue_token(user)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
@@ -147,20 +152,21 @@ def get_me(current_user: User = Depends(deps.get_current_user)):
 
 @router.patch("/me")
 def update_me(data: UserUpdate, db: Session = Depends(get_db), 
-              current_user: User = Depends(deps.get_current_user)):
+              current_user: User = Depends(deps.get_current_user_for_update)):
     if data.full_name     is not None: current_user.full_name     = data.full_name
     if data.profile_photo is not None: current_user.profile_photo = data.profile_photo
     if data.latitude      is not None: current_user.latitude      = data.latitude
     if data.longitude     is not None: current_user.longitude     = data.longitude
     db.commit()
     db.refresh(current_user)
+    deps.invalidate_cached_user(current_user.email)
     return current_user
 
 @router.patch("/update-location")
 def update_user_location(
     location_data: dict,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_user_for_update)
 ):
     """Update user's location (district and state) for location-based alerts"""
     district = location_data.get("district")
@@ -173,7 +179,12 @@ def update_user_location(
     current_user.state = state
     db.commit()
     db.refresh(current_user)
-    return {"message": "Location updated successfully", "district": district, "state": state}
+    deps.invalidate_cached_user(current_user.email)
+    # District/state travel in the token claims; hand back a token that matches
+    return {
+        "message": "Location updated successfully", "district": district, "state": state,
+        "access_token": _issue_token(current_user), "token_type": "bearer",
+    }
 
 # ── Phone Verification Endpoints ─────────────────────────────────────────────
 
@@ -181,7 +192,7 @@ def update_user_location(
 def send_otp(
     request: OTPRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_user_for_update)
 ):
     """Send OTP to user's phone number"""
     # Generate OTP
@@ -196,6 +207,7 @@ def send_otp(
     current_user.otp_expires_at = expires_at
     current_user.phone_verified = False
     db.commit()
+    deps.invalidate_cached_user(current_user.email)
     
     # Send SMS via AWS SNS
     success = send_otp_sms(request.phone, otp)
@@ -209,7 +221,7 @@ def send_otp(
 def verify_otp(
     request: OTPVerify,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_user_for_update)
 ):
     """Verify OTP and mark phone as verified"""
     # Check if OTP exists and matches
@@ -230,6 +242,7 @@ def verify_otp(
     current_user.otp_expires_at = None
     db.commit()
     db.refresh(current_user)
+    deps.invalidate_cached_user(current_user.email)
     
     return {"message": "Phone verified successfully", "phone_verified": True}
 
@@ -238,7 +251,7 @@ def verify_otp(
 @router.delete("/me")
 def delete_account(
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_user_for_update)
 ):
     """
     Delete user account permanently
@@ -259,6 +272,7 @@ def delete_account(
             detail="Admin accounts cannot be deleted through this endpoint. Contact system administrator."
         )
     
+    email = current_user.email
     try:
         # Delete all user's report confirmations
         db.query(ReportConfirmation).filter(
@@ -278,6 +292,7 @@ def delete_account(
         # Delete the user account
         db.delete(current_user)
         db.commit()
+        deps.invalidate_cached_user(email)
         
         return {"message": "Account deleted successfully"}
     except Exception as e:
@@ -1,6 +1,9 @@
+from collections import defaultdict
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.db.session import get_db, get_async_db
 from app.api import deps
 from app.models.user import User
 from app.models.comment import Comment
@@ -9,42 +12,44 @@ from typing import List
 
 router = APIRouter()
 
+def _comment_response(c: Comment) -> CommentResponse:
+    return CommentResponse(
+        id=c.id,
+        report_id=c.report_id,
+        user_id=c.user_id,
+        parent_id=c.parent_id,
+        content=c.content,
+        created_at=c.created_at,
+        author_name=c.author.full_name if c.author else "Unknown",
+        author_profile_photo=c.author.profile_photo if c.author else None,
+        author_role=c.author.role if c.author else None
+    )
+
 @router.get("/{report_id}/comments", response_model=List[CommentResponse])
-def get_comments(report_id: int, db: Session = Depends(get_db)):
-    # Get only top-level comments (no parent_id)
-    comments = db.query(Comment).filter(
-        Comment.report_id == report_id,
-        Comment.parent_id == None
-    ).order_by(Comment.created_at.asc()).all()
+async def get_comments(report_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Load the whole thread with authors in two queries, then nest in memory
+    comments = (await db.execute(
+        select(Comment)
+        .options(selectinload(Comment.author))
+        .filter(Comment.report_id == report_id)
+        .order_by(Comment.created_at.asc())
+    )).scalars().all()
+    
+    replies_by_parent = defaultdict(list)
+    for c in comments:
+        if c.parent_id is not None:
+            replies_by_parent[c.parent_id].append(c)
     
     result = []
+    # Top-level comments (no parent_id), each followed by its replies
     for c in comments:
-        result.append(CommentResponse(
-            id=c.id,
-            report_id=c.report_id,
-            user_id=c.user_id,
-            parent_id=c.parent_id,
-            content=c.content,
-            created_at=c.created_at,
-            author_name=c.author.full_name if c.author else "Unknown",
-            author_profile_photo=c.author.profile_photo if c.author else None,
-            author_role=c.author.role if c.author else None
-        ))
+        if c.parent_id is not None:
+            continue
+        result.append(_comment_response(c))
         
         # Add replies (nested comments)
-        if hasattr(c, 'replies') and c.replies:
-            for reply in sorted(c.replies, key=lambda r: r.created_at):
-                result.append(CommentResponse(
-                    id=reply.id,
-                    report_id=reply.report_id,
-                    user_id=reply.user_id,
-                    parent_id=reply.parent_id,
-                    content=reply.content,
-                    created_at=reply.created_at,
-                    author_name=reply.author.full_name if reply.author else "Unknown",
-                    author_profile_photo=reply.author.profile_photo if reply.author else None,
-                    author_role=reply.author.role if reply.author else None
-                ))
+        for reply in replies_by_parent.get(c.id, []):
+            result.append(_comment_response(reply))
     
     return result
 
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.api import deps
 from app.models.user           import User
 from app.models.map_annotation import MapAnnotation, DeployedForce
 from app.models.report         import Report
-from geoalchemy2.shape         import to_shape
 from app.models.map_annotation import DeployedForce
+from app.services.map_cache    import bump_map_version, get_map_snapshot, snapshot_response
 
 router = APIRouter()
 
@@ -44,37 +46,52 @@ class ForceUpdate(BaseModel):
 
 # ── Map data endpoint (public — for citizen map page) ────────────────────────
 @router.get("/data")
-def get_map_data(db: Session = Depends(get_db)):
+async def get_map_data(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Returns everything needed to render the full map:
     - Verified report clusters
     - Rescue centers / affected zones
     - Deployed forces (anonymized count only for citizens)
-    """
-    # 1. Verified reports clustered
-    verified_reports = db.query(Report).filter(
-        Report.status == "verified"
-    ).all()
 
-    report_points = []
-    for r in verified_reports:
-        if r.location:
-            shape = to_shape(r.location)
-            report_points.append({
-                "id":           r.id,
-                "lat":          shape.y,
-                "lon":          shape.x,
-                "hazard_type":  r.hazard_type,
-                "severity":     r.severity,
-                "description":  r.description,
-                "created_at":   r.created_at.isoformat() if r.created_at else None,
-                "ai_score":     r.ai_authenticity_score,
-            })
+    Served from a versioned snapshot with ETag/Last-Modified; the DB is only
+    hit when a map-visible write has happened since the last build.
+    """
+    snapshot = await get_map_snapshot("map_data", lambda: _build_map_data(db))
+    return snapshot_response(request, snapshot)
+
+async def _build_map_data(db: AsyncSession) -> dict:
+    # 1. Verified reports clustered (coordinates read in SQL, no WKB decoding)
+    verified_reports = (await db.execute(
+        select(
+            Report.id,
+            func.ST_Y(Report.location).label("lat"),
+            func.ST_X(Report.location).label("lon"),
+            Report.hazard_type,
+            Report.severity,
+            Report.description,
+            Report.created_at,
+            Report.ai_authenticity_score,
+        ).where(
+            Report.status == "verified",
+            Report.location.isnot(None)
+        )
+    )).all()
+
+    report_points = [{
+        "id":           r.id,
+        "lat":          r.lat,
+        "lon":          r.lon,
+        "hazard_type":  r.hazard_type,
+        "severity":     r.severity,
+        "description":  r.description,
+        "created_at":   r.created_at.isoformat() if r.created_at else None,
+        "ai_score":     r.ai_authenticity_score,
+    } for r in verified_reports]
 
     # 2. Admin annotations
-    annotations = db.query(MapAnnotation).filter(
-        MapAnnotation.is_active == True
-    ).all()
+    annotations = (await db.execute(
+        select(MapAnnotation).where(MapAnnotation.is_active == True)
+    )).scalars().all()
 
     annotation_data = [{
         "id":          a.id,
@@ -88,9 +105,9 @@ def get_map_data(db: Session = Depends(get_db)):
     } for a in annotations]
 
     # 3. Deployed forces (public summary only)
-    forces = db.query(DeployedForce).filter(
-        DeployedForce.is_active == True
-    ).all()
+    forces = (await db.execute(
+        select(DeployedForce).where(DeployedForce.is_active == True)
+    )).scalars().all()
 
     force_data = [{
         "id":              f.id,
@@ -130,6 +147,7 @@ def add_annotation(
     db.add(ann)
     db.commit()
     db.refresh(ann)
+    bump_map_version()
     return {"id": ann.id, "message": "Annotation added"}
 
 @router.delete("/annotations/{ann_id}")
@@ -143,6 +161,7 @@ def remove_annotation(
         raise HTTPException(status_code=404, detail="Not found")
     ann.is_active = False
     db.commit()
+    bump_map_version()
     return {"message": "Removed"}
 
 # ── Admin: Deployed Forces CRUD ──────────────────────────────────────────────
@@ -187,6 +206,7 @@ def deploy_force(
     db.add(force)
     db.commit()
     db.refresh(force)
+    bump_map_version()
     return {"id": force.id, "message": "Force deployed"}
 
 @router.patch("/forces/{force_id}")
@@ -206,6 +226,7 @@ def update_force(
     if data.equipment is not None:
         force.equipment = data.equipment
     db.commit()
+    bump_map_version()
     return {"message": "Updated"}
 
 @router.delete("/forces/{force_id}")
@@ -219,4 +240,5 @@ def withdraw_force(
         raise HTTPException(status_code=404, detail="Not found")
     force.is_active = False
     db.commit()
+    bump_map_version()
     return {"message": "Force withdrawn"}
\ No newline at end of file
@@ -1,21 +1,44 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, get_async_db
 from app.models.report import Report
+from app.services.map_cache import get_map_snapshot, snapshot_response
 from typing import List
 
 router = APIRouter()
 
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+WEB_MERCATOR_WORLD_M = 40075016.685578488  # EPSG:3857 world width in metres
+
 @router.get("/map-reports")
-def get_map_reports(db: Session = Depends(get_db)):
+async def get_map_reports(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Optimized endpoint for map - returns only verified reports with minimal data
     No joins, no media, no comments - just coordinates and basic info
+    Served from a versioned snapshot with ETag/Last-Modified (304 when unchanged)
     """
-    reports = db.query(Report).filter(
-        Report.status == "verified",
-        Report.location.isnot(None)
-    ).all()
+    snapshot = await get_map_snapshot("map_reports", lambda: _build_map_reports(db))
+    return snapshot_response(request, snapshot)
+
+async def _build_map_reports(db: AsyncSession) -> list:
+    reports = (await db.execute(
+        select(
+            Report.id,
+            Report.hazard_type,
+            Report.description,
+            Report.severity,
+            func.ST_Y(Report.location).label("latitude"),
+            func.ST_X(Report.location).label("longitude"),
+            Report.status,
+            Report.created_at,
+        ).where(
+            Report.status == "verified",
+            Report.location.isnot(None)
+        )
+    )).all()
     
     # Return minimal data for map markers
     return [
@@ -32,3 +55,184 @@ def get_map_reports(db: Session = Depends(get_db)):
         for r in reports
         if r.latitude and r.longitude and r.latitude != 0 and r.longitude != 0
     ]
+
+# ── Vector tiles ─────────────────────────────────────────────────────────────
+# Below MAP_POINTS_MIN_ZOOM a tile carries one feature per grid cell
+# ("report_cells": count + per-hazard counts); from that zoom up it carries
+# the individual verified reports ("reports") without descriptions.
+
+TILE_CELLS_SQL = text("""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+    ),
+    points AS (
+        SELECT r.hazard_type, ST_Transform(r.location, 3857) AS geom
+        FROM reports r, bounds b
+        WHERE r.status = 'verified'
+          AND r.location IS NOT NULL
+          AND r.location && ST_Transform(b.geom, 4326)
+    ),
+    hazard_cells AS (
+        SELECT
+            floor(ST_X(geom) / :cell_m) AS cx,
+            floor(ST_Y(geom) / :cell_m) AS cy,
+            hazard_type,
+            COUNT(*) AS n,
+            ST_Collect(geom) AS geom
+        FROM points
+        GROUP BY 1, 2, 3
+    ),
+    cells AS (
+        SELECT
+            SUM(n)::int AS count,
+            jsonb_object_agg(hazard_type, n) AS hazards,
+            ST_Centroid(ST_Collect(geom)) AS geom
+        FROM hazard_cells
+        GROUP BY cx, cy
+    ),
+    mvt AS (
+        SELECT ST_AsMVTGeom(c.geom, b.geom) AS geom, c.count, c.hazards
+        FROM cells c, bounds b
+    )
+    SELECT ST_AsMVT(mvt, 'report_cells', 4096, 'geom') FROM mvt
+""")
+
+TILE_POINTS_SQL = text("""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+    ),
+    mvt AS (
+        SELECT
+            ST_AsMVTGeom(ST_Transform(r.location, 3857), b.geom) AS geom,
+            r.id,
+            r.hazard_type,
+            r.severity,
+            r.ai_authenticity_score AS ai_score,
+            to_char(r.created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"') AS created_at
+        FROM reports r, bounds b
+        WHERE r.status = 'verified'
+          AND r.location IS NOT NULL
+          AND r.location && ST_Transform(b.geom, 4326)
+    )
+    SELECT ST_AsMVT(mvt, 'reports', 4096, 'geom') FROM mvt
+""")
+
+@router.get("/tiles/{z}/{x}/{y}.mvt")
+def get_report_tile(z: int, x: int, y: int, db: Session = Depends(get_db)):
+    """Mapbox Vector Tile of verified reports: grid aggregates at low zoom, points at high zoom"""
+    if not 0 <= z <= 22 or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+        raise HTTPException(status_code=400, detail="Invalid tile coordinates")
+
+    params = {"z": z, "x": x, "y": y}
+    if z >= settings.MAP_POINTS_MIN_ZOOM:
+        tile = db.execute(TILE_POINTS_SQL, params).scalar()
+    else:
+        params["cell_m"] = WEB_MERCATOR_WORLD_M / (2 ** z) / settings.MAP_GRID_CELLS_PER_TILE
+        tile = db.execute(TILE_CELLS_SQL, params).scalar()
+
+    return Response(content=bytes(tile or b""), media_type=MVT_MEDIA_TYPE)
+
+# ── Viewport JSON ────────────────────────────────────────────────────────────
+
+VIEWPORT_CELLS_SQL = text("""
+    WITH points AS (
+        SELECT hazard_type, ST_Y(location) AS lat, ST_X(location) AS lon
+        FROM reports
+        WHERE status = 'verified'
+          AND location IS NOT NULL
+          AND location && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)
+    ),
+    hazard_cells AS (
+        SELECT
+            floor(lat / :cell_deg) AS cy,
+            floor(lon / :cell_deg) AS cx,
+            hazard_type,
+            COUNT(*) AS n,
+            SUM(lat) AS sum_lat,
+            SUM(lon) AS sum_lon
+        FROM points
+        GROUP BY 1, 2, 3
+    )
+    SELECT
+        SUM(sum_lat) / SUM(n) AS lat,
+        SUM(sum_lon) / SUM(n) AS lon,
+        SUM(n)::int AS count,
+        jsonb_object_agg(hazard_type, n) AS hazards
+    FROM hazard_cells
+    GROUP BY cy, cx
+""")
+
+VIEWPORT_POINTS_SQL = text("""
+    SELECT
+        id,
+        ST_Y(location) AS lat,
+        ST_X(location) AS lon,
+        hazard_type,
+        severity,
+        ai_authenticity_score AS ai_score,
+        created_at
+    FROM reports
+    WHERE status = 'verified'
+      AND location IS NOT NULL
+      AND location && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)
+    ORDER BY created_at DESC
+    LIMIT :limit
+""")
+
+@router.get("/viewport")
+def get_viewport_reports(
+    min_lon: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    zoom: int = Query(..., ge=0, le=22),
+    db: Session = Depends(get_db)
+):
+    """
+    JSON variant of the tile endpoint for a bbox + zoom.
+    Returns grid aggregates (count + hazard breakdown per cell) below
+    MAP_POINTS_MIN_ZOOM, and individual verified reports at or above it.
+    """
+    if min_lon >= max_lon or min_lat >= max_lat:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+
+    bbox = {"min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat}
+
+    if zoom >= settings.MAP_POINTS_MIN_ZOOM:
+        limit = settings.MAP_MAX_VIEWPORT_POINTS
+        rows = db.execute(VIEWPORT_POINTS_SQL, {**bbox, "limit": limit}).all()
+        return {
+            "mode": "points",
+            "zoom": zoom,
+            "truncated": len(rows) == limit,
+            "reports": [
+                {
+                    "id":          row.id,
+                    "lat":         row.lat,
+                    "lon":         row.lon,
+                    "hazard_type": row.hazard_type,
+                    "severity":    row.severity,
+                    "ai_score":    row.ai_score,
+                    "created_at":  row.created_at.isoformat() if row.created_at else None,
+                }
+                for row in rows
+            ],
+        }
+
+    # Same cell size as a tile at this zoom, expressed in degrees
+    cell_deg = 360.0 / (2 ** zoom) / settings.MAP_GRID_CELLS_PER_TILE
+    rows = db.execute(VIEWPORT_CELLS_SQL, {**bbox, "cell_deg": cell_deg}).all()
+    return {
+        "mode": "grid",
+        "zoom": zoom,
+        "cell_size_deg": cell_deg,
+        "cells": [
+            {
+                "lat":     row.lat,
+                "lon":     row.lon,
+                "count":   row.count,
+                "hazards": row.hazards,
+            }
+            for row in rows
+        ],
+    }
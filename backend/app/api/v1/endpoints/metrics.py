@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.models.user import User
+from app.db.session import get_db, get_pool_stats
+
+router = APIRouter()
+
+def require_admin(current_user: User = Depends(deps.get_current_user)) -> User:
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    return current_user
+
+# 1. DATABASE POOLS (checkout wait, saturation, connection age)
+@router.get("/db-pools")
+def get_db_pool_metrics(admin: User = Depends(require_admin)):
+    return get_pool_stats()
+
+# 2. JOB QUEUE DEPTH (queued/running/dead per kind, oldest due job)
+@router.get("/jobs")
+def get_job_queue_metrics(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+    from app.services.job_queue import queue_stats
+    return queue_stats(db)
+
+# 3. EVERYTHING (pools + job queue + in-process caches + last background runs)
+@router.get("/")
+def get_metrics(db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+    from app.api.v1.endpoints.reports import _stats_cache
+    from app.services import alert_fanout, cluster_analyzer, context_verifier, map_cache, media_fetch, verdict_cache
+    from app.services.job_queue import queue_stats
+    from scripts.harvest_social import last_harvest_stats
+
+    return {
+        "db_pools": get_pool_stats(),
+        "job_queue": queue_stats(db),
+        "caches": {
+            "report_stats": _stats_cache.stats(),
+            "map_snapshots": map_cache._snapshots.stats(),
+            "users": deps.user_cache_stats(),
+            "weather": context_verifier.weather_cache_stats(),
+            "media": media_fetch.media_cache_stats(),
+            "ai_verdicts": verdict_cache.verdict_cache_stats(),
+        },
+        "alert_fanout": alert_fanout.last_fanout_stats,
+        "cluster_analysis": cluster_analyzer.last_run_stats,
+        "social_harvest": last_harvest_stats,
+    }
@@ -1,34 +1,30 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Response
 import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.api import deps
 from app.crud import report as crud_report
+from app.crud.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
 from app.schemas.report import ReportCreate, ReportResponse
 from app.models.report import Report
 from app.models.user import User
-from app.db.session import SessionLocal, get_db
-import math
+from app.db.session import BackgroundSessionLocal, get_db, get_async_db
+from app.core.cache import TTLCache
+from app.core.config import settings
 import logging
-from app.services.bedrock_ai import analyze_single_report
-from app.services.aws_services import send_disaster_alert_email
-from geoalchemy2.functions import ST_DWithin, ST_MakePoint, ST_SetSRID
+from app.services.alert_fanout import fan_out_disaster_alert
+from app.services.spatial_clustering import find_hotspots
+from app.services.map_cache import bump_map_version
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-#HELPERS
+# Per-district /stats aggregates (user_confirmed is resolved per request)
+_stats_cache = TTLCache(maxsize=256, ttl=settings.STATS_CACHE_TTL_SECONDS)
 
-def calculate_distance(lat1, lon1, lat2, lon2):
-    R = 6371.0
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (math.sin(dlat / 2) ** 2 +
-         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-         math.sin(dlon / 2) ** 2)
-    # Clamp to prevent floating-point errors causing domain error in atan2
-    return R * 2 * math.atan2(math.sqrt(min(1.0, a)), math.sqrt(1 - min(1.0, a)))
+#HELPERS
 
 def send_disaster_alerts_to_nearby_users(
     report_id: int,
@@ -40,88 +36,29 @@ def send_disaster_alerts_to_nearby_users(
     radius_km: float = 100.0  # Alert users within 100km
 ):
     """Send email alerts to users near the disaster location"""
-    db = SessionLocal()
     try:
-        # Get all users with verified emails and phone numbers (active citizens)
-        users = db.query(User).filter(
-            User.role == "citizen",
-            User.is_active == True,
-            User.email.isnot(None)
-        ).all()
-        
-        # Find users within radius
-        alerted_count = 0
-        for user in users:
-            # Skip if user doesn't have location set
-            if not user.district or not user.state:
-                continue
-            
-            # For now, send to all users in the same state
-            # TODO: Implement proper distance calculation based on user's exact location
-            # For MVP, we'll use state-level filtering
-            
-            # Get report owner's state (if available)
-            report = db.query(Report).filter(Report.id == report_id).first()
-            if not report or not report.owner:
-                continue
-                
-            report_state = report.owner.state
-            
-            # Send email if user is in the same state
-            if user.state == report_state:
-                location_str = f"{report_lat:.4f}°N, {report_lon:.4f}°E"
-                success = send_disaster_alert_email(
-                    to_email=user.email,
-                    user_name=user.full_name or "User",
-                    disaster_type=hazard_type,
-                    location=location_str,
-                    severity=severity,
-                    description=description
-                )
-                if success:
-                    alerted_count += 1
-        
-        print(f"✓ Sent {alerted_count} disaster alert emails")
+        fan_out_disaster_alert(
+            report_id, hazard_type, report_lat, report_lon,
+            severity, description, radius_km=radius_km
+        )
     except Exception as e:
-        print(f"Error sending disaster alerts: {e}")
-    finally:
-        db.close()
+        logger.error(f"Error sending disaster alerts: {e}")
 
-def cluster_reports(reports, max_distance_km=80.0):
-    clusters = []
-    visited = set()
-    for i, report in enumerate(reports):
-        if i in visited:
-            continue
-        cluster = {
-            "center_lat": report.latitude,
-            "center_lon": report.longitude,
-            "hazard_type": report.hazard_type,
-            "severity": report.severity,
-            "report_count": 1,
-            "reports": [report.id]
-        }
-        visited.add(i)
-        for j, other in enumerate(reports):
-            if j not in visited and other.hazard_type == report.hazard_type:
-                dist = calculate_distance(
-                    report.latitude, report.longitude,
-                    other.latitude, other.longitude
-                )
-                if dist <= max_distance_km:
-                    cluster["report_count"] += 1
-                    cluster["reports"].append(other.id)
-                    visited.add(j)
-                    n = cluster["report_count"]
-                    cluster["center_lat"] = ((cluster["center_lat"] * (n - 1)) + other.latitude) / n
-                    cluster["center_lon"] = ((cluster["center_lon"] * (n - 1)) + other.longitude) / n
-                    if cluster["report_count"] >= 3:
-                        cluster["severity"] = "critical"
-        clusters.append(cluster)
-    return clusters
+def _parse_cursor(cursor: Optional[str]):
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _set_next_cursor(response: Response, rows, limit: int):
+    token = next_cursor(rows, limit)
+    if token:
+        response.headers[NEXT_CURSOR_HEADER] = token
 
 def analyze_report_with_ai(report_id: int, text: str, image_url: str):
-    db = SessionLocal()
+    db = BackgroundSessionLocal()
     try:
         ml_api_url = "http://ml-service:8000/api/v1/analyze/report"
         with httpx.Client() as client:
@@ -147,46 +84,27 @@ def analyze_report_with_ai(report_id: int, text: str, image_url: str):
 @router.get("/stats")
 def get_report_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: deps.TokenPrincipal = Depends(deps.get_current_principal)
 ):
-    from app.models.confirmation import ReportConfirmation
-    
-    # Base query
-    query = db.query(Report)
-    
     # Filter by admin's district if admin role
+    district = None
     if current_user.role == "admin" and current_user.district:
-        query = query.filter(Report.district.ilike(f"%{current_user.district}%"))
-    
-    # Get SOS triggers (critical severity reports)
-    sos_triggers = query.filter(Report.severity == "critical").all()
+        district = current_user.district
     
-    # Get active hazards by type
-    hazard_counts = {}
-    for report in query.filter(Report.status != "false").all():
-        hazard_counts[report.hazard_type] = hazard_counts.get(report.hazard_type, 0) + 1
+    # Aggregates are shared per district for a few seconds; dashboards poll this
+    stats = _stats_cache.get_or_set(
+        district, lambda: crud_report.get_report_stats(db, district=district)
+    )
     
+    confirmed_ids = crud_report.get_confirmed_report_ids(
+        db, current_user.id, [t["id"] for t in stats["sos_triggers"]]
+    )
     return {
+        **stats,
         "sos_triggers": [
-            {
-                "id": r.id,
-                "hazard_type": r.hazard_type,
-                "description": r.description,
-                "latitude": r.latitude,
-                "longitude": r.longitude,
-                "created_at": r.created_at,
-                "reporter_name": r.owner.full_name if r.owner else "Anonymous",
-                "reporter_profile_photo": r.owner.profile_photo if r.owner else None,
-                "user_confirmed": db.query(ReportConfirmation).filter(
-                    ReportConfirmation.report_id == r.id,
-                    ReportConfirmation.user_id == current_user.id
-                ).first() is not None
-            }
-            for r in sos_triggers
+            {**t, "user_confirmed": t["id"] in confirmed_ids}
+            for t in stats["sos_triggers"]
         ],
-        "total_sos": len(sos_triggers),
-        "hazard_breakdown": hazard_counts,
-        "total_active": query.filter(Report.status != "false").count()
     }
 
 # 2. GET HOTSPOTS
@@ -194,21 +112,19 @@ def get_report_stats(
 def get_hazard_hotspots(
     db: Session = Depends(get_db),
     radius_km: float = Query(80.0),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: deps.TokenPrincipal = Depends(deps.get_current_principal)
 ):
-    # Filter reports by admin's district if admin role
-    query = db.query(Report).filter(Report.status != "false")
+    # Admin sees only reports in their district (partial match)
+    district = None
     if current_user.role == "admin" and current_user.district:
-        # Admin sees only reports in their district (partial match)
-        query = query.filter(Report.district.ilike(f"%{current_user.district}%"))
+        district = current_user.district
     
-    active_reports = query.all()
-    if not active_reports:
+    # Clustering runs inside PostGIS (ST_ClusterDBSCAN, partitioned by hazard type)
+    total_active, hotspots = find_hotspots(db, radius_km=radius_km, district=district)
+    if not hotspots:
         return {"message": "No active hazards", "hotspots": []}
-    hotspots = cluster_reports(active_reports, max_distance_km=radius_km)
-    hotspots.sort(key=lambda x: x["report_count"], reverse=True)
     return {
-        "total_active_reports": len(active_reports),
+        "total_active_reports": total_active,
         "total_hotspots": len(hotspots),
         "hotspots": hotspots
     }
@@ -216,168 +132,65 @@ def get_hazard_hotspots(
 # 3. GET MY REPORTS (logged-in user)
 @router.get("/my")
 def get_my_reports(
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: deps.TokenPrincipal = Depends(deps.get_current_principal),
     status: Optional[str] = Query(None),
-    minimal: bool = Query(False)
+    minimal: bool = Query(False),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None)  # Opaque token from the X-Next-Cursor header
 ):
-    from app.models.confirmation import ReportConfirmation
-    
-    query = db.query(Report).filter(Report.user_id == current_user.id)
-    if status:
-        query = query.filter(Report.status == status)
-    
-    reports = query.order_by(Report.created_at.desc()).all()
+    reports = crud_report.list_reports(
+        db, user_id=current_user.id, status=status,
+        limit=limit, after=_parse_cursor(cursor), minimal=minimal
+    )
+    _set_next_cursor(response, reports, limit)
     
-    # If minimal=true, return lightweight data without media
+    # Users cannot confirm their own reports
     if minimal:
-        result = []
-        for r in reports:
-            # Include first media item for thumbnail
-            first_media = None
-            if r.media and len(r.media) > 0:
-                first_media = {
-                    "file_path": r.media[0].file_path,
-                    "file_type": r.media[0].file_type
-                }
-            
-            result.append({
-                "id": r.id,
-                "hazard_type": r.hazard_type,
-                "description": r.description,
-                "severity": r.severity,
-                "latitude": r.latitude,
-                "longitude": r.longitude,
-                "status": r.status,
-                "created_at": r.created_at.isoformat(),
-                "reporter_name": r.owner.full_name if r.owner else "Anonymous",
-                "reporter_profile_photo": r.owner.profile_photo if r.owner else None,
-                "confirmation_count": r.confirmation_count,
-                "district": r.district,
-                "ai_authenticity_score": r.ai_authenticity_score,
-                "user_confirmed": False,  # Users cannot confirm their own reports
-                "media": [first_media] if first_media else [],  # Only first image for thumbnail
-                "media_count": len(r.media),
-            })
-        return result
+        return [serialize_minimal_report(r) for r in reports]
     
     # Full data with media
-    result = []
-    for r in reports:
-        d = ReportResponse.model_validate(r).model_dump()
-        d["reporter_name"] = r.owner.full_name if r.owner else "Anonymous"
-        d["reporter_profile_photo"] = r.owner.profile_photo if r.owner else None
-        
-        # Users cannot confirm their own reports
-        d["user_confirmed"] = False
-        
-        result.append(d)
-    return result
+    return [serialize_report(r, confirmed_ids=set()) for r in reports]
 
 # 4. GET ALL REPORTS
 @router.get("/")
-def read_reports(
-    db: Session = Depends(get_db),
+async def read_reports(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None),  # Opaque token from the X-Next-Cursor header; preferred over skip
     status: Optional[str] = Query(None),
     severity: Optional[str] = Query(None),
     all_reports: bool = Query(False),  # Bypass district filtering - used for citizen home page to show nationwide reports
     minimal: bool = Query(False),  # Return minimal data without media for faster loading
-    current_user: User = Depends(deps.get_current_user_optional),  # optional auth
+    collapse_duplicates: bool = Query(False),  # Hide near-duplicates of reports already in the feed
+    current_user: Optional[deps.TokenPrincipal] = Depends(deps.get_current_principal_optional),  # optional auth
 ):
-    from app.models.confirmation import ReportConfirmation
-    
-    query = db.query(Report)
-    if status:
-        query = query.filter(Report.status == status)
-    if severity:
-        query = query.filter(Report.severity == severity)
-
     # Admin sees only their district's reports UNLESS all_reports=true (for home page)
+    district = None
     if current_user and current_user.role == "admin" and current_user.district and not all_reports:
-        # Use ilike for partial matching (e.g., "Mumbai" matches "Mumbai Suburban")
-        query = query.filter(Report.district.ilike(f"%{current_user.district}%"))
+        district = current_user.district
 
-    reports = query.order_by(Report.created_at.desc()).offset(skip).limit(limit).all()
+    reports = await crud_report.list_reports_async(
+        db, status=status, severity=severity, district=district,
+        skip=skip, limit=limit, after=_parse_cursor(cursor), minimal=minimal,
+        collapse_duplicates=collapse_duplicates
+    )
+    _set_next_cursor(response, reports, limit)
+    
+    # Resolve user_confirmed for the whole page in one query
+    confirmed_ids = await crud_report.get_confirmed_report_ids_async(
+        db, current_user.id if current_user else None, [r.id for r in reports]
+    )
     
     # If minimal=true, return lightweight data without media
     if minimal:
-        result = []
-        for r in reports:
-            # Include first media item for thumbnail
-            first_media = None
-            if r.media and len(r.media) > 0:
-                first_media = {
-                    "file_path": r.media[0].file_path,
-                    "file_type": r.media[0].file_type
-                }
-            
-            result.append({
-                "id": r.id,
-                "hazard_type": r.hazard_type,
-                "description": r.description,
-                "severity": r.severity,
-                "latitude": r.latitude,
-                "longitude": r.longitude,
-                "status": r.status,
-                "created_at": r.created_at.isoformat(),
-                "reporter_name": r.owner.full_name if r.owner else "Anonymous",
-                "reporter_profile_photo": r.owner.profile_photo if r.owner else None,
-                "confirmation_count": r.confirmation_count,
-                "district": r.district,
-                "ai_authenticity_score": r.ai_authenticity_score,
-                "user_confirmed": db.query(ReportConfirmation).filter(
-                    ReportConfirmation.report_id == r.id,
-                    ReportConfirmation.user_id == current_user.id
-                ).first() is not None if current_user else False,
-                "media": [first_media] if first_media else [],  # Only first image for thumbnail
-                "media_count": len(r.media),
-            })
-        return result
+        return [serialize_minimal_report(r, confirmed_ids) for r in reports]
     
     # Full data with media
-    result = []
-    for r in reports:
-        d = ReportResponse.model_validate(r).model_dump()
-        d["reporter_name"] = r.owner.full_name if r.owner else "Anonymous"
-        d["reporter_profile_photo"] = r.owner.profile_photo if r.owner else None
-        
-        # Add user_confirmed field if user is authenticated
-        if current_user:
-            confirmed = db.query(ReportConfirmation).filter(
-                ReportConfirmation.report_id == r.id,
-                ReportConfirmation.user_id == current_user.id
-            ).first() is not None
-            d["user_confirmed"] = confirmed
-        else:
-            d["user_confirmed"] = False
-        
-        result.append(d)
-    return result
-
-def score_single_report_bg(report_id: int, description: str, hazard_type: str, image_url: str, lat: float, lon: float, state: str = None):
-    from app.db.session import SessionLocal
-    from app.services.bedrock_ai import analyze_single_report
-    db = SessionLocal()
-    try:
-        # Run the deep forensic analysis with contextual verification
-        result = analyze_single_report(description, hazard_type, image_url, lat, lon, state)
-        
-        report = db.query(Report).filter(Report.id == report_id).first()
-        if report:
-            report.ai_authenticity_score = result.get("authenticity_score", 0.5)
-            report.ai_analysis_summary = result.get("preliminary_summary", "Analysis failed.")
-            
-            if result.get("recommended_status") == "false":
-                report.status = "false"
-                report.is_verified = False
-                
-            db.commit()
-    except Exception as e:
-        logger.error(f"Background AI scoring failed: {e}")
-    finally:
-        db.close()
+    return [serialize_report(r, confirmed_ids=confirmed_ids) for r in reports]
 
 # 5. CREATE REPORT
 @router.post("/", response_model=ReportResponse)
@@ -385,77 +198,74 @@ def create_report(
     *,
     db: Session = Depends(get_db),
     report_in: ReportCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(deps.get_current_user)
 ):
-    from app.services.geocode import get_district_from_coords
-    
-    # Create the report
-    report = crud_report.create_report(db=db, report=report_in, user_id=current_user.id)
+    from app.services.geocode import lookup_district_offline
+    from app.services.report_jobs import enqueue_report_jobs
     
-    # Get image URL for AI analysis
-    image_url = report.media[0].file_path if report.media else None
+    # Offline polygon lookup is microseconds, so do it inline
+    district = None
+    if report_in.latitude and report_in.longitude:
+        district = lookup_district_offline(report_in.latitude, report_in.longitude)
     
-    # Move geocoding to background task for faster response
-    if report.latitude and report.longitude:
-        background_tasks.add_task(
-            update_report_district_bg,
-            report.id,
-            report.latitude,
-            report.longitude
-        )
-    
-    # Schedule background AI analysis
-    background_tasks.add_task(
-        score_single_report_bg,
-        report.id,
-        report.description or "",
-        report.hazard_type,
-        image_url,
-        report.latitude,
-        report.longitude,
-        current_user.state if hasattr(current_user, 'state') else None
+    # Create the report
+    report = crud_report.create_report(db=db, report=report_in, user_id=current_user.id, district=district)
+    
+    # AI scoring (and online geocoding outside the boundary data) goes to the
+    # durable job queue; workers pick it up in severity order
+    enqueue_report_jobs(
+        db,
+        report,
+        state=current_user.state if hasattr(current_user, 'state') else None,
+        needs_geocode=not district and bool(report.latitude and report.longitude)
     )
     
     return report
 
-
-def update_report_district_bg(report_id: int, latitude: float, longitude: float):
-    """Background task to update report district via reverse geocoding"""
-    from app.db.session import SessionLocal
-    from app.services.geocode import get_district_from_coords
-    
-    db = SessionLocal()
-    try:
-        report = db.query(Report).filter(Report.id == report_id).first()
-        if report:
-            district = get_district_from_coords(latitude, longitude)
-            if district:
-                report.district = district
-                db.commit()
-    except Exception as e:
-        logger.error(f"Failed to update district for report {report_id}: {e}")
-    finally:
-        db.close()
-
 # DYNAMIC ROUTES
 
-def serialize_report(r, current_user=None, db=None):
-    from app.models.confirmation import ReportConfirmation
+def serialize_minimal_report(row, confirmed_ids=frozenset()):
+    """Serialize a projection row from crud.report.list_reports(minimal=True)"""
+    # Include first media item for thumbnail
+    first_media = None
+    if row.media_file_path:
+        first_media = {
+            "file_path": row.media_file_path,
+            "file_type": row.media_file_type
+        }
     
+    return {
+        "id": row.id,
+        "hazard_type": row.hazard_type,
+        "description": row.description,
+        "severity": row.severity,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "status": row.status,
+        "created_at": row.created_at.isoformat(),
+        "reporter_name": row.reporter_name or "Anonymous",
+        "reporter_profile_photo": row.reporter_profile_photo,
+        "confirmation_count": row.confirmation_count,
+        "district": row.district,
+        "ai_authenticity_score": row.ai_authenticity_score,
+        "duplicate_of_id": row.duplicate_of_id,
+        "user_confirmed": row.id in confirmed_ids,
+        "media": [first_media] if first_media else [],  # Only first image for thumbnail
+        "media_count": row.media_count or 0,
+    }
+
+def serialize_report(r, current_user=None, db=None, confirmed_ids=None):
     d = ReportResponse.model_validate(r).model_dump()
     d["reporter_name"] = r.owner.full_name if r.owner else "Anonymous"
     d["reporter_profile_photo"] = r.owner.profile_photo if r.owner else None
     
-    # Add user_confirmed field if user is authenticated
-    if current_user and db:
-        confirmed = db.query(ReportConfirmation).filter(
-            ReportConfirmation.report_id == r.id,
-            ReportConfirmation.user_id == current_user.id
-        ).first() is not None
-        d["user_confirmed"] = confirmed
-    else:
-        d["user_confirmed"] = False
+    # Callers serializing a page pass confirmed_ids resolved in one query;
+    # single-report callers fall back to resolving just this report
+    if confirmed_ids is None:
+        confirmed_ids = crud_report.get_confirmed_report_ids(
+            db, current_user.id, [r.id]
+        ) if current_user and db else set()
+    d["user_confirmed"] = r.id in confirmed_ids
     
     return d
 
@@ -464,7 +274,7 @@ def serialize_report(r, current_user=None, db=None):
 def get_report(
     report_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user_optional)
+    current_user: Optional[deps.TokenPrincipal] = Depends(deps.get_current_principal_optional)
 ):
     report = db.query(Report).filter(Report.id == report_id).first()
     if not report:
@@ -493,6 +303,7 @@ def verify_report(
     report.is_verified = (status == "verified")
     db.commit()
     db.refresh(report)
+    bump_map_version()
     
     # If report is being verified (not already verified), send email alerts
     if status == "verified" and old_status != "verified":
@@ -522,6 +333,7 @@ def delete_report(
         raise HTTPException(status_code=403, detail="Not authorized")
     db.delete(report)
     db.commit()
+    bump_map_version()
 
 # 9. CONFIRM REPORT (Like/Upvote)
 @router.post("/{report_id}/confirm")
@@ -572,7 +384,7 @@ def confirm_report(
 def check_confirmation(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: deps.TokenPrincipal = Depends(deps.get_current_principal)
 ):
     from app.models.confirmation import ReportConfirmation
     
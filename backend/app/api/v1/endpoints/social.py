@@ -1,11 +1,86 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.social import SocialPost
+from app.crud.pagination import NEXT_CURSOR_HEADER, apply_keyset, decode_cursor, next_cursor
+from app.crud.social import search_posts
 
 router = APIRouter()
 
 @router.get("/")
-def get_social_feed(db: Session = Depends(get_db)):
+def get_social_feed(
+    response: Response,
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None)  # Opaque token from the X-Next-Cursor header
+):
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    return db.query(SocialPost).order_by(SocialPost.published_at.desc()).limit(20).all()
\ No newline at end of file
+    posts = apply_keyset(
+        db.query(SocialPost), SocialPost.published_at, SocialPost.id, after, limit
+    ).all()
+
+    token = next_cursor(posts, limit, timestamp_attr="published_at")
+    if token:
+        response.headers[NEXT_CURSOR_HEADER] = token
+    return posts
+
+
+@router.get("/search")
+def search_social_posts(
+    response: Response,
+    db: Session = Depends(get_db),
+    q: Optional[str] = Query(None, max_length=200),  # Web-search syntax: words, "phrases", -exclusions, or
+    hazard: Optional[str] = Query(None, max_length=50),
+    state: Optional[str] = Query(None, max_length=50),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    sort: Literal["relevance", "recent"] = Query("relevance"),
+    skip: int = Query(0, ge=0, le=1000),  # relevance order only
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None)  # recent order only, from the X-Next-Cursor header
+):
+    """
+    Full-text search over harvested posts, filtered by hazard, state and
+    published_at range. Ranked by relevance when there are text criteria,
+    otherwise newest first.
+    """
+    if since and until and since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    results = search_posts(
+        db, q=q, hazard=hazard, state=state, since=since, until=until,
+        sort=sort, skip=skip, limit=limit, after=after,
+    )
+    ranked = any(rank is not None for _, rank in results)
+
+    if not ranked:
+        token = next_cursor([post for post, _ in results], limit, timestamp_attr="published_at")
+        if token:
+            response.headers[NEXT_CURSOR_HEADER] = token
+
+    return [
+        {
+            "id": post.id,
+            "source": post.source,
+            "author": post.author,
+            "content": post.content,
+            "url": post.url,
+            "published_at": post.published_at,
+            **({"rank": round(rank, 4)} if rank is not None else {}),
+        }
+        for post, rank in results
+    ]
@@ -0,0 +1,49 @@
+import json
+import logging
+from urllib.parse import urlparse
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.rekognition_video import handle_rekognition_notification
+from app.services.sns_verify import verify_sns_message
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# 1. REKOGNITION VIDEO JOB COMPLETION (SNS HTTPS subscription)
+@router.post("/rekognition")
+async def rekognition_job_notification(request: Request):
+    # SNS posts JSON with Content-Type text/plain
+    try:
+        envelope = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid SNS message")
+
+    if not settings.REKOGNITION_SNS_TOPIC_ARN or envelope.get("TopicArn") != settings.REKOGNITION_SNS_TOPIC_ARN:
+        raise HTTPException(status_code=403, detail="Unknown topic")
+    if not await run_in_threadpool(verify_sns_message, envelope):
+        raise HTTPException(status_code=403, detail="Invalid SNS signature")
+
+    message_type = envelope.get("Type")
+    if message_type == "SubscriptionConfirmation":
+        subscribe_url = envelope.get("SubscribeURL", "")
+        if not (urlparse(subscribe_url).hostname or "").endswith(".amazonaws.com"):
+            raise HTTPException(status_code=400, detail="Unexpected SubscribeURL")
+        async with httpx.AsyncClient(timeout=10) as client:
+            await client.get(subscribe_url)
+        logger.info("Confirmed SNS subscription for Rekognition notifications")
+        return {"status": "subscribed"}
+
+    if message_type == "Notification":
+        try:
+            message = json.loads(envelope.get("Message", "{}"))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid notification payload")
+        finished = await run_in_threadpool(handle_rekognition_notification, message)
+        return {"status": "processed" if finished else "ignored"}
+
+    return {"status": "ignored"}
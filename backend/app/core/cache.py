@@ -0,0 +1,122 @@
+"""
+Process-local caching primitives.
+TTLCache is a thread-safe LRU with per-entry expiry, optional size weighing
+and single-flight loading, so concurrent misses on one key run the loader once.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        """
+        Args:
+            maxsize: Capacity, in entries or in sizeof() units when sizeof is given
+            ttl: Default time-to-live in seconds
+            sizeof: Optional weigher (e.g. len for bytes) for size-bounded caches
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, expires_at, weight)
+        self._weight = 0
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._get_locked(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        weight = self._sizeof(value) if self._sizeof else 1
+        if weight > self.maxsize:
+            return  # Never cache an item larger than the whole cache
+        with self._lock:
+            self._pop_locked(key)
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._data[key] = (value, expires_at, weight)
+            self._weight += weight
+            while self._weight > self.maxsize and self._data:
+                oldest = next(iter(self._data))
+                self._pop_locked(oldest)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._pop_locked(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Return the cached value, or run loader() once across concurrent callers and cache it."""
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another caller may have loaded it while we waited
+            with self._lock:
+                value = self._get_locked(key)
+            if value is not _MISSING:
+                return value
+            try:
+                value = loader()
+                self.set(key, value, ttl)
+                return value
+            finally:
+                with self._lock:
+                    if self._loading.get(key) is key_lock:
+                        del self._loading[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "size": self._weight,
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+    def _get_locked(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._pop_locked(key)
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def _pop_locked(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._weight -= entry[2]
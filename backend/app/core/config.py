@@ -25,6 +25,105 @@ class Settings(BaseSettings):
     # Tavily API for real-time news search
     TAVILY_API_KEY: str = ""
 
+    # Database pools: request traffic and background work are sized separately
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_BG_POOL_SIZE: int = 5
+    DB_BG_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT_SECONDS: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
+    DB_BG_STATEMENT_TIMEOUT_MS: int = 120000
+    # Set when DATABASE_URL points at PgBouncer in transaction pooling mode
+    DB_PGBOUNCER_MODE: bool = False
+
+    # Resolved-user cache behind get_current_user (per process)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAXSIZE: int = 10000
+
+    # Reverse geocoding: offline district polygons first, Nominatim (1 req/s policy) as fallback
+    DISTRICT_BOUNDARIES_PATH: str = ""  # defaults to app/data/india_districts.geojson
+    GEOCODE_CACHE_PRECISION: int = 6    # geohash cell ≈ 1.2 km x 0.6 km
+    NOMINATIM_MIN_INTERVAL_SECONDS: float = 1.0
+    NOMINATIM_MAX_WAIT_SECONDS: float = 10.0
+
+    # Weather context cache for AI scoring: one OpenWeather call per cell per bucket
+    WEATHER_CELL_DEGREES: float = 0.1   # ≈ 11 km
+    WEATHER_CACHE_TTL_SECONDS: int = 600
+    WEATHER_CACHE_MAXSIZE: int = 2048
+
+    # Single-report AI verification: per-stage deadlines inside one total budget
+    AI_WEATHER_DEADLINE_SECONDS: float = 6.0
+    AI_NEWS_DEADLINE_SECONDS: float = 8.0
+    AI_MEDIA_DEADLINE_SECONDS: float = 15.0
+    AI_VISUAL_DEADLINE_SECONDS: float = 45.0
+    AI_TOTAL_BUDGET_SECONDS: float = 120.0
+    AI_PIPELINE_WORKERS: int = 16
+
+    # Cluster (multi-model) analysis: worker threads for blocking AWS calls,
+    # capped per service to stay under the account's TPS limits
+    AI_AWS_WORKERS: int = 16
+    REKOGNITION_MAX_CONCURRENCY: int = 5
+    BEDROCK_MAX_CONCURRENCY: int = 4
+    CLUSTER_ANALYSIS_CONCURRENCY: int = 4  # clusters in flight per run
+    # Persisted clusters are re-analyzed once membership grows by this fraction
+    # since the last analysis (or the max severity rises)
+    CLUSTER_REANALYZE_GROWTH: float = 0.5
+    CLUSTER_MAX_REPORTS_PER_ANALYSIS: int = 25  # most recent members sent to the models
+
+    # Downloaded report media shared by single-report and cluster scoring
+    MEDIA_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    MEDIA_CACHE_TTL_SECONDS: int = 1800
+
+    # Model verdicts (Nova Pro, Rekognition, Claude) keyed by media hash + normalized text
+    VERDICT_CACHE_MAXSIZE: int = 20000
+    VERDICT_CACHE_TTL_SECONDS: int = 6 * 3600
+    VERDICT_CACHE_REGION_PRECISION: int = 4  # geohash cell ≈ 39 km x 19.5 km
+
+    # Near-duplicate reports (SimHash over descriptions, dHash over the first image)
+    DEDUP_WINDOW_HOURS: int = 24
+    DEDUP_RADIUS_KM: float = 25.0
+    DEDUP_TEXT_MAX_DISTANCE: int = 3   # bits of 64; the LSH bands guarantee recall up to 3
+    DEDUP_IMAGE_MAX_DISTANCE: int = 6  # bits of 64; up to 7
+    DEDUP_MIN_TEXT_TOKENS: int = 8     # shorter descriptions are too generic to match on
+
+    # Video reports: Rekognition jobs are resumed by a poll tick or SNS completion notifications
+    REKOGNITION_SNS_TOPIC_ARN: str = ""
+    REKOGNITION_SNS_ROLE_ARN: str = ""
+    VIDEO_JOB_POLL_SECONDS: int = 30
+    VIDEO_JOB_POLL_BATCH: int = 50
+    VIDEO_JOB_TIMEOUT_SECONDS: int = 900
+
+    # Durable job queue (AI scoring, geocoding) processed by `python -m app.worker`
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_BASE_SECONDS: float = 10.0
+    JOB_BACKOFF_MAX_SECONDS: float = 900.0
+    JOB_LOCK_TIMEOUT_SECONDS: int = 600  # longer than AI_TOTAL_BUDGET_SECONDS
+
+    # Social/news harvester: feeds fetched in parallel with conditional GETs
+    HARVEST_CONCURRENCY: int = 4
+    HARVEST_TIMEOUT_SECONDS: float = 15.0
+
+    # Map tiles / viewport: individual report points only from this zoom up,
+    # server-side grid aggregates below it
+    MAP_POINTS_MIN_ZOOM: int = 11
+    MAP_GRID_CELLS_PER_TILE: int = 16
+    MAP_MAX_VIEWPORT_POINTS: int = 5000
+
+    # Public map snapshots are rebuilt on writes; the TTL bounds staleness
+    # across API instances that did not see the write
+    MAP_CACHE_TTL_SECONDS: int = 60
+
+    # Short-lived per-district cache in front of /reports/stats
+    STATS_CACHE_TTL_SECONDS: int = 10
+
+    # Disaster alert fan-out (SES bulk sends)
+    ALERT_FANOUT_WORKERS: int = 4
+    SES_MAX_SEND_RATE: float = 14.0  # messages/second allowed by the SES account
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="ignore"
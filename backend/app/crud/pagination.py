@@ -0,0 +1,45 @@
+"""
+Keyset (cursor) pagination helpers.
+Feeds are ordered newest first on (timestamp, id); the cursor is an opaque
+token holding the sort key of the last row of the previous page.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    payload = json.dumps({"t": timestamp.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor token. Raises ValueError if the token is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def apply_keyset(query, timestamp_col, id_col, after: Optional[Tuple[datetime, int]], limit: Optional[int]):
+    """Order newest first and continue strictly after the given (timestamp, id) key."""
+    if after is not None:
+        query = query.filter(tuple_(timestamp_col, id_col) < tuple_(*after))
+    query = query.order_by(timestamp_col.desc(), id_col.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def next_cursor(rows, limit: Optional[int], timestamp_attr: str = "created_at") -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if not rows or limit is None or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, timestamp_attr), last.id)
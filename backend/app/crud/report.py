@@ -1,10 +1,16 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models.report import Report
+from app.models.user import User
 from app.models.media import Media
+from app.models.confirmation import ReportConfirmation
 from app.schemas.report import ReportCreate
-from typing import Optional
+from app.crud.pagination import apply_keyset
+from datetime import datetime
+from typing import Iterable, Optional, Set, Tuple
 
-def create_report(db: Session, report: ReportCreate, user_id: int):
+def create_report(db: Session, report: ReportCreate, user_id: int, district: Optional[str] = None):
     location_wkt = f"POINT({report.longitude} {report.latitude})"
     
     db_report = Report(
@@ -13,6 +19,7 @@ def create_report(db: Session, report: ReportCreate, user_id: int):
         description=report.description,
         severity=report.severity,
         location=location_wkt,
+        district=district,
         is_verified=False,
         status="pending"
     )
@@ -46,13 +53,183 @@ def get_reports(
     status: Optional[str] = None,
     severity: Optional[str] = None
 ):
-    query = db.query(Report)
-    
-    # Apply Filters if provided
+    return list_reports(db, status=status, severity=severity, skip=skip, limit=limit)
+
+def _filter_reports(
+    query,
+    user_id: Optional[int] = None,
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    district: Optional[str] = None,
+    collapse_duplicates: bool = False
+):
+    if user_id is not None:
+        query = query.filter(Report.user_id == user_id)
     if status:
         query = query.filter(Report.status == status)
     if severity:
         query = query.filter(Report.severity == severity)
-        
+    if district:
+        # Partial match (e.g., "Mumbai" matches "Mumbai Suburban")
+        query = query.filter(Report.district.ilike(f"%{district}%"))
+    if collapse_duplicates:
+        # Only canonical reports; near-duplicates point at them via duplicate_of_id
+        query = query.filter(Report.duplicate_of_id.is_(None))
+    return query
+
+def build_report_list_query(
+    *,
+    user_id: Optional[int] = None,
+    status: Optional[str] = None,
+    severity: Optional[str] = None,
+    district: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    minimal: bool = False,
+    collapse_duplicates: bool = False
+):
+    """
+    List query layer for report feeds. Every page costs a constant number of queries
+    (checked by scripts/benchmark_report_list.py).
+
+    Full mode selects Report objects with owner joined and media selectin-loaded.
+    Minimal mode is a row projection: scalar columns, lat/lon via ST_Y/ST_X,
+    reporter fields, and the first media item plus media count from a lateral subquery.
+
+    Pages are ordered newest first on (created_at, id). Pass `after` (a decoded
+    cursor) for keyset pagination; `skip` is kept for offset-based clients.
+
+    Returns a select() usable with both sync and async sessions; see
+    list_reports / list_reports_async.
+    """
+    if minimal:
+        first_media = (
+            select(
+                Media.file_path,
+                Media.file_type,
+                func.count().over().label("media_count")
+            )
+            .where(Media.report_id == Report.id)
+            .order_by(Media.id)
+            .limit(1)
+            .correlate(Report)
+            .lateral("first_media")
+        )
+        stmt = (
+            select(
+                Report.id,
+                Report.hazard_type,
+                Report.description,
+                Report.severity,
+                func.ST_Y(Report.location).label("latitude"),
+                func.ST_X(Report.location).label("longitude"),
+                Report.status,
+                Report.created_at,
+                Report.confirmation_count,
+                Report.district,
+                Report.ai_authenticity_score,
+                Report.duplicate_of_id,
+                User.full_name.label("reporter_name"),
+                User.profile_photo.label("reporter_profile_photo"),
+                first_media.c.file_path.label("media_file_path"),
+                first_media.c.file_type.label("media_file_type"),
+                first_media.c.media_count,
+            )
+            .outerjoin(User, User.id == Report.user_id)
+            .outerjoin(first_media, true())
+        )
+    else:
+        stmt = select(Report).options(
+            joinedload(Report.owner),
+            selectinload(Report.media)
+        )
+
+    stmt = _filter_reports(stmt, user_id, status, severity, district, collapse_duplicates)
+
     #Order by newest first
-    return query.order_by(Report.created_at.desc()).offset(skip).limit(limit).all()
\ No newline at end of file
+    stmt = apply_keyset(stmt, Report.created_at, Report.id, after, limit)
+    if skip:
+        stmt = stmt.offset(skip)
+    return stmt
+
+def list_reports(db: Session, *, minimal: bool = False, **filters):
+    """Run build_report_list_query on a sync session"""
+    result = db.execute(build_report_list_query(minimal=minimal, **filters))
+    return result.all() if minimal else result.scalars().all()
+
+async def list_reports_async(db: AsyncSession, *, minimal: bool = False, **filters):
+    """Run build_report_list_query on an async session"""
+    result = await db.execute(build_report_list_query(minimal=minimal, **filters))
+    return result.all() if minimal else result.scalars().all()
+
+def get_report_stats(db: Session, district: Optional[str] = None) -> dict:
+    """
+    Dashboard aggregates in two queries: per-hazard counts with COUNT(*) FILTER,
+    and the SOS triggers (critical reports) joined with their reporter.
+    """
+    active = Report.status != "false"
+    critical = Report.severity == "critical"
+
+    counts = db.query(
+        Report.hazard_type,
+        func.count().filter(active).label("active"),
+        func.count().filter(critical).label("sos"),
+    )
+    counts = _filter_reports(counts, district=district).group_by(Report.hazard_type).all()
+
+    triggers = db.query(
+        Report.id,
+        Report.hazard_type,
+        Report.description,
+        func.ST_Y(Report.location).label("latitude"),
+        func.ST_X(Report.location).label("longitude"),
+        Report.created_at,
+        User.id.label("owner_id"),
+        User.full_name.label("reporter_name"),
+        User.profile_photo.label("reporter_profile_photo"),
+    ).outerjoin(User, User.id == Report.user_id).filter(critical)
+    triggers = _filter_reports(triggers, district=district).order_by(Report.created_at.desc()).all()
+
+    return {
+        "sos_triggers": [
+            {
+                "id": t.id,
+                "hazard_type": t.hazard_type,
+                "description": t.description,
+                "latitude": t.latitude,
+                "longitude": t.longitude,
+                "created_at": t.created_at,
+                "reporter_name": t.reporter_name if t.owner_id else "Anonymous",
+                "reporter_profile_photo": t.reporter_profile_photo,
+            }
+            for t in triggers
+        ],
+        "total_sos": sum(c.sos for c in counts),
+        "hazard_breakdown": {c.hazard_type: c.active for c in counts if c.active},
+        "total_active": sum(c.active for c in counts),
+    }
+
+def _confirmed_report_ids_query(user_id: int, report_ids):
+    return select(ReportConfirmation.report_id).where(
+        ReportConfirmation.user_id == user_id,
+        ReportConfirmation.report_id.in_(report_ids)
+    )
+
+def get_confirmed_report_ids(db: Session, user_id: Optional[int], report_ids: Iterable[int]) -> Set[int]:
+    """
+    Resolve which of the given reports the user has confirmed.
+    Uses a single report_id IN (...) query instead of one lookup per report.
+    """
+    report_ids = list(report_ids)
+    if not user_id or not report_ids:
+        return set()
+    return set(db.execute(_confirmed_report_ids_query(user_id, report_ids)).scalars())
+
+async def get_confirmed_report_ids_async(db: AsyncSession, user_id: Optional[int], report_ids: Iterable[int]) -> Set[int]:
+    """Async variant of get_confirmed_report_ids"""
+    report_ids = list(report_ids)
+    if not user_id or not report_ids:
+        return set()
+    result = await db.execute(_confirmed_report_ids_query(user_id, report_ids))
+    return set(result.scalars())
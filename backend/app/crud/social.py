@@ -0,0 +1,88 @@
+"""
+Search over harvested social/news posts.
+
+Text criteria (free text, hazard, state) become one tsquery matched against
+the GIN-indexed social_posts.search_vector; the time range uses the
+(published_at, id) index. Relevance order ranks only the matching rows.
+"""
+from datetime import datetime
+from functools import reduce
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select
+from app.crud.pagination import apply_keyset
+from app.models.social import SocialPost
+
+TS_CONFIG = "english"
+
+# Hazard filters match the words news coverage actually uses for them
+HAZARD_QUERIES = {
+    "flood": "flood | inundation | waterlogging | deluge | cloudburst",
+    "cyclone": "cyclone | typhoon | depression | landfall",
+    "storm": "storm | cyclone | thunderstorm | squall",
+    "tsunami": "tsunami | tidal <-> wave",
+    "earthquake": "earthquake | tremor | quake | seismic",
+    "fire": "fire | blaze",
+    "oil spill": "oil <-> spill | oil <-> slick",
+    "high waves": "high <-> wave | swell | surge",
+}
+
+
+def _hazard_tsquery(hazard: str):
+    known = HAZARD_QUERIES.get(hazard.strip().lower())
+    if known:
+        return func.to_tsquery(TS_CONFIG, known)
+    return func.plainto_tsquery(TS_CONFIG, hazard)
+
+
+def build_post_search_query(
+    *,
+    q: Optional[str] = None,
+    hazard: Optional[str] = None,
+    state: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    sort: str = "relevance",
+    skip: int = 0,
+    limit: int = 20,
+    after: Optional[Tuple[datetime, int]] = None,
+):
+    """
+    Select (SocialPost, rank) rows.
+
+    sort="relevance" orders by ts_rank_cd and pages with skip; sort="recent"
+    (or no text criteria) orders newest first and pages with the keyset
+    cursor, like the plain feed. rank is None in recent order.
+    """
+    tsqueries = []
+    if q:
+        tsqueries.append(func.websearch_to_tsquery(TS_CONFIG, q))
+    if hazard:
+        tsqueries.append(_hazard_tsquery(hazard))
+    if state:
+        tsqueries.append(func.phraseto_tsquery(TS_CONFIG, state))
+    tsquery = reduce(lambda a, b: a.op("&&")(b), tsqueries) if tsqueries else None
+
+    ranked = sort == "relevance" and tsquery is not None
+    if ranked:
+        rank = func.ts_rank_cd(SocialPost.search_vector, tsquery)
+        stmt = select(SocialPost, rank.label("rank"))
+    else:
+        stmt = select(SocialPost)
+
+    if tsquery is not None:
+        stmt = stmt.where(SocialPost.search_vector.op("@@")(tsquery))
+    if since:
+        stmt = stmt.where(SocialPost.published_at >= since)
+    if until:
+        stmt = stmt.where(SocialPost.published_at < until)
+
+    if ranked:
+        return stmt.order_by(rank.desc(), SocialPost.published_at.desc(), SocialPost.id.desc()).offset(skip).limit(limit)
+    return apply_keyset(stmt, SocialPost.published_at, SocialPost.id, after, limit)
+
+
+def search_posts(db, **criteria):
+    """Run build_post_search_query; returns [(SocialPost, rank or None)]"""
+    rows = db.execute(build_post_search_query(**criteria)).all()
+    return [(row[0], row[1] if len(row) > 1 else None) for row in rows]
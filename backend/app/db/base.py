@@ -2,10 +2,16 @@ from app.db.session import Base
 # Import models in dependency order to avoid circular import issues
 from app.models.user import User
 from app.models.confirmation import ReportConfirmation
+from app.models.report_cluster import ReportCluster
 from app.models.report import Report
 from app.models.media import Media
 from app.models.social import SocialPost
 from app.models.comment import Comment
 from app.models.alert import Alert
 from app.models.map_annotation import MapAnnotation, DeployedForce
-from app.models.rescue_deployment import RescueDeployment, Shelter
\ No newline at end of file
+from app.models.rescue_deployment import RescueDeployment, Shelter
+from app.models.geocode_cache import GeocodeCache
+from app.models.video_job import VideoAnalysisJob
+from app.models.job import Job
+from app.models.report_fingerprint import ReportFingerprint
+from app.models.feed_state import FeedState
@@ -0,0 +1,105 @@
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout wait time, saturation and connection age for one engine's pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._born: Dict[int, float] = {}
+        self.checkouts = 0
+        self.connects = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def connection_opened(self, key: int):
+        with self._lock:
+            self.connects += 1
+            self._born[key] = time.monotonic()
+
+    def connection_closed(self, key: int):
+        with self._lock:
+            self._born.pop(key, None)
+
+    def snapshot(self, pool) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - born for born in self._born.values()]
+            checkouts, wait_total = self.checkouts, self.wait_total
+            wait_max, timeouts, connects = self.wait_max, self.timeouts, self.connects
+
+        stats = {
+            "checkouts": checkouts,
+            "checkout_timeouts": timeouts,
+            "checkout_wait_avg_ms": round(wait_total / checkouts * 1000, 2) if checkouts else 0.0,
+            "checkout_wait_max_ms": round(wait_max * 1000, 2),
+            "connections_opened": connects,
+            "open_connections": len(ages),
+            "connection_age_max_s": round(max(ages), 1) if ages else 0.0,
+            "connection_age_avg_s": round(sum(ages) / len(ages), 1) if ages else 0.0,
+        }
+
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            stats.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "saturation": round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+            })
+        else:
+            stats["pool"] = pool.status()
+        return stats
+
+
+class _TimedCheckoutMixin:
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+
+def instrumented_pool_class(metrics: PoolMetrics, is_async: bool = False):
+    """QueuePool subclass that times checkouts; `recreate()` keeps the class, so metrics survive dispose()"""
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return type(f"Instrumented{base.__name__}", (_TimedCheckoutMixin, base), {"metrics": metrics})
+
+
+def track_connection_ages(engine, metrics: PoolMetrics):
+    pool_target = engine.sync_engine if hasattr(engine, "sync_engine") else engine
+
+    @event.listens_for(pool_target, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connection_opened(id(connection_record))
+
+    @event.listens_for(pool_target, "close")
+    def _on_close(dbapi_connection, connection_record):
+        metrics.connection_closed(id(connection_record))
+
+    @event.listens_for(pool_target, "detach")
+    def _on_detach(dbapi_connection, connection_record):
+        metrics.connection_closed(id(connection_record))
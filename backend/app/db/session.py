@@ -1,16 +1,109 @@
-from sqlalchemy import create_engine
+import uuid
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.db.pool import PoolMetrics, instrumented_pool_class, track_connection_ages
+
+# Telemetry per pool, exposed on /metrics
+pool_metrics = {
+    "request": PoolMetrics("request"),
+    "background": PoolMetrics("background"),
+    "request_async": PoolMetrics("request_async"),
+}
+
+def _pool_kwargs(pool_size: int, max_overflow: int):
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def _apply_statement_timeout_per_transaction(engine, timeout_ms: int):
+    """PgBouncer (transaction pooling) rejects startup options, so set the timeout per transaction"""
+    target = engine.sync_engine if hasattr(engine, "sync_engine") else engine
+
+    @event.listens_for(target, "begin")
+    def _set_local_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
 
-# Create the Database Engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"sslmode": "require"}
+def _make_engine(name: str, pool_size: int, max_overflow: int, statement_timeout_ms: int):
+    connect_args = {"sslmode": "require", "application_name": f"tat-sahayk-{name}"}
+    if not settings.DB_PGBOUNCER_MODE:
+        connect_args["options"] = f"-c statement_timeout={int(statement_timeout_ms)}"
+
+    metrics = pool_metrics[name]
+    sync_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args=connect_args,
+        poolclass=instrumented_pool_class(metrics),
+        **_pool_kwargs(pool_size, max_overflow),
+    )
+    track_connection_ages(sync_engine, metrics)
+    if settings.DB_PGBOUNCER_MODE:
+        _apply_statement_timeout_per_transaction(sync_engine, statement_timeout_ms)
+    return sync_engine
+
+# Request traffic (get_db)
+engine = _make_engine(
+    "request", settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_STATEMENT_TIMEOUT_MS
+)
+
+# Background tasks and scheduler jobs get their own pool so they cannot starve requests
+background_engine = _make_engine(
+    "background", settings.DB_BG_POOL_SIZE, settings.DB_BG_MAX_OVERFLOW, settings.DB_BG_STATEMENT_TIMEOUT_MS
 )
 
 # Create the Session Local class (each request gets a session)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions for BackgroundTasks, APScheduler jobs and workers
+BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=background_engine)
+
+def _async_database_url(url: str):
+    """Same database through the asyncpg driver (sslmode is passed via connect_args instead)"""
+    parsed = make_url(url)
+    return parsed.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+
+def _async_connect_args():
+    connect_args = {"ssl": "require"}
+    if settings.DB_PGBOUNCER_MODE:
+        # Prepared statements do not survive transaction pooling
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    else:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+            "application_name": "tat-sahayk-request-async",
+        }
+    return connect_args
+
+# Async engine for endpoints migrated off the threadpool; shares the same database
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    connect_args=_async_connect_args(),
+    poolclass=instrumented_pool_class(pool_metrics["request_async"], is_async=True),
+    **_pool_kwargs(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+)
+track_connection_ages(async_engine, pool_metrics["request_async"])
+if settings.DB_PGBOUNCER_MODE:
+    _apply_statement_timeout_per_transaction(async_engine, settings.DB_STATEMENT_TIMEOUT_MS)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+def get_pool_stats():
+    return {
+        "request": pool_metrics["request"].snapshot(engine.pool),
+        "background": pool_metrics["background"].snapshot(background_engine.pool),
+        "request_async": pool_metrics["request_async"].snapshot(async_engine.pool),
+    }
+
 # Base class for our models
 Base = declarative_base()
 
@@ -20,4 +113,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Async dependency, for `async def` endpoints
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
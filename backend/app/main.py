@@ -10,15 +10,21 @@ from app.db.session import engine
 from app.db.base import Base
 from scripts.harvest_social import harvest
 from app.services.cluster_analyzer import run_cluster_analysis
+from app.services.rekognition_video import poll_video_jobs
+from app.services.geocode import get_district_index
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     Base.metadata.create_all(bind=engine)
 
+    # Load district boundaries now rather than on the first report (warns if missing)
+    get_district_index()
+
     # Start scheduler with both jobs
     scheduler = BackgroundScheduler()
     scheduler.add_job(harvest, "interval", minutes=15, id="social_harvester")
     scheduler.add_job(run_cluster_analysis, "interval", minutes=15, id="bedrock_cluster_analysis")
+    scheduler.add_job(poll_video_jobs, "interval", seconds=settings.VIDEO_JOB_POLL_SECONDS, id="video_job_poller")
     scheduler.start()
     print("Social Harvester Scheduler Started")
     print("Bedrock Cluster Analyzer Started")
@@ -44,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
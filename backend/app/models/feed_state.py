@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float
+from app.db.session import Base
+
+class FeedState(Base):
+    """Conditional-GET validators and last-run numbers per harvested feed"""
+    __tablename__ = "feed_states"
+
+    url              = Column(String,  primary_key=True)
+    source           = Column(String,  nullable=True)
+    etag             = Column(String,  nullable=True)
+    last_modified    = Column(String,  nullable=True)
+    last_status      = Column(Integer, nullable=True)  # HTTP status of the last fetch (304 = unchanged)
+    last_fetched_at  = Column(DateTime(timezone=True), nullable=True)
+    last_latency_ms  = Column(Float,   nullable=True)
+    last_item_count  = Column(Integer, nullable=True)  # entries in the feed
+    last_new_count   = Column(Integer, nullable=True)  # posts inserted
+    last_error       = Column(String,  nullable=True)
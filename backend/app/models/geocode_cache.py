@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class GeocodeCache(Base):
+    """Reverse-geocoding results from the online fallback, keyed by geohash cell"""
+    __tablename__ = "geocode_cache"
+
+    geohash = Column(String(12), primary_key=True)
+    district = Column(String, nullable=True)   # NULL = looked up, nothing found (e.g. offshore)
+    state = Column(String, nullable=True)
+    source = Column(String, nullable=False, default="nominatim")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, text
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class Job(Base):
+    """A unit of background work (AI scoring, geocoding) claimed by app.worker processes"""
+    __tablename__ = "jobs"
+
+    id           = Column(Integer, primary_key=True, index=True)
+    kind         = Column(String,  nullable=False)  # handler name, see app.services.job_queue.register
+    payload      = Column(Text,    nullable=False)  # JSON string
+    priority     = Column(Integer, nullable=False, default=0)  # higher runs first
+    status       = Column(String,  nullable=False, default="queued")  # queued | running | done | dead
+    attempts     = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after    = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_by    = Column(String,  nullable=True)
+    locked_at    = Column(DateTime(timezone=True), nullable=True)
+    last_error   = Column(Text,    nullable=True)
+    created_at   = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at  = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Claim order; only queued rows are indexed so finished jobs don't bloat it
+        Index(
+            "ix_jobs_claim", priority.desc(), "run_after", "id",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        # Stale-lock sweep
+        Index("ix_jobs_running", "locked_at", postgresql_where=text("status = 'running'")),
+    )
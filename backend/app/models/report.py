@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geometry
@@ -28,12 +28,23 @@ class Report(Base):
     
     # Location metadata
     district = Column(String, nullable=True)  # Auto-filled via reverse geocoding
+    
+    # Incremental cluster membership (set by the cluster job)
+    cluster_id = Column(Integer, ForeignKey("report_clusters.id", ondelete="SET NULL"), nullable=True, index=True)
+    # Near-duplicate of an earlier report whose analysis this one inherits
+    duplicate_of_id = Column(Integer, ForeignKey("reports.id", ondelete="SET NULL"), nullable=True, index=True)
 
     owner    = relationship("User",    back_populates="reports")
     media    = relationship("Media",   back_populates="report")
     comments = relationship("Comment", back_populates="report", cascade="all, delete")
     confirmations = relationship("ReportConfirmation", back_populates="report", cascade="all, delete-orphan", lazy="dynamic")
     rescue_deployments = relationship("RescueDeployment", back_populates="report", cascade="all, delete")
+    cluster  = relationship("ReportCluster", back_populates="reports")
+
+    __table_args__ = (
+        # Keyset pagination order for report feeds (newest first)
+        Index("ix_reports_created_at_id", "created_at", "id"),
+    )
 
     @property
     def latitude(self):
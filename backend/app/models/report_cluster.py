@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+
+class ReportCluster(Base):
+    """A geographic group of same-hazard reports, grown incrementally by the cluster job"""
+    __tablename__ = "report_clusters"
+
+    id             = Column(Integer, primary_key=True, index=True)
+    hazard_type    = Column(String,  nullable=False)
+    status         = Column(String,  nullable=False, default="open")  # open | closed (no new reports in the lookback window)
+    center_lat     = Column(Float,   nullable=False)  # running mean of member locations
+    center_lon     = Column(Float,   nullable=False)
+    report_count   = Column(Integer, nullable=False, default=0)
+    max_severity   = Column(String,  nullable=True)
+    first_report_at = Column(DateTime(timezone=True), nullable=True)
+    last_report_at  = Column(DateTime(timezone=True), nullable=True)
+
+    # Latest multi-model verdict; analyzed_report_count is the membership it saw
+    authenticity_score      = Column(Float,  nullable=True)
+    ai_summary              = Column(Text,   nullable=True)
+    analysis_breakdown      = Column(Text,   nullable=True)  # JSON string
+    severity_recommendation = Column(String, nullable=True)
+    analyzed_report_count   = Column(Integer, nullable=False, default=0)
+    analyzed_at             = Column(DateTime(timezone=True), nullable=True)
+    needs_analysis          = Column(Boolean, nullable=False, default=False)  # forced re-analysis (severity escalated)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    reports = relationship("Report", back_populates="cluster")
+
+    __table_args__ = (
+        # Attachment looks up open clusters of one hazard type
+        Index("ix_report_clusters_open", "status", "hazard_type", "last_report_at"),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, BigInteger, Index
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.db.session import Base
+
+class ReportFingerprint(Base):
+    """Content hashes of a report for near-duplicate lookup (see app.services.near_duplicate)"""
+    __tablename__ = "report_fingerprints"
+
+    report_id    = Column(Integer, ForeignKey("reports.id", ondelete="CASCADE"), primary_key=True)
+    hazard_type  = Column(String,  nullable=False)
+    latitude     = Column(Float,   nullable=True)
+    longitude    = Column(Float,   nullable=True)
+    created_at   = Column(DateTime(timezone=True), nullable=False)  # the report's, for the lookup window
+    text_simhash = Column(BigInteger, nullable=True)  # 64-bit SimHash of the description, stored signed
+    image_phash  = Column(BigInteger, nullable=True)  # 64-bit difference hash of the first image, stored signed
+    # LSH buckets: (band index << width) | band bits; sharing any bucket makes a candidate
+    text_bands   = Column(ARRAY(Integer), nullable=True)
+    image_bands  = Column(ARRAY(Integer), nullable=True)
+
+    __table_args__ = (
+        Index("ix_report_fingerprints_window", "hazard_type", "created_at"),
+        Index("ix_report_fingerprints_text_bands", "text_bands", postgresql_using="gin"),
+        Index("ix_report_fingerprints_image_bands", "image_bands", postgresql_using="gin"),
+    )
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.db.session import Base
 
@@ -10,4 +12,17 @@ class SocialPost(Base):
     author = Column(String)
     content = Column(Text)
     url = Column(String)     # Link to the original post
-    published_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    url_hash = Column(String(64), nullable=True, unique=True)  # sha256(url): harvester dedupe key
+    published_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Full-text search document, maintained by Postgres (see crud.social); never loaded into rows
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(source, '') || ' ' || coalesce(content, ''))", persisted=True)
+    ))
+
+    __table_args__ = (
+        # Keyset pagination order for the social feed (newest first)
+        Index("ix_social_posts_published_at_id", "published_at", "id"),
+        Index("ix_social_posts_search_vector", "search_vector", postgresql_using="gin"),
+    )
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Float, Index
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class VideoAnalysisJob(Base):
+    """A Rekognition label-detection job for a video report, resumed by poll tick or SNS notification"""
+    __tablename__ = "video_analysis_jobs"
+
+    id                 = Column(Integer, primary_key=True, index=True)
+    report_id          = Column(Integer, ForeignKey("reports.id", ondelete="CASCADE"), nullable=False, index=True)
+    rekognition_job_id = Column(String,  nullable=False, unique=True)
+    s3_bucket          = Column(String,  nullable=False)
+    s3_key             = Column(String,  nullable=False)
+    hazard_type        = Column(String,  nullable=False)
+    latitude           = Column(Float,   nullable=True)
+    longitude          = Column(Float,   nullable=True)
+    status             = Column(String,  default="in_progress")  # in_progress | succeeded | failed | timed_out
+    context_json       = Column(Text,    nullable=True)  # weather/season/news results + stage timings at submission
+    error              = Column(Text,    nullable=True)
+    created_at         = Column(DateTime(timezone=True), server_default=func.now())
+    last_polled_at     = Column(DateTime(timezone=True), nullable=True)
+    completed_at       = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The poll tick only looks at open jobs
+        Index("ix_video_analysis_jobs_open", "status", "created_at"),
+    )
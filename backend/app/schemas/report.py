@@ -30,5 +30,6 @@ class ReportResponse(ReportBase):
     reporter_name:         Optional[str]  = None
     confirmation_count:    int = 0
     district:              Optional[str] = None
+    duplicate_of_id:       Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Disaster alert fan-out for verified reports.
+Recipients are selected with one PostGIS distance query; emails go out in
+SES bulk-templated chunks through a bounded worker pool, rate limited to the
+account's SES send rate.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.session import BackgroundSessionLocal
+from app.services.aws_services import (
+    SES_BULK_MAX_DESTINATIONS,
+    send_bulk_disaster_alert_emails,
+    send_disaster_alert_email,
+)
+
+logger = logging.getLogger(__name__)
+
+# Active citizens within radius of the report. Users who never shared
+# coordinates fall back to the previous rule: same state as the reporter.
+RECIPIENTS_SQL = text("""
+    SELECT u.email, u.full_name
+    FROM users u
+    WHERE u.role = 'citizen'
+      AND u.is_active = TRUE
+      AND u.email IS NOT NULL
+      AND (
+            (u.latitude IS NOT NULL AND u.longitude IS NOT NULL
+             AND ST_DWithin(
+                    ST_SetSRID(ST_MakePoint(u.longitude, u.latitude), 4326)::geography,
+                    ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography,
+                    :radius_m))
+         OR ((u.latitude IS NULL OR u.longitude IS NULL)
+             AND CAST(:report_state AS TEXT) IS NOT NULL
+             AND u.state = CAST(:report_state AS TEXT))
+      )
+""")
+
+REPORT_STATE_SQL = text("""
+    SELECT u.state
+    FROM reports r
+    JOIN users u ON u.id = r.user_id
+    WHERE r.id = :report_id
+""")
+
+# Metrics of the most recent fan-out
+last_fanout_stats: Dict = {}
+
+
+class RateLimiter:
+    """Token bucket shared by the worker pool (tokens = messages)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, SES_BULK_MAX_DESTINATIONS)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> None:
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _send_chunk(chunk: List[Tuple[str, str]], limiter: RateLimiter, alert: Dict) -> Tuple[int, int]:
+    """Send one chunk; returns (sent, failed). Falls back to single sends if the bulk call fails."""
+    limiter.acquire(len(chunk))
+    try:
+        sent = send_bulk_disaster_alert_emails(chunk, **alert)
+        return sent, len(chunk) - sent
+    except Exception as e:
+        logger.warning(f"Bulk alert send failed, falling back to single sends: {e}")
+
+    sent = 0
+    for email, name in chunk:
+        if send_disaster_alert_email(to_email=email, user_name=name or "User", **alert):
+            sent += 1
+    return sent, len(chunk) - sent
+
+
+def fan_out_disaster_alert(
+    report_id: int,
+    hazard_type: str,
+    report_lat: float,
+    report_lon: float,
+    severity: str,
+    description: str,
+    radius_km: float = 100.0
+) -> Dict:
+    """Email every active citizen within radius_km of a verified report. Returns delivery metrics."""
+    started = time.perf_counter()
+    db = BackgroundSessionLocal()
+    try:
+        report_state = db.execute(REPORT_STATE_SQL, {"report_id": report_id}).scalar()
+        recipients = [
+            (row.email, row.full_name)
+            for row in db.execute(RECIPIENTS_SQL, {
+                "lat": report_lat,
+                "lon": report_lon,
+                "radius_m": radius_km * 1000.0,
+                "report_state": report_state,
+            })
+        ]
+    finally:
+        db.close()
+    query_seconds = time.perf_counter() - started
+
+    alert = {
+        "disaster_type": hazard_type,
+        "location": f"{report_lat:.4f}°N, {report_lon:.4f}°E",
+        "severity": severity or "medium",
+        "description": description,
+    }
+    chunks = [
+        recipients[i:i + SES_BULK_MAX_DESTINATIONS]
+        for i in range(0, len(recipients), SES_BULK_MAX_DESTINATIONS)
+    ]
+
+    sent = failed = 0
+    if chunks:
+        limiter = RateLimiter(settings.SES_MAX_SEND_RATE)
+        with ThreadPoolExecutor(max_workers=settings.ALERT_FANOUT_WORKERS) as pool:
+            for chunk_sent, chunk_failed in pool.map(lambda c: _send_chunk(c, limiter, alert), chunks):
+                sent += chunk_sent
+                failed += chunk_failed
+
+    total_seconds = time.perf_counter() - started
+    stats = {
+        "report_id": report_id,
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "radius_km": radius_km,
+        "recipients": len(recipients),
+        "sent": sent,
+        "failed": failed,
+        "chunks": len(chunks),
+        "query_seconds": round(query_seconds, 4),
+        "total_seconds": round(total_seconds, 4),
+        "emails_per_second": round(sent / total_seconds, 2) if total_seconds > 0 else None,
+    }
+    last_fanout_stats.clear()
+    last_fanout_stats.update(stats)
+    logger.info(
+        f"Disaster alert fan-out for report {report_id}: {sent}/{len(recipients)} sent, "
+        f"{failed} failed in {total_seconds:.2f}s ({stats['emails_per_second']} emails/s)"
+    )
+    return stats
@@ -1,7 +1,10 @@
 """AWS Services for SMS (SNS) and Email (SES)"""
 import boto3
+import json
 import random
+import threading
 from datetime import datetime, timedelta
+from typing import List, Tuple
 from app.core.config import settings
 
 # Initialize AWS clients
@@ -51,107 +54,116 @@ def send_otp_sms(phone: str, otp: str) -> bool:
         print(f"SMS Error: {e}")
         return False
 
-def send_disaster_alert_email(to_email: str, user_name: str, disaster_type: str, 
-                               location: str, severity: str, description: str) -> bool:
-    """Send disaster alert email via AWS SES"""
-    try:
-        subject = f"⚠️ {severity.upper()} Alert: {disaster_type} near your location"
-        
-        html_body = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #0ea5e9 0%, #2563eb 100%); 
-                          color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f8fafc; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .alert-box {{ background: white; border-left: 4px solid #ef4444; 
-                             padding: 20px; margin: 20px 0; border-radius: 5px; }}
-                .severity-critical {{ border-left-color: #dc2626; }}
-                .severity-high {{ border-left-color: #f97316; }}
-                .severity-medium {{ border-left-color: #eab308; }}
-                .severity-low {{ border-left-color: #22c55e; }}
-                .button {{ display: inline-block; background: #0ea5e9; color: white; 
-                          padding: 12px 30px; text-decoration: none; border-radius: 5px; 
-                          margin: 20px 0; }}
-                .footer {{ text-align: center; color: #64748b; font-size: 12px; margin-top: 30px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1 style="margin: 0; font-size: 28px;">तट-Sahayk</h1>
-                    <p style="margin: 10px 0 0 0; opacity: 0.9;">Disaster Alert System</p>
+def _render_disaster_alert_email(user_name: str, disaster_type: str, location: str,
+                                 severity_label: str, severity_class: str, description: str):
+    """Build (subject, html_body, text_body) for a disaster alert email"""
+    subject = f"⚠️ {severity_label} Alert: {disaster_type} near your location"
+    
+    html_body = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            .header {{ background: linear-gradient(135deg, #0ea5e9 0%, #2563eb 100%); 
+                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
+            .content {{ background: #f8fafc; padding: 30px; border-radius: 0 0 10px 10px; }}
+            .alert-box {{ background: white; border-left: 4px solid #ef4444; 
+                         padding: 20px; margin: 20px 0; border-radius: 5px; }}
+            .severity-critical {{ border-left-color: #dc2626; }}
+            .severity-high {{ border-left-color: #f97316; }}
+            .severity-medium {{ border-left-color: #eab308; }}
+            .severity-low {{ border-left-color: #22c55e; }}
+            .button {{ display: inline-block; background: #0ea5e9; color: white; 
+                      padding: 12px 30px; text-decoration: none; border-radius: 5px; 
+                      margin: 20px 0; }}
+            .footer {{ text-align: center; color: #64748b; font-size: 12px; margin-top: 30px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1 style="margin: 0; font-size: 28px;">तट-Sahayk</h1>
+                <p style="margin: 10px 0 0 0; opacity: 0.9;">Disaster Alert System</p>
+            </div>
+            <div class="content">
+                <h2 style="color: #1e293b; margin-top: 0;">Hello {user_name},</h2>
+                <p>A verified disaster report has been registered near your location. Please take necessary precautions.</p>
+                
+                <div class="alert-box severity-{severity_class}">
+                    <h3 style="margin-top: 0; color: #1e293b;">🚨 {disaster_type}</h3>
+                    <p><strong>Severity:</strong> <span style="color: #ef4444; font-weight: bold;">{severity_label}</span></p>
+                    <p><strong>Location:</strong> {location}</p>
+                    <p><strong>Details:</strong> {description}</p>
                 </div>
-                <div class="content">
-                    <h2 style="color: #1e293b; margin-top: 0;">Hello {user_name},</h2>
-                    <p>A verified disaster report has been registered near your location. Please take necessary precautions.</p>
-                    
-                    <div class="alert-box severity-{severity.lower()}">
-                        <h3 style="margin-top: 0; color: #1e293b;">🚨 {disaster_type}</h3>
-                        <p><strong>Severity:</strong> <span style="color: #ef4444; font-weight: bold;">{severity.upper()}</span></p>
-                        <p><strong>Location:</strong> {location}</p>
-                        <p><strong>Details:</strong> {description}</p>
-                    </div>
-                    
-                    <h3 style="color: #1e293b;">Recommended Actions:</h3>
-                    <ul style="color: #475569;">
-                        <li>Stay alert and follow official instructions</li>
-                        <li>Keep emergency contacts handy</li>
-                        <li>Prepare emergency supplies if needed</li>
-                        <li>Monitor updates on तट-Sahayk platform</li>
-                    </ul>
-                    
-                    <div style="text-align: center;">
-                        <a href="https://tat-sahayk.com" class="button">View on तट-Sahayk</a>
-                    </div>
-                    
-                    <div style="background: #fef3c7; border: 1px solid #fbbf24; padding: 15px; 
-                               border-radius: 5px; margin-top: 20px;">
-                        <p style="margin: 0; color: #92400e; font-size: 14px;">
-                            <strong>Emergency Helplines:</strong><br>
-                            Disaster Management: 1077 | Police: 100 | Medical: 102
-                        </p>
-                    </div>
+                
+                <h3 style="color: #1e293b;">Recommended Actions:</h3>
+                <ul style="color: #475569;">
+                    <li>Stay alert and follow official instructions</li>
+                    <li>Keep emergency contacts handy</li>
+                    <li>Prepare emergency supplies if needed</li>
+                    <li>Monitor updates on तट-Sahayk platform</li>
+                </ul>
+                
+                <div style="text-align: center;">
+                    <a href="https://tat-sahayk.com" class="button">View on तट-Sahayk</a>
                 </div>
-                <div class="footer">
-                    <p>This is an automated alert from तट-Sahayk Disaster Management System</p>
-                    <p>You received this because a disaster was reported near your registered location</p>
+                
+                <div style="background: #fef3c7; border: 1px solid #fbbf24; padding: 15px; 
+                           border-radius: 5px; margin-top: 20px;">
+                    <p style="margin: 0; color: #92400e; font-size: 14px;">
+                        <strong>Emergency Helplines:</strong><br>
+                        Disaster Management: 1077 | Police: 100 | Medical: 102
+                    </p>
                 </div>
             </div>
-        </body>
-        </html>
-        """
-        
-        text_body = f"""
-        तट-Sahayk Disaster Alert
-        
-        Hello {user_name},
-        
-        A verified disaster report has been registered near your location.
-        
-        Type: {disaster_type}
-        Severity: {severity.upper()}
-        Location: {location}
-        Details: {description}
-        
-        Recommended Actions:
-        - Stay alert and follow official instructions
-        - Keep emergency contacts handy
-        - Prepare emergency supplies if needed
-        - Monitor updates on तट-Sahayk platform
-        
-        Emergency Helplines:
-        Disaster Management: 1077
-        Police: 100
-        Medical: 102
-        
-        Visit: https://tat-sahayk.com
-        
-        This is an automated alert from तट-Sahayk Disaster Management System.
-        """
+            <div class="footer">
+                <p>This is an automated alert from तट-Sahayk Disaster Management System</p>
+                <p>You received this because a disaster was reported near your registered location</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    text_body = f"""
+    तट-Sahayk Disaster Alert
+    
+    Hello {user_name},
+    
+    A verified disaster report has been registered near your location.
+    
+    Type: {disaster_type}
+    Severity: {severity_label}
+    Location: {location}
+    Details: {description}
+    
+    Recommended Actions:
+    - Stay alert and follow official instructions
+    - Keep emergency contacts handy
+    - Prepare emergency supplies if needed
+    - Monitor updates on तट-Sahayk platform
+    
+    Emergency Helplines:
+    Disaster Management: 1077
+    Police: 100
+    Medical: 102
+    
+    Visit: https://tat-sahayk.com
+    
+    This is an automated alert from तट-Sahayk Disaster Management System.
+    """
+    
+    return subject, html_body, text_body
+
+def send_disaster_alert_email(to_email: str, user_name: str, disaster_type: str, 
+                               location: str, severity: str, description: str) -> bool:
+    """Send disaster alert email via AWS SES"""
+    try:
+        subject, html_body, text_body = _render_disaster_alert_email(
+            user_name, disaster_type, location, severity.upper(), severity.lower(), description
+        )
         
         response = ses_client.send_email(
             Source='noreply@tat-sahayk.com',  # Must be verified in SES
@@ -168,3 +180,73 @@ def send_disaster_alert_email(to_email: str, user_name: str, disaster_type: str,
     except Exception as e:
         print(f"Email Error: {e}")
         return False
+
+# ── Bulk disaster alerts (SES templated email) ───────────────────────────────
+
+DISASTER_ALERT_TEMPLATE = "TatSahaykDisasterAlert"
+SES_BULK_MAX_DESTINATIONS = 50  # SES limit per SendBulkTemplatedEmail call
+
+_template_lock = threading.Lock()
+_template_ready = False
+
+def ensure_disaster_alert_template() -> None:
+    """Create (or refresh) the SES template used for bulk disaster alerts, once per process"""
+    global _template_ready
+    if _template_ready:
+        return
+    with _template_lock:
+        if _template_ready:
+            return
+        # Render with Handlebars placeholders; SES fills them per recipient
+        subject, html_body, text_body = _render_disaster_alert_email(
+            "{{user_name}}", "{{disaster_type}}", "{{location}}",
+            "{{severity_label}}", "{{severity_class}}", "{{description}}"
+        )
+        template = {
+            "TemplateName": DISASTER_ALERT_TEMPLATE,
+            "SubjectPart": subject,
+            "HtmlPart": html_body,
+            "TextPart": text_body,
+        }
+        try:
+            ses_client.create_template(Template=template)
+        except ses_client.exceptions.AlreadyExistsException:
+            ses_client.update_template(Template=template)
+        _template_ready = True
+
+def send_bulk_disaster_alert_emails(recipients: List[Tuple[str, str]], disaster_type: str,
+                                    location: str, severity: str, description: str) -> int:
+    """
+    Send one disaster alert to up to 50 recipients in a single SES call.
+
+    Args:
+        recipients: (email, user_name) pairs, at most SES_BULK_MAX_DESTINATIONS
+
+    Returns:
+        Number of messages SES accepted. Raises on API failure so the caller can fall back.
+    """
+    if len(recipients) > SES_BULK_MAX_DESTINATIONS:
+        raise ValueError(f"At most {SES_BULK_MAX_DESTINATIONS} recipients per bulk send")
+    
+    ensure_disaster_alert_template()
+    default_data = {
+        "user_name": "User",
+        "disaster_type": disaster_type,
+        "location": location,
+        "severity_label": severity.upper(),
+        "severity_class": severity.lower(),
+        "description": description,
+    }
+    response = ses_client.send_bulk_templated_email(
+        Source='noreply@tat-sahayk.com',  # Must be verified in SES
+        Template=DISASTER_ALERT_TEMPLATE,
+        DefaultTemplateData=json.dumps(default_data),
+        Destinations=[
+            {
+                "Destination": {"ToAddresses": [email]},
+                "ReplacementTemplateData": json.dumps({"user_name": name or "User"}),
+            }
+            for email, name in recipients
+        ]
+    )
+    return sum(1 for status in response.get("Status", []) if status.get("Status") == "Success")
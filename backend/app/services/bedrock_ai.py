@@ -1,7 +1,7 @@
+import asyncio
 import boto3
 import json
 import logging
-import requests
 import base64
 
 logger = logging.getLogger(__name__)
@@ -14,83 +14,41 @@ NOVA_MICRO_ID = "us.amazon.nova-micro-v1:0"
 def fetch_media_base64(url: str):
     """
     Fetch media from URL and convert to base64.
-    Handles both public URLs and S3 URLs with credentials.
+    Handles both public URLs and S3 URLs with credentials; the bytes come from
+    the shared media cache, so cluster analysis reuses the same download.
     """
-    if not url: 
-        return None, None
+    from app.services.media_fetch import fetch_media
     
-    try:
-        ext = url.split('.')[-1].lower().split('?')[0]  # handle S3 query params
-        
-        # Try to download from S3 using boto3 if it's an S3 URL
-        if 's3.amazonaws.com' in url or 's3.' in url:
-            try:
-                import boto3
-                from app.core.config import settings
-                
-                # Extract bucket and key from URL
-                url_path = url.split('amazonaws.com/')[-1]
-                parts = url_path.split('/', 1)
-                
-                if len(parts) == 2:
-                    # Format: bucket.s3.amazonaws.com/key
-                    bucket = url.split('//')[1].split('.')[0]
-                    key = parts[1] if len(parts) > 1 else parts[0]
-                else:
-                    # Format: s3.amazonaws.com/bucket/key
-                    bucket = settings.S3_BUCKET
-                    key = url_path
-                
-                # Download from S3 using credentials
-                s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_REGION
-                )
-                
-                response = s3_client.get_object(Bucket=bucket, Key=key)
-                content = response['Body'].read()
-                
-                b64_data = base64.b64encode(content).decode('utf-8')
-                fmt_map = {
-                    'jpg': 'jpeg', 'jpeg': 'jpeg',
-                    'png': 'png', 'gif': 'gif', 'webp': 'webp',
-                    'mp4': 'video', 'mov': 'video', 'webm': 'video'
-                }
-                media_type = fmt_map.get(ext, 'jpeg')
-                logger.info(f"Successfully fetched media from S3: {bucket}/{key}")
-                return b64_data, media_type
-                
-            except Exception as s3_error:
-                logger.warning(f"S3 download failed, trying public URL: {s3_error}")
-                # Fall through to try public URL
-        
-        # Try as public URL
-        resp = requests.get(url, timeout=10)
-        if resp.status_code == 200:
-            b64_data = base64.b64encode(resp.content).decode('utf-8')
-            fmt_map = {
-                'jpg': 'jpeg', 'jpeg': 'jpeg',
-                'png': 'png', 'gif': 'gif', 'webp': 'webp',
-                'mp4': 'video', 'mov': 'video', 'webm': 'video'
-            }
-            media_type = fmt_map.get(ext, 'jpeg')
-            logger.info(f"Successfully fetched media from public URL")
-            return b64_data, media_type
-        else:
-            logger.error(f"HTTP {resp.status_code} when fetching {url}")
-            
-    except Exception as e:
-        logger.error(f"Media fetch failed for {url}: {e}")
-    
-    return None, None
+    media = fetch_media(url)
+    if media is None:
+        return None, None
+    return base64.b64encode(media.data).decode('utf-8'), media.media_type
 
 def ask_forensic_vision_expert(hazard_type, lat, lon, b64_data, media_type):
     """
     Call AWS Bedrock Nova Pro for visual forensics.
     Raises exception on failure to allow graceful degradation in caller.
+    Verdicts are cached by image content + hazard type + region, so a
+    reposted image is not sent to the model again.
     """
+    from app.services.verdict_cache import get_or_compute, region_of, verdict_key
+    
+    # For videos, use AWS Rekognition instead with contextual verification
+    if media_type == "video":
+        logger.info(f"Video detected, using AWS Rekognition with contextual verification")
+        from app.services.rekognition_video import analyze_video_for_disaster, extract_s3_info_from_url
+        
+        # Note: This function is called from within analyze_single_report which has
+        # weather_ctx, season_ctx, news_ctx in scope, but they're not passed here.
+        # For videos, we need to get the media_url from the caller.
+        # This is a limitation - videos called from here won't have context.
+        # Videos should be handled in analyze_single_report before calling this function.
+        raise Exception("Video handling should be done in analyze_single_report, not here")
+    
+    key = verdict_key("nova_pro_vision", image=b64_data, hazard_type=hazard_type, region=region_of(lat, lon))
+    return get_or_compute(key, lambda: _forensic_vision_call(hazard_type, lat, lon, b64_data, media_type))
+
+def _forensic_vision_call(hazard_type, lat, lon, b64_data, media_type):
     prompt = f"""You are a disaster verification expert for an Indian emergency response system.
 
 A citizen submitted a report claiming: "{hazard_type}" at coordinates {lat}, {lon} (India).
@@ -116,18 +74,6 @@ SCORING RULES:
 
 Respond ONLY with the JSON object."""
 
-    # For videos, use AWS Rekognition instead with contextual verification
-    if media_type == "video":
-        logger.info(f"Video detected, using AWS Rekognition with contextual verification")
-        from app.services.rekognition_video import analyze_video_for_disaster, extract_s3_info_from_url
-        
-        # Note: This function is called from within analyze_single_report which has
-        # weather_ctx, season_ctx, news_ctx in scope, but they're not passed here.
-        # For videos, we need to get the media_url from the caller.
-        # This is a limitation - videos called from here won't have context.
-        # Videos should be handled in analyze_single_report before calling this function.
-        raise Exception("Video handling should be done in analyze_single_report, not here")
-    
     img_format = media_type
     
     try:
@@ -185,7 +131,14 @@ Respond ONLY with the JSON object."""
         logger.error(f"Bedrock API call failed: {e}")
         raise  # Re-raise to allow caller to handle
 
-def analyze_single_report(description, hazard_type, media_url, lat, lon, state=None):
+def analyze_single_report(description, hazard_type, media_url, lat, lon, state=None, report_id=None):
+    """
+    Sync entry point for background tasks (they run in worker threads without an event loop).
+    See analyze_single_report_async.
+    """
+    return asyncio.run(analyze_single_report_async(description, hazard_type, media_url, lat, lon, state, report_id))
+
+async def analyze_single_report_async(description, hazard_type, media_url, lat, lon, state=None, report_id=None):
     """
     Multi-layered disaster report verification combining:
     1. Real-time weather data
@@ -193,37 +146,27 @@ def analyze_single_report(description, hazard_type, media_url, lat, lon, state=N
     3. News corroboration
     4. Visual forensics (Nova Pro)
     
-    Gracefully degrades to context-only scoring if visual analysis fails.
-    """
-    from app.services.context_verifier import (
-        check_weather_context,
-        check_seasonal_context,
-        check_news_context,
-        calculate_combined_score
-    )
+    Layers 1-3 and the media download run concurrently under per-stage deadlines
+    and a total budget (see verification_pipeline). Gracefully degrades to
+    context-only scoring if visual analysis fails or runs out of time.
     
-    # Initialize context variables outside try block so they're available in except
-    weather_ctx = None
-    season_ctx = None
-    news_ctx = None
-    context_score = 0.5
+    With report_id, videos are submitted as asynchronous Rekognition jobs and a
+    preliminary context-only score is returned; the job writes the final score back.
+    """
+    from app.core.config import settings
+    from app.services.context_verifier import calculate_combined_score
+    from app.services.verification_pipeline import gather_context, run_stage
     
     try:
-        # --- Layer 1: Context checks (run even without image) ---
+        # --- Layer 1: Context checks + media download, concurrently ---
         logger.info(f"Running contextual verification for {hazard_type} at ({lat}, {lon})")
+        ctx = await gather_context(hazard_type, lat, lon, state, media_url)
+        weather_ctx, season_ctx, news_ctx = ctx.weather, ctx.season, ctx.news
         
-        weather_ctx = check_weather_context(lat, lon, hazard_type)
-        season_ctx = check_seasonal_context(hazard_type)
-        news_ctx = check_news_context(lat, lon, hazard_type, state)
-        
-        logger.info(f"Context checks: Weather={weather_ctx['weather_score']}, Season={season_ctx['season_score']}, News={news_ctx['news_score']}")
+        logger.info(f"Context checks: Weather={weather_ctx['weather_score']}, Season={season_ctx['season_score']}, News={news_ctx['news_score']} ({ctx.timings_ms})")
         
         # Base context score (average of the three)
-        context_score = (
-            weather_ctx["weather_score"] * 0.4 +
-            season_ctx["season_score"] * 0.3 +
-            news_ctx["news_score"] * 0.3
-        )
+        context_score = ctx.context_score
         
         if not media_url:
             # No image — rely on context only with penalty
@@ -232,68 +175,101 @@ def analyze_single_report(description, hazard_type, media_url, lat, lon, state=N
             return {
                 "authenticity_score": round(final_score, 2),
                 "preliminary_summary": summary,
-                "recommended_status": "pending" if final_score > 0.3 else "false"
+                "recommended_status": "pending" if final_score > 0.3 else "false",
+                "analysis_breakdown": ctx.breakdown()
             }
         
-        # --- Layer 2: Visual forensics ---
-        logger.info(f"Fetching media from {media_url}")
-        b64_data, media_type = fetch_media_base64(media_url)
-        
-        if not b64_data:
-            final_score = context_score * 0.5
-            summary = f"Image fetch failed. Context score only: {weather_ctx['note']} | {season_ctx['note']}"
-            return {
-                "authenticity_score": round(final_score, 2),
-                "preliminary_summary": summary,
-                "recommended_status": "pending"
-            }
+        b64_data, media_type = ctx.media
         
         # Handle videos separately (Rekognition instead of Bedrock)
         if media_type == "video":
             logger.info(f"Video detected, using AWS Rekognition with contextual verification")
-            try:
-                from app.services.rekognition_video import analyze_video_for_disaster, extract_s3_info_from_url
+            from app.services.rekognition_video import analyze_video_for_disaster, extract_s3_info_from_url
+            
+            # Extract S3 info from media URL
+            s3_info = extract_s3_info_from_url(media_url)
+            if not s3_info:
+                logger.warning(f"Could not extract S3 info from video URL: {media_url}")
+                # Fall back to context-only score
+                final_score = context_score * 0.5
+                summary = f"Video URL format not supported. Context: {weather_ctx['note']} | {season_ctx['note']} | {news_ctx['note']}"
+                return {
+                    "authenticity_score": round(final_score, 2),
+                    "preliminary_summary": summary,
+                    "recommended_status": "pending",
+                    "analysis_breakdown": ctx.breakdown()
+                }
+            
+            bucket, key = s3_info
+            
+            if report_id is not None:
+                from app.services.rekognition_video import submit_video_analysis
                 
-                # Extract S3 info from media URL
-                s3_info = extract_s3_info_from_url(media_url)
-                if s3_info:
-                    bucket, key = s3_info
-                    video_result = analyze_video_for_disaster(bucket, key, hazard_type, lat, lon, state)
-                    
-                    # Video analysis already includes contextual verification
-                    return {
-                        "authenticity_score": video_result.get("authenticity_score", 0.5),
-                        "preliminary_summary": video_result.get("summary", "Video analysis complete"),
-                        "recommended_status": "pending" if video_result.get("authenticity_score", 0.5) > 0.25 else "false"
-                    }
+                breakdown = ctx.breakdown()
+                job_id = await run_stage(
+                    ctx, "video_submit", submit_video_analysis,
+                    report_id, bucket, key, hazard_type, lat, lon,
+                    (weather_ctx, season_ctx, news_ctx), breakdown,
+                    stage_deadline=settings.AI_VISUAL_DEADLINE_SECONDS
+                )
+                final_score = context_score * 0.6  # provisional until the video result arrives
+                if job_id:
+                    summary = f"Video analysis in progress. Context: {weather_ctx['note']} | {season_ctx['note']} | {news_ctx['note']}"
                 else:
-                    logger.warning(f"Could not extract S3 info from video URL: {media_url}")
-                    # Fall back to context-only score
-                    final_score = context_score * 0.5
-                    summary = f"Video URL format not supported. Context: {weather_ctx['note']} | {season_ctx['note']} | {news_ctx['note']}"
-                    return {
-                        "authenticity_score": round(final_score, 2),
-                        "preliminary_summary": summary,
-                        "recommended_status": "pending"
-                    }
-            except Exception as video_error:
-                logger.error(f"Video analysis failed: {video_error}", exc_info=True)
-                # Fall back to context-only score
-                final_score = context_score * 0.6
-                summary = f"Video analysis failed. Context: {weather_ctx['note']} | {season_ctx['note']} | {news_ctx['note']}"
+                    summary = f"Video analysis could not be started. Context: {weather_ctx['note']} | {season_ctx['note']} | {news_ctx['note']}"
                 return {
                     "authenticity_score": round(final_score, 2),
                     "preliminary_summary": summary,
-                    "recommended_status": "pending"
+                    "recommended_status": "pending",
+                    "analysis_breakdown": {**ctx.breakdown(), "video_job_id": job_id}
                 }
+            
+            # No report to write back to: wait for Rekognition within what is left of the budget
+            video_result = await run_stage(
+                ctx, "visual", analyze_video_for_disaster,
+                bucket, key, hazard_type, lat, lon, state,
+                max_wait_seconds=max(5, int(ctx.remaining()) - 5),
+                context=(weather_ctx, season_ctx, news_ctx),
+                stage_deadline=ctx.remaining()
+            )
+            if video_result:
+                # Video analysis already includes contextual verification
+                return {
+                    "authenticity_score": video_result.get("authenticity_score", 0.5),
+                    "preliminary_summary": video_result.get("summary", "Video analysis complete"),
+                    "recommended_status": "pending" if video_result.get("authenticity_score", 0.5) > 0.25 else "false",
+                    "analysis_breakdown": ctx.breakdown()
+                }
+            
+            # Fall back to context-only score
+            final_score = context_score * 0.6
+            summary = f"Video analysis failed. Context: {weather_ctx['note']} | {season_ctx['note']} | {news_ctx['note']}"
+            return {
+                "authenticity_score": round(final_score, 2),
+                "preliminary_summary": summary,
+                "recommended_status": "pending",
+                "analysis_breakdown": ctx.breakdown()
+            }
         
-        # For images, use Bedrock Nova Pro
+        if not b64_data:
+            final_score = context_score * 0.5
+            summary = f"Image fetch failed. Context score only: {weather_ctx['note']} | {season_ctx['note']}"
+            return {
+                "authenticity_score": round(final_score, 2),
+                "preliminary_summary": summary,
+                "recommended_status": "pending",
+                "analysis_breakdown": ctx.breakdown()
+            }
+        
+        # --- Layer 2: Visual forensics (Nova Pro) ---
         logger.info(f"Running visual forensics with Nova Pro")
+        vision = await run_stage(
+            ctx, "visual", ask_forensic_vision_expert,
+            hazard_type, lat, lon, b64_data, media_type,
+            stage_deadline=settings.AI_VISUAL_DEADLINE_SECONDS
+        )
         
-        # Wrap visual analysis in try-catch for graceful degradation
-        try:
-            vision = ask_forensic_vision_expert(hazard_type, lat, lon, b64_data, media_type)
-            
+        if vision:
             visual_score = vision.get("authenticity_score", 0.3)
             is_fake = vision.get("is_fake", False)
             is_relevant = vision.get("is_disaster_relevant", True)
@@ -318,41 +294,36 @@ def analyze_single_report(description, hazard_type, media_url, lat, lon, state=N
             return {
                 "authenticity_score": final_score,
                 "preliminary_summary": summary,
-                "recommended_status": status
-            }
-            
-        except Exception as visual_error:
-            # Visual analysis failed - fall back to context-only scoring
-            logger.error(f"Visual analysis failed: {visual_error}", exc_info=True)
-            logger.info("Falling back to context-only scoring")
-            
-            # Use context score with penalty for missing visual verification
-            final_score = context_score * 0.6  # 40% penalty for no visual
-            
-            # Build summary with context details
-            summary_parts = [
-                "Visual analysis unavailable (Bedrock error)",
-                weather_ctx['note'],
-                season_ctx['note'],
-                news_ctx['note']
-            ]
-            summary = " | ".join(summary_parts)
-            
-            # Determine status based on context score
-            if final_score < 0.25:
-                status = "false"
-            elif final_score < 0.50:
-                status = "pending"
-            else:
-                status = "pending"  # Always require review without visual
-            
-            logger.info(f"Context-only score: {final_score} ({status})")
-            
-            return {
-                "authenticity_score": round(final_score, 2),
-                "preliminary_summary": summary,
-                "recommended_status": status
+                "recommended_status": status,
+                "analysis_breakdown": ctx.breakdown(visual_score)
             }
+        
+        # Visual analysis failed or timed out - fall back to context-only scoring
+        logger.info("Falling back to context-only scoring")
+        
+        # Use context score with penalty for missing visual verification
+        final_score = context_score * 0.6  # 40% penalty for no visual
+        
+        # Build summary with context details
+        summary_parts = [
+            "Visual analysis unavailable (Bedrock error or timeout)",
+            weather_ctx['note'],
+            season_ctx['note'],
+            news_ctx['note']
+        ]
+        summary = " | ".join(summary_parts)
+        
+        # Determine status based on context score
+        status = "false" if final_score < 0.25 else "pending"  # Always require review without visual
+        
+        logger.info(f"Context-only score: {final_score} ({status})")
+        
+        return {
+            "authenticity_score": round(final_score, 2),
+            "preliminary_summary": summary,
+            "recommended_status": status,
+            "analysis_breakdown": ctx.breakdown()
+        }
     
     except Exception as e:
         # Catastrophic failure - even context checks failed
@@ -362,7 +333,8 @@ def analyze_single_report(description, hazard_type, media_url, lat, lon, state=N
         return {
             "authenticity_score": 0.3,
             "preliminary_summary": f"Analysis system error: {str(e)} — manual review required",
-            "recommended_status": "pending"
+            "recommended_status": "pending",
+            "analysis_failed": True
         }
         if not is_relevant or is_fake or score < 0.25:
             status = "false"
@@ -396,7 +368,7 @@ def analyze_report_cluster(reports_data: list) -> dict:
 
     prompt += "\nOutput ONLY JSON: {\"cluster_summary\": \"<1 paragraph synthesis>\", \"severity\": \"<LOW|MEDIUM|HIGH|CRITICAL>\", \"confidence\": <float 0.0-1.0>}"
 
-    try:
+    def call():
         response = bedrock.invoke_model(
             modelId=NOVA_MICRO_ID,
             contentType="application/json",
@@ -408,6 +380,13 @@ def analyze_report_cluster(reports_data: list) -> dict:
         )
         res_text = json.loads(response["body"].read())["output"]["message"]["content"][0]["text"]
         return json.loads(res_text.strip("```json").strip("```").strip())
+
+    try:
+        from app.services.verdict_cache import get_or_compute, verdict_key
+        key = verdict_key("nova_micro_cluster", texts=[
+            f"{r.get('hazard_type', 'Unknown')} {r.get('description', '')}" for r in reports_data
+        ])
+        return dict(get_or_compute(key, call))
     except Exception as e:
         logger.error(f"Cluster analysis failed: {e}")
         return {"cluster_summary": "Analysis failed.", "severity": "MEDIUM", "confidence": 0.5}
\ No newline at end of file
@@ -1,132 +1,300 @@
 import asyncio
+import json
 import logging
+import math
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.core.config import settings
+from app.db.session import BackgroundSessionLocal, background_engine
 from app.models.report import Report
+from app.models.report_cluster import ReportCluster
+from app.services.job_queue import priority_for_severity
 from app.services.multi_model_ai import analyze_report_cluster_multi_model
+from app.services.spatial_clustering import group_by_radius, haversine
 from geoalchemy2.shape import to_shape
-import math
 
 logger = logging.getLogger(__name__)
 
 CLUSTER_RADIUS_KM = 80.0  # 80km radius for clustering
 MIN_REPORTS_FOR_AI = 2        # AI kicks in with 2+ reports in same area
-ANALYSIS_LOOKBACK_HOURS = 6   # Only analyze recent reports
+ANALYSIS_LOOKBACK_HOURS = 6   # Only attach recent reports; clusters idle this long are closed
+
+SEVERITY_ORDER = ["low", "medium", "high", "critical"]
 
+# Keeps two API instances' schedulers from attaching the same reports at once
+CLUSTER_JOB_LOCK_ID = 7301
 
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-    # Clamp 'a' to prevent floating-point errors causing domain error in asin
-    return R * 2 * math.asin(math.sqrt(min(1.0, a)))
+# Timings of the most recent run, for comparing grouping cost with AI cost
+last_run_stats = {}
 
 
 def run_cluster_analysis():
     """
-    Main job: finds geographic clusters of pending reports,
-    sends them to Bedrock for analysis, updates DB with AI scores.
+    Main job, incremental: attaches new pending reports to persisted
+    report_clusters, then sends only clusters whose membership changed
+    materially to Multi-Model AI and writes the scores back.
     """
-    db: Session = SessionLocal()
+    db: Session = BackgroundSessionLocal()
+    # Results are committed per cluster; skip reloading every object after each commit
+    db.expire_on_commit = False
+    # Transaction-scoped advisory lock on its own connection, held for the whole run
+    lock_conn = background_engine.connect()
     try:
+        if not lock_conn.execute(text("SELECT pg_try_advisory_xact_lock(:k)"), {"k": CLUSTER_JOB_LOCK_ID}).scalar():
+            logger.info("Cluster analysis already running elsewhere; skipping")
+            return
+
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=ANALYSIS_LOOKBACK_HOURS)
-        
-        # Get all pending reports that haven't been AI-analyzed yet
-        pending_reports = db.query(Report).filter(
+
+        # Only reports that are not in a cluster yet
+        new_reports = db.query(Report).filter(
             Report.status == "pending",
             Report.created_at >= cutoff_time,
-            Report.ai_authenticity_score == None  # noqa
-        ).all()
+            Report.cluster_id == None  # noqa
+        ).order_by(Report.created_at, Report.id).all()
 
-        if not pending_reports:
-            logger.info("No pending reports to analyze")
-            return
+        grouping_start = time.perf_counter()
+        attached, created = _attach_reports(db, new_reports, cutoff_time)
+        closed = db.query(ReportCluster).filter(
+            ReportCluster.status == "open",
+            ReportCluster.last_report_at < cutoff_time
+        ).update({"status": "closed"}, synchronize_session=False)
+        _score_isolated_reports(db, new_reports)
+        db.commit()
+        grouping_seconds = time.perf_counter() - grouping_start
 
-        logger.info(f"Analyzing {len(pending_reports)} pending reports")
-
-        # Group reports into geographic clusters
-        clusters = []
-        assigned = set()
-
-        for i, report in enumerate(pending_reports):
-            if i in assigned:
-                continue
-                
-            shape = to_shape(report.location)
-            lat1, lon1 = shape.y, shape.x
-            
-            cluster = [report]
-            assigned.add(i)
-
-            for j, other in enumerate(pending_reports):
-                if j in assigned or j == i:
-                    continue
-                other_shape = to_shape(other.location)
-                lat2, lon2 = other_shape.y, other_shape.x
-                
-                if haversine(lat1, lon1, lat2, lon2) <= CLUSTER_RADIUS_KM:
-                    # Also must be same hazard type for meaningful clustering
-                    if other.hazard_type == report.hazard_type:
-                        cluster.append(other)
-                        assigned.add(j)
-
-            clusters.append(cluster)
-
-        # Analyze each cluster
-        for cluster in clusters:
-            if len(cluster) < MIN_REPORTS_FOR_AI:
-                # Single isolated report — give a preliminary individual score
-                report = cluster[0]
-                shape = to_shape(report.location)
-                result = {
-                    "authenticity_score": 0.45,
-                    "summary": "Single isolated report. Awaiting corroborating reports from nearby citizens.",
-                    "severity_recommendation": report.severity or "medium",
-                }
-                _update_reports(db, cluster, result)
-                continue
-
-            # Build cluster payload for Bedrock
-            center_shape = to_shape(cluster[0].location)
-            
-            cluster_data = {
-                "hazard_type": cluster[0].hazard_type,
-                "location": f"{center_shape.y:.4f}°N, {center_shape.x:.4f}°E",
-                "district": getattr(cluster[0].owner, 'district', 'Unknown') if cluster[0].owner else 'Unknown',
-                "state": getattr(cluster[0].owner, 'state', 'Unknown') if cluster[0].owner else 'Unknown',
-                "report_count": len(cluster),
-                "reports": [
-                    {
-                        "description": r.description or "",
-                        "severity": r.severity or "medium",
-                        "has_image": len(r.media) > 0 if r.media else False,
-                        "image_url": r.media[0].file_path if (r.media and len(r.media) > 0) else None,
-                        "time": r.created_at.isoformat() if r.created_at else "",
-                    }
-                    for r in cluster
-                ]
-            }
+        # Most severe, then largest clusters first so they are scored before anything else
+        dirty = [
+            cluster for cluster in db.query(ReportCluster).filter(
+                ReportCluster.status == "open",
+                ReportCluster.report_count >= MIN_REPORTS_FOR_AI
+            ).all()
+            if _needs_analysis(cluster)
+        ]
+        dirty.sort(key=lambda c: (priority_for_severity(c.max_severity), c.report_count), reverse=True)
+        work = []
+        for cluster in dirty:
+            members = db.query(Report).filter(
+                Report.cluster_id == cluster.id,
+                Report.status == "pending",
+                Report.duplicate_of_id == None  # noqa
+            ).order_by(Report.created_at.desc()).all()
+            if len(members) >= MIN_REPORTS_FOR_AI:
+                work.append((cluster, members, _cluster_payload(cluster, members[:settings.CLUSTER_MAX_REPORTS_PER_ANALYSIS])))
 
-            logger.info(f"Sending cluster of {len(cluster)} {cluster[0].hazard_type} reports to Multi-Model AI")
-            
-            # Run async analysis
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            ai_result = loop.run_until_complete(analyze_report_cluster_multi_model(cluster_data))
-            loop.close()
-            
-            _update_reports(db, cluster, ai_result)
+        ai_start = time.perf_counter()
+        analyzed, failed = asyncio.run(_analyze_clusters(db, work)) if work else (0, 0)
+        ai_seconds = time.perf_counter() - ai_start
 
-        db.commit()
-        logger.info("Cluster analysis complete")
+        last_run_stats.update({
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "new_reports": len(new_reports),
+            "attached_to_existing": attached,
+            "clusters_created": created,
+            "clusters_closed": closed,
+            "ai_clusters": len(work),
+            "ai_clusters_failed": failed,
+            "concurrency": settings.CLUSTER_ANALYSIS_CONCURRENCY,
+            "grouping_seconds": round(grouping_seconds, 4),
+            "ai_seconds": round(ai_seconds, 4),
+        })
+        logger.info(
+            f"Cluster analysis complete: {len(new_reports)} new reports ({attached} attached, "
+            f"{created} new clusters); {analyzed} clusters analyzed, {failed} failed; "
+            f"grouping {grouping_seconds:.3f}s vs AI {ai_seconds:.3f}s"
+        )
 
     except Exception as e:
         logger.error(f"Cluster analysis job failed: {e}")
         db.rollback()
     finally:
         db.close()
+        lock_conn.close()  # ends the transaction, releasing the advisory lock
+
+
+def _severity_rank(severity):
+    return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else 0
+
+
+def _add_member(cluster, report, lat, lon):
+    """Attach report to cluster, keeping the running-mean center and max severity current"""
+    n = cluster.report_count or 0
+    cluster.center_lat = (cluster.center_lat * n + lat) / (n + 1)
+    cluster.center_lon = (cluster.center_lon * n + lon) / (n + 1)
+    cluster.report_count = n + 1
+    if cluster.max_severity is None or _severity_rank(report.severity) > _severity_rank(cluster.max_severity):
+        if cluster.analyzed_report_count:
+            cluster.needs_analysis = True  # escalation is a material change on its own
+        cluster.max_severity = report.severity or "medium"
+    if report.created_at and (cluster.last_report_at is None or report.created_at > cluster.last_report_at):
+        cluster.last_report_at = report.created_at
+    if report.created_at and (cluster.first_report_at is None or report.created_at < cluster.first_report_at):
+        cluster.first_report_at = report.created_at
+    cluster.status = "open"
+    report.cluster = cluster
+
+
+def _attach_reports(db, reports, cutoff_time):
+    """
+    Each new report joins the nearest open same-hazard cluster whose center is
+    within CLUSTER_RADIUS_KM; the rest are grouped among themselves into new
+    clusters. Returns (attached to existing, clusters created).
+    """
+    if not reports:
+        return 0, 0
+
+    # Near-duplicates ride along with their canonical report's cluster without
+    # counting as corroboration; one whose canonical is not clustered yet waits
+    duplicates = [r for r in reports if r.duplicate_of_id]
+    reports = [r for r in reports if not r.duplicate_of_id]
+
+    coords = {}
+    for report in reports:
+        shape = to_shape(report.location)
+        coords[report.id] = (shape.y, shape.x)
+
+    open_clusters = defaultdict(list)
+    for cluster in db.query(ReportCluster).filter(
+        ReportCluster.status == "open",
+        ReportCluster.last_report_at >= cutoff_time,
+        ReportCluster.hazard_type.in_(sorted({r.hazard_type for r in reports}))
+    ).all():
+        open_clusters[cluster.hazard_type].append(cluster)
+
+    attached = 0
+    unattached = []
+    for report in reports:
+        lat, lon = coords[report.id]
+        nearest, nearest_km = None, CLUSTER_RADIUS_KM
+        for cluster in open_clusters[report.hazard_type]:
+            distance = haversine(lat, lon, cluster.center_lat, cluster.center_lon)
+            if distance <= nearest_km:
+                nearest, nearest_km = cluster, distance
+        if nearest is None:
+            unattached.append(report)
+            continue
+        _add_member(nearest, report, lat, lon)
+        attached += 1
+
+    # Grid-indexed grouping of what is left seeds new clusters
+    groups = group_by_radius(
+        [(r.hazard_type, *coords[r.id]) for r in unattached],
+        CLUSTER_RADIUS_KM
+    )
+    for group in groups:
+        seed = unattached[group[0]]
+        lat, lon = coords[seed.id]
+        cluster = ReportCluster(
+            hazard_type=seed.hazard_type, center_lat=lat, center_lon=lon,
+            report_count=0, analyzed_report_count=0,
+        )
+        db.add(cluster)
+        for i in group:
+            _add_member(cluster, unattached[i], *coords[unattached[i].id])
+
+    db.flush()
+    for report in duplicates:
+        canonical = db.get(Report, report.duplicate_of_id)
+        if canonical is not None and canonical.cluster_id is not None:
+            report.cluster_id = canonical.cluster_id
+    return attached, len(groups)
+
+
+def _needs_analysis(cluster):
+    """First analysis at MIN_REPORTS_FOR_AI members; after that only on material change"""
+    if cluster.report_count < MIN_REPORTS_FOR_AI:
+        return False
+    if not cluster.analyzed_report_count or cluster.needs_analysis:
+        return True
+    growth = cluster.report_count - cluster.analyzed_report_count
+    return growth >= max(1, math.ceil(cluster.analyzed_report_count * settings.CLUSTER_REANALYZE_GROWTH))
+
+
+def _score_isolated_reports(db, reports):
+    """Unscored reports that are still alone in their cluster get a preliminary individual score"""
+    for report in reports:
+        cluster = report.cluster
+        if report.ai_authenticity_score is not None or report.duplicate_of_id or cluster is None or cluster.report_count >= MIN_REPORTS_FOR_AI:
+            continue
+        result = {
+            "authenticity_score": 0.45,
+            "summary": "Single isolated report. Awaiting corroborating reports from nearby citizens.",
+            "severity_recommendation": report.severity or "medium",
+        }
+        _update_reports(db, [report], result)
+
+
+def _cluster_payload(cluster, reports):
+    """Build the multi-model input for a cluster (touches lazy relationships, so call it on the job thread)"""
+    return {
+        "hazard_type": cluster.hazard_type,
+        "location": f"{cluster.center_lat:.4f}°N, {cluster.center_lon:.4f}°E",
+        "district": getattr(reports[0].owner, 'district', 'Unknown') if reports[0].owner else 'Unknown',
+        "state": getattr(reports[0].owner, 'state', 'Unknown') if reports[0].owner else 'Unknown',
+        "report_count": cluster.report_count,
+        "reports": [
+            {
+                "description": r.description or "",
+                "severity": r.severity or "medium",
+                "has_image": len(r.media) > 0 if r.media else False,
+                "image_url": r.media[0].file_path if (r.media and len(r.media) > 0) else None,
+                "time": r.created_at.isoformat() if r.created_at else "",
+            }
+            for r in reports
+        ]
+    }
+
+
+async def _analyze_clusters(db, work):
+    """
+    Analyze (cluster, members, payload) items concurrently on one event loop,
+    at most CLUSTER_ANALYSIS_CONCURRENCY at a time, committing each result as
+    it lands. Returns (analyzed, failed).
+    """
+    slots = asyncio.Semaphore(settings.CLUSTER_ANALYSIS_CONCURRENCY)
+
+    async def analyze(index):
+        cluster, members, payload = work[index]
+        async with slots:
+            logger.info(f"Sending cluster {cluster.id} ({cluster.report_count} {cluster.hazard_type} reports) to Multi-Model AI")
+            return index, await analyze_report_cluster_multi_model(payload)
+
+    # Tasks start in list order, so the semaphore admits clusters by priority
+    tasks = [asyncio.ensure_future(analyze(i)) for i in range(len(work))]
+    analyzed = failed = 0
+    for next_done in asyncio.as_completed(tasks):
+        try:
+            index, ai_result = await next_done
+        except Exception as e:
+            # Cluster stays dirty; the next run retries it
+            logger.error(f"Cluster analysis failed: {e}")
+            failed += 1
+            continue
+        cluster, members, _ = work[index]
+        try:
+            _save_cluster_result(cluster, ai_result)
+            _update_reports(db, members, ai_result)
+            db.commit()
+            analyzed += 1
+        except Exception as e:
+            logger.error(f"Saving analysis for cluster {cluster.id} failed: {e}")
+            db.rollback()
+            failed += 1
+    return analyzed, failed
+
+
+def _save_cluster_result(cluster, ai_result):
+    cluster.authenticity_score = ai_result.get("authenticity_score", 0.5)
+    cluster.ai_summary = ai_result.get("summary", "")
+    cluster.severity_recommendation = ai_result.get("severity_recommendation")
+    if ai_result.get("analysis_breakdown"):
+        cluster.analysis_breakdown = json.dumps(ai_result["analysis_breakdown"])
+    cluster.analyzed_report_count = cluster.report_count
+    cluster.analyzed_at = datetime.now(timezone.utc)
+    cluster.needs_analysis = False
 
 
 def _update_reports(db, reports, ai_result):
@@ -135,10 +303,16 @@ def _update_reports(db, reports, ai_result):
         report.ai_authenticity_score = ai_result.get("authenticity_score", 0.5)
         report.ai_analysis_summary = ai_result.get("summary", "")
         
-        # Store analysis breakdown as JSON string if available
+        # Store analysis breakdown as JSON string if available, keeping the
+        # single-report verification fields (stage timings etc.) already there
         if ai_result.get("analysis_breakdown"):
-            import json
-            report.ai_analysis_breakdown = json.dumps(ai_result["analysis_breakdown"])
+            existing = {}
+            if report.ai_analysis_breakdown:
+                try:
+                    existing = json.loads(report.ai_analysis_breakdown)
+                except ValueError:
+                    pass
+            report.ai_analysis_breakdown = json.dumps({**existing, **ai_result["analysis_breakdown"]})
         
         # Optionally escalate severity if AI recommends critical
         if ai_result.get("severity_recommendation") == "critical" and report.severity != "critical":
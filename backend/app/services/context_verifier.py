@@ -1,7 +1,9 @@
 import httpx
 import datetime
 import logging
+import time
 from typing import Dict
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -9,6 +11,18 @@ logger = logging.getLogger(__name__)
 OPENWEATHER_API_KEY = settings.OPENWEATHER_API_KEY
 TAVILY_API_KEY = settings.TAVILY_API_KEY
 
+# One keep-alive client for all context sources (OpenWeather, Tavily, Google News)
+_http = httpx.Client(
+    timeout=10,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    headers={"User-Agent": "TatSahayk/1.0"},
+)
+
+# Current weather per (lat cell, lon cell, time bucket). Shared by report and
+# video scoring; concurrent misses for one cell make a single request.
+_weather_cache = TTLCache(maxsize=settings.WEATHER_CACHE_MAXSIZE, ttl=settings.WEATHER_CACHE_TTL_SECONDS)
+WEATHER_FAILURE_TTL_SECONDS = 30  # back off briefly instead of retrying per report during an outage
+
 # Map disaster types to expected weather conditions
 DISASTER_WEATHER_MAP = {
     "Flood":         ["Rain", "Thunderstorm", "Drizzle"],
@@ -39,6 +53,50 @@ DISASTER_SEASON_MAP = {
 }
 
 
+def _weather_cell(lat: float, lon: float):
+    size = settings.WEATHER_CELL_DEGREES
+    bucket = int(time.time() // settings.WEATHER_CACHE_TTL_SECONDS)
+    return round(lat / size), round(lon / size), bucket
+
+
+def _fetch_current_weather(lat: float, lon: float) -> Dict:
+    try:
+        res = _http.get(
+            "https://api.openweathermap.org/data/2.5/weather",
+            params={"lat": lat, "lon": lon, "appid": OPENWEATHER_API_KEY},
+            timeout=5
+        )
+        if res.status_code != 200:
+            raise Exception(f"Weather API returned {res.status_code}")
+        data = res.json()
+        return {"main": data["weather"][0]["main"], "name": data.get("name", "Unknown")}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def get_current_weather(lat: float, lon: float) -> Dict:
+    """Current conditions for the grid cell around (lat, lon): {"main", "name"} or {"error"}"""
+    key = _weather_cell(lat, lon)
+    size = settings.WEATHER_CELL_DEGREES
+    fetched = False
+
+    def load():
+        nonlocal fetched
+        fetched = True
+        # Query the cell centre so every report in the cell gets the same answer
+        return _fetch_current_weather(key[0] * size, key[1] * size)
+
+    observation = _weather_cache.get_or_set(key, load)
+    if fetched and "error" in observation:
+        # Shorten only a fresh failure; re-arming on cache hits would never retry
+        _weather_cache.set(key, observation, ttl=WEATHER_FAILURE_TTL_SECONDS)
+    return observation
+
+
+def weather_cache_stats() -> Dict:
+    return _weather_cache.stats()
+
+
 def check_weather_context(lat: float, lon: float, hazard_type: str) -> Dict:
     """
     Check if current weather matches the reported disaster type.
@@ -55,18 +113,12 @@ def check_weather_context(lat: float, lon: float, hazard_type: str) -> Dict:
         }
     
     try:
-        res = httpx.get(
-            "https://api.openweathermap.org/data/2.5/weather",
-            params={"lat": lat, "lon": lon, "appid": OPENWEATHER_API_KEY},
-            timeout=5
-        )
+        observation = get_current_weather(lat, lon)
+        if "error" in observation:
+            raise Exception(observation["error"])
         
-        if res.status_code != 200:
-            raise Exception(f"Weather API returned {res.status_code}")
-        
-        data = res.json()
-        current_weather = data["weather"][0]["main"]
-        location_name = data.get("name", "Unknown")
+        current_weather = observation["main"]
+        location_name = observation["name"]
         
         expected_weather = DISASTER_WEATHER_MAP.get(hazard_type)
         
@@ -154,7 +206,7 @@ def _check_news_tavily(hazard_type: str, state: str = None) -> Dict:
         location = state if state else "India"
         query = f"{hazard_type} disaster {location} recent"
         
-        response = httpx.post(
+        response = _http.post(
             "https://api.tavily.com/search",
             json={
                 "api_key": TAVILY_API_KEY,
@@ -210,10 +262,9 @@ def _check_news_google_rss(hazard_type: str, state: str = None) -> Dict:
         # Google News RSS feed (last 2 days)
         url = f"https://news.google.com/rss/search?q={query}+when:2d&hl=en-IN&gl=IN&ceid=IN:en"
         
-        res = httpx.get(
+        res = _http.get(
             url,
             timeout=5,
-            headers={"User-Agent": "TatSahayk/1.0"},
             follow_redirects=True
         )
         
@@ -1,23 +1,141 @@
 """
-Reverse geocoding service using OpenStreetMap Nominatim API
-Free, no API key required
+Reverse geocoding: coordinates -> district.
+
+1. Offline lookup against India district boundary polygons (STRtree over
+   prepared geometries, microseconds per lookup).
+2. Geohash-keyed cache of earlier online lookups (in-process + geocode_cache table).
+3. OpenStreetMap Nominatim as a last resort, throttled to its 1 request/second policy.
 """
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
 import httpx
-from typing import Optional
+import shapely
+from shapely.geometry import Point, shape
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services import geohash
 
-def get_district_from_coords(lat: float, lon: float) -> Optional[str]:
-    """
-    Reverse geocode coordinates to get district/city name.
-    Uses OpenStreetMap Nominatim - free, no API key needed.
-    
-    Args:
-        lat: Latitude in decimal degrees
-        lon: Longitude in decimal degrees
-        
-    Returns:
-        District/city name or None if geocoding fails
-    """
+logger = logging.getLogger(__name__)
+
+DEFAULT_BOUNDARIES_PATH = Path(__file__).resolve().parent.parent / "data" / "india_districts.geojson"
+
+# Property names used by the common India district datasets (DataMeet, GADM, LGD exports)
+DISTRICT_KEYS = ("district", "DISTRICT", "dtname", "NAME_2", "Dist_Name")
+STATE_KEYS = ("state", "STATE", "st_nm", "NAME_1", "State_Name")
+
+_MISS = object()
+
+
+class DistrictIndex:
+    """Point-in-polygon index over district boundaries"""
+
+    def __init__(self, geometries: List, names: List[Tuple[str, Optional[str]]]):
+        self.names = names
+        self.geometries = geometries
+        shapely.prepare(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+
+    @classmethod
+    def from_geojson(cls, path: Path) -> "DistrictIndex":
+        with open(path, encoding="utf-8") as f:
+            collection = json.load(f)
+
+        geometries, names = [], []
+        for feature in collection.get("features", []):
+            props = feature.get("properties") or {}
+            district = next((props[k] for k in DISTRICT_KEYS if props.get(k)), None)
+            if not district or not feature.get("geometry"):
+                continue
+            state = next((props[k] for k in STATE_KEYS if props.get(k)), None)
+            geometries.append(shape(feature["geometry"]))
+            names.append((district, state))
+        return cls(geometries, names)
+
+    def __len__(self):
+        return len(self.geometries)
+
+    def lookup(self, lat: float, lon: float) -> Optional[Tuple[str, Optional[str]]]:
+        hits = self.tree.query(Point(lon, lat), predicate="within")
+        if len(hits) == 0:
+            return None
+        return self.names[int(min(hits))]
+
+
+_index: Optional[DistrictIndex] = None
+_index_lock = threading.Lock()
+
+
+def boundaries_path() -> Path:
+    return Path(settings.DISTRICT_BOUNDARIES_PATH or DEFAULT_BOUNDARIES_PATH)
+
+
+def get_district_index() -> Optional[DistrictIndex]:
+    """Loaded once per process (call at startup to warm it); None when the boundary file is missing or empty"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = boundaries_path()
+                if not path.exists():
+                    _index = DistrictIndex([], [])
+                else:
+                    started = time.perf_counter()
+                    _index = DistrictIndex.from_geojson(path)
+                    logger.info(f"Loaded {len(_index)} district boundaries in {time.perf_counter() - started:.2f}s")
+                if not len(_index):
+                    logger.warning(
+                        f"No district boundaries loaded from {path}: every report will be reverse "
+                        f"geocoded through Nominatim (1 req/s). Run python scripts/build_district_boundaries.py"
+                    )
+    return _index if len(_index) else None
+
+
+def lookup_district_offline(lat: float, lon: float) -> Optional[str]:
+    index = get_district_index()
+    if index is None:
+        return None
+    hit = index.lookup(lat, lon)
+    return hit[0] if hit else None
+
+
+class _Throttle:
+    """Keeps calls at least `interval` apart across threads; gives up if the queue is too long"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            if slot - now > max_wait:
+                return False
+            self._next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+        return True
+
+
+_nominatim_throttle = _Throttle(settings.NOMINATIM_MIN_INTERVAL_SECONDS)
+
+# Hot cells stay in memory; the table survives restarts and is shared across instances
+_cell_cache = TTLCache(maxsize=50000, ttl=24 * 3600)
+
+
+def _nominatim_reverse(lat: float, lon: float):
+    """Returns (district, state) — possibly (None, None) — or _MISS on error/throttle"""
+    if not _nominatim_throttle.acquire(settings.NOMINATIM_MAX_WAIT_SECONDS):
+        logger.warning(f"Nominatim throttle queue full, skipping ({lat}, {lon})")
+        return _MISS
     try:
         response = httpx.get(
             "https://nominatim.openstreetmap.org/reverse",
@@ -30,16 +148,12 @@ def get_district_from_coords(lat: float, lon: float) -> Optional[str]:
             headers={"User-Agent": "TatSahayk/1.0"},
             timeout=5.0
         )
-        
         if response.status_code != 200:
-            print(f"Nominatim returned status {response.status_code}")
-            return None
-            
-        data = response.json()
-        address = data.get("address", {})
-        
+            logger.warning(f"Nominatim returned status {response.status_code}")
+            return _MISS
+
+        address = response.json().get("address", {})
         # Nominatim returns district in different fields depending on region
-        # Try multiple fields in order of preference
         district = (
             address.get("city") or
             address.get("county") or
@@ -49,17 +163,65 @@ def get_district_from_coords(lat: float, lon: float) -> Optional[str]:
             address.get("village") or
             None
         )
-        
-        if district:
-            print(f"Geocoded ({lat}, {lon}) → {district}")
-        else:
-            print(f"No district found for ({lat}, {lon})")
-            
-        return district
-        
+        return district, address.get("state")
     except httpx.TimeoutException:
-        print(f"Geocoding timeout for ({lat}, {lon})")
-        return None
+        logger.warning(f"Geocoding timeout for ({lat}, {lon})")
+        return _MISS
     except Exception as e:
-        print(f"Geocoding failed for ({lat}, {lon}): {e}")
-        return None
+        logger.error(f"Geocoding failed for ({lat}, {lon}): {e}")
+        return _MISS
+
+
+def _cached_online_lookup(db: Session, lat: float, lon: float) -> Optional[str]:
+    from app.models.geocode_cache import GeocodeCache
+
+    cell = geohash.encode(lat, lon, settings.GEOCODE_CACHE_PRECISION)
+    cached = _cell_cache.get(cell, _MISS)
+    if cached is not _MISS:
+        return cached
+
+    row = db.get(GeocodeCache, cell)
+    if row is not None:
+        _cell_cache.set(cell, row.district)
+        return row.district
+
+    result = _nominatim_reverse(lat, lon)
+    if result is _MISS:
+        return None  # transient failure: not cached, next report in this cell retries
+
+    district, state = result
+    db.execute(
+        pg_insert(GeocodeCache)
+        .values(geohash=cell, district=district, state=state, source="nominatim")
+        .on_conflict_do_nothing(index_elements=["geohash"])
+    )
+    db.commit()
+    _cell_cache.set(cell, district)
+    return district
+
+
+def get_district_from_coords(lat: float, lon: float, db: Optional[Session] = None) -> Optional[str]:
+    """
+    Reverse geocode coordinates to get district/city name.
+
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        db: Session for the persistent cache (a background session is opened if omitted)
+
+    Returns:
+        District/city name or None if geocoding fails
+    """
+    district = lookup_district_offline(lat, lon)
+    if district:
+        return district
+
+    if db is not None:
+        return _cached_online_lookup(db, lat, lon)
+
+    from app.db.session import BackgroundSessionLocal
+    own_db = BackgroundSessionLocal()
+    try:
+        return _cached_online_lookup(own_db, lat, lon)
+    finally:
+        own_db.close()
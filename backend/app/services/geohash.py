@@ -0,0 +1,36 @@
+"""
+Minimal geohash encoder, used to key caches by location cell.
+Precision 5 ≈ 4.9 km x 4.9 km, 6 ≈ 1.2 km x 0.6 km, 7 ≈ 153 m x 153 m.
+"""
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode(lat: float, lon: float, precision: int = 6) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bit, ch, even = 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                ch = (ch << 1) | 1
+                lon_lo = mid
+            else:
+                ch <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch = (ch << 1) | 1
+                lat_lo = mid
+            else:
+                ch <<= 1
+                lat_hi = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[ch])
+            bit, ch = 0, 0
+    return "".join(chars)
@@ -0,0 +1,153 @@
+"""
+Durable background job queue on the `jobs` table.
+
+The API enqueues and returns; `python -m app.worker` processes claim work with
+FOR UPDATE SKIP LOCKED, so any number of workers can share the table without
+handing the same job out twice. Higher priority (report severity) is claimed
+first, failures are retried with exponential backoff plus jitter, and a job
+whose worker died is put back once its lock goes stale.
+"""
+import json
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, text
+
+from app.core.config import settings
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_PRIORITY = {"critical": 30, "high": 20, "medium": 10, "low": 0}
+
+# kind -> handler(db, payload, job); filled by app.services.report_jobs
+HANDLERS: Dict[str, Callable] = {}
+
+
+def register(kind: str):
+    def decorator(fn: Callable) -> Callable:
+        HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+
+def priority_for_severity(severity: Optional[str]) -> int:
+    return SEVERITY_PRIORITY.get((severity or "").lower(), 0)
+
+
+def enqueue(db, kind: str, payload: Dict, priority: int = 0, max_attempts: Optional[int] = None, commit: bool = True) -> Job:
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload),
+        priority=priority,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    if commit:
+        db.commit()
+    return job
+
+
+_CLAIM_SQL = text("""
+    UPDATE jobs
+    SET status = 'running', locked_by = :worker, locked_at = now(), attempts = attempts + 1
+    WHERE id IN (
+        SELECT id FROM jobs
+        WHERE status = 'queued' AND run_after <= now()
+        ORDER BY priority DESC, run_after, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, payload, attempts, max_attempts
+""")
+
+
+def claim(db, worker_id: str, limit: int) -> List[Dict]:
+    """Mark up to `limit` due jobs as running for this worker and return them"""
+    if limit <= 0:
+        return []
+    rows = db.execute(_CLAIM_SQL, {"worker": worker_id, "limit": limit}).mappings().all()
+    db.commit()
+    return [dict(row) for row in rows]
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(settings.JOB_BACKOFF_MAX_SECONDS, settings.JOB_BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.5, 1.0)  # jitter so a failed burst doesn't retry in lockstep
+
+
+def complete(db, job_id: int):
+    db.query(Job).filter(Job.id == job_id).update(
+        {"status": "done", "finished_at": func.now(), "locked_by": None, "last_error": None},
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+def fail(db, job: Dict, error: str):
+    """Requeue with backoff, or give up once max_attempts is reached"""
+    if job["attempts"] >= job["max_attempts"]:
+        values = {"status": "dead", "finished_at": func.now()}
+        logger.error(f"Job {job['id']} ({job['kind']}) gave up after {job['attempts']} attempts: {error}")
+    else:
+        delay = backoff_seconds(job["attempts"])
+        values = {"status": "queued", "run_after": datetime.now(timezone.utc) + timedelta(seconds=delay)}
+        logger.warning(f"Job {job['id']} ({job['kind']}) attempt {job['attempts']} failed, retrying in {delay:.0f}s: {error}")
+    db.query(Job).filter(Job.id == job["id"]).update(
+        {**values, "locked_by": None, "last_error": error[:2000]}, synchronize_session=False
+    )
+    db.commit()
+
+
+def execute(db, job: Dict):
+    """Run one claimed job's handler and record the outcome"""
+    handler = HANDLERS.get(job["kind"])
+    if handler is None:
+        fail(db, {**job, "attempts": job["max_attempts"]}, f"No handler registered for '{job['kind']}'")
+        return
+    try:
+        handler(db, json.loads(job["payload"]), job)
+    except Exception as e:
+        db.rollback()
+        fail(db, job, f"{type(e).__name__}: {e}")
+        return
+    complete(db, job["id"])
+
+
+def requeue_stale(db) -> int:
+    """Jobs left running by a worker that died go back to the queue"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS)
+    count = db.query(Job).filter(Job.status == "running", Job.locked_at < cutoff).update(
+        {"status": "queued", "locked_by": None, "run_after": func.now()}, synchronize_session=False
+    )
+    db.commit()
+    if count:
+        logger.warning(f"Requeued {count} jobs with stale locks")
+    return count
+
+
+def queue_stats(db) -> Dict:
+    """Queue depth per kind/status plus the age of the oldest due job (for /metrics)"""
+    by_status: Dict[str, Dict[str, int]] = {}
+    for kind, status, count in (
+        db.query(Job.kind, Job.status, func.count(Job.id))
+        .filter(Job.status.in_(["queued", "running", "dead"]))
+        .group_by(Job.kind, Job.status)
+        .all()
+    ):
+        by_status.setdefault(status, {})[kind] = count
+
+    oldest = db.query(func.min(Job.run_after)).filter(
+        Job.status == "queued", Job.run_after <= func.now()
+    ).scalar()
+    oldest_age = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+
+    return {
+        "queued": sum(by_status.get("queued", {}).values()),
+        "running": sum(by_status.get("running", {}).values()),
+        "dead": sum(by_status.get("dead", {}).values()),
+        "by_kind": by_status,
+        "oldest_due_age_seconds": round(max(0.0, oldest_age), 1),
+    }
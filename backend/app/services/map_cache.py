@@ -0,0 +1,121 @@
+"""
+Versioned snapshot cache for the public map endpoints.
+
+Writes that change what the map shows (report verify/delete, annotations,
+deployed forces) call bump_map_version(). Snapshots are keyed on that version,
+so idle map viewers are served from memory, and with ETag/Last-Modified a
+polling client that is up to date gets a 304 without any DB work.
+
+The version counter is per process; the TTL bounds how stale another API
+instance can be after a write it did not see. Builders run on the async
+session, so the endpoints never hold a threadpool thread.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_version_lock = threading.Lock()
+_version = 0
+
+_snapshots = TTLCache(maxsize=32, ttl=settings.MAP_CACHE_TTL_SECONDS)
+
+# One build lock per (name, version) so a burst of misses runs one rebuild
+_build_locks: Dict[tuple, asyncio.Lock] = {}
+
+# Last body hash and modification time per snapshot name, so a TTL rebuild
+# with identical content keeps its Last-Modified
+_last_seen: Dict[str, tuple] = {}
+
+
+@dataclass(frozen=True)
+class MapSnapshot:
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+def bump_map_version() -> None:
+    """Invalidate all map snapshots. Call after committing a map-visible write."""
+    global _version
+    with _version_lock:
+        _version += 1
+
+
+async def get_map_snapshot(name: str, builder: Callable[[], Awaitable[Any]]) -> MapSnapshot:
+    """
+    Return the snapshot for the current data version, awaiting builder() once
+    if it is missing. Concurrent misses for the same version wait on one build.
+    """
+    with _version_lock:
+        version = _version
+    key = (name, version)
+
+    snapshot = _snapshots.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    lock = _build_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            snapshot = _snapshots.get(key)
+            if snapshot is None:
+                snapshot = _build_snapshot(name, await builder())
+                _snapshots.set(key, snapshot)
+            return snapshot
+    finally:
+        if _build_locks.get(key) is lock and not lock.locked():
+            del _build_locks[key]
+
+
+def snapshot_response(request: Request, snapshot: MapSnapshot) -> Response:
+    """Serve a snapshot, answering 304 Not Modified to up-to-date conditional GETs."""
+    headers = {
+        "ETag": snapshot.etag,
+        "Last-Modified": format_datetime(snapshot.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",  # Clients may store it but must revalidate
+    }
+    if _not_modified(request, snapshot):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+def _build_snapshot(name: str, payload: Any) -> MapSnapshot:
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+    digest = hashlib.sha1(body).hexdigest()
+
+    previous = _last_seen.get(name)
+    if previous and previous[0] == digest:
+        last_modified = previous[1]
+    else:
+        last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        _last_seen[name] = (digest, last_modified)
+
+    # Content-derived ETag so it is stable across API instances
+    return MapSnapshot(body=body, etag=f'"{digest}"', last_modified=last_modified)
+
+
+def _not_modified(request: Request, snapshot: MapSnapshot) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or snapshot.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since: Optional[datetime] = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return snapshot.last_modified <= since
+    return False
@@ -0,0 +1,109 @@
+"""
+Shared media fetch layer for AI scoring.
+
+Each URL is downloaded once: bytes live in a size-bounded LRU keyed by URL,
+concurrent requests for the same URL share one download, and identical content
+reached through different URLs shares one buffer (indexed by SHA-256). Single-
+report scoring (Nova Pro) and cluster analysis (Rekognition) read from here.
+"""
+import hashlib
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+import boto3
+import requests
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FORMAT_MAP = {
+    'jpg': 'jpeg', 'jpeg': 'jpeg',
+    'png': 'png', 'gif': 'gif', 'webp': 'webp',
+    'mp4': 'video', 'mov': 'video', 'webm': 'video'
+}
+
+s3_client = boto3.client(
+    's3',
+    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+    region_name=settings.AWS_REGION
+)
+
+_http = requests.Session()
+
+
+@dataclass(eq=False)
+class FetchedMedia:
+    data: bytes
+    sha256: str
+    media_type: str  # jpeg | png | gif | webp | video
+
+    def __len__(self):
+        return len(self.data)
+
+
+_by_url = TTLCache(maxsize=settings.MEDIA_CACHE_MAX_BYTES, ttl=settings.MEDIA_CACHE_TTL_SECONDS, sizeof=len)
+_by_hash: "weakref.WeakValueDictionary[str, FetchedMedia]" = weakref.WeakValueDictionary()
+
+
+def media_type_for(url: str) -> str:
+    ext = url.split('.')[-1].lower().split('?')[0]  # handle S3 query params
+    return FORMAT_MAP.get(ext, 'jpeg')
+
+
+def _s3_location(url: str):
+    # Extract bucket and key from URL
+    url_path = url.split('amazonaws.com/')[-1]
+    parts = url_path.split('/', 1)
+
+    if len(parts) == 2:
+        # Format: bucket.s3.amazonaws.com/key
+        return url.split('//')[1].split('.')[0], parts[1]
+    # Format: s3.amazonaws.com/bucket/key
+    return settings.S3_BUCKET, url_path
+
+
+def _download(url: str) -> bytes:
+    # Try to download from S3 using credentials if it's an S3 URL
+    if 's3.amazonaws.com' in url or 's3.' in url:
+        try:
+            bucket, key = _s3_location(url)
+            content = s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+            logger.info(f"Fetched media from S3: {bucket}/{key}")
+            return content
+        except Exception as s3_error:
+            logger.warning(f"S3 download failed, trying public URL: {s3_error}")
+
+    resp = _http.get(url, timeout=10)
+    resp.raise_for_status()
+    return resp.content
+
+
+def _load(url: str) -> FetchedMedia:
+    data = _download(url)
+    digest = hashlib.sha256(data).hexdigest()
+    existing = _by_hash.get(digest)
+    if existing is not None:
+        data = existing.data  # same content under another URL: share the buffer
+    media = FetchedMedia(data=data, sha256=digest, media_type=media_type_for(url))
+    _by_hash[digest] = media
+    return media
+
+
+def fetch_media(url: str) -> Optional[FetchedMedia]:
+    """Bytes for url, downloaded at most once while cached; None if the download fails"""
+    if not url:
+        return None
+    try:
+        return _by_url.get_or_set(url, lambda: _load(url))
+    except Exception as e:
+        logger.error(f"Media fetch failed for {url}: {e}")
+        return None
+
+
+def media_cache_stats():
+    return {**_by_url.stats(), "distinct_buffers": len(_by_hash)}
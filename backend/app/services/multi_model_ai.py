@@ -7,19 +7,50 @@ Uses different AI models for specialized tasks:
 - Tavily/Web Search: Real-time news verification, location context
 """
 
+import asyncio
+import functools
 import logging
+import threading
 import boto3
 import json
 import requests
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional
 from app.core.config import settings
+from app.services.media_fetch import fetch_media
+from app.services.verdict_cache import get_verdict, set_verdict, verdict_key
 
 logger = logging.getLogger(__name__)
 
+# Adaptive retries back off client-side when AWS starts throttling
+_aws_config = Config(
+    retries={"mode": "adaptive", "max_attempts": 6},
+    max_pool_connections=settings.AI_AWS_WORKERS,
+)
+
 # Initialize AWS clients
-rekognition = boto3.client('rekognition', region_name=settings.AWS_REGION)
-bedrock_runtime = boto3.client('bedrock-runtime', region_name=settings.AWS_REGION)
+rekognition = boto3.client('rekognition', region_name=settings.AWS_REGION, config=_aws_config)
+bedrock_runtime = boto3.client('bedrock-runtime', region_name=settings.AWS_REGION, config=_aws_config)
+
+# boto3/requests are blocking: run them on a bounded pool so the event loop stays free,
+# with per-service caps below the account's TPS limits
+_executor = ThreadPoolExecutor(max_workers=settings.AI_AWS_WORKERS, thread_name_prefix="multi-model")
+_rekognition_slots = threading.BoundedSemaphore(settings.REKOGNITION_MAX_CONCURRENCY)
+_bedrock_slots = threading.BoundedSemaphore(settings.BEDROCK_MAX_CONCURRENCY)
+
+
+def _limited(slots: Optional[threading.BoundedSemaphore], fn: Callable, *args, **kwargs):
+    if slots is None:
+        return fn(*args, **kwargs)
+    with slots:
+        return fn(*args, **kwargs)
+
+
+async def _run_blocking(fn: Callable, *args, slots: Optional[threading.BoundedSemaphore] = None, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(_limited, slots, fn, *args, **kwargs))
 
 
 class MultiModelAnalyzer:
@@ -49,11 +80,13 @@ class MultiModelAnalyzer:
         """
         try:
             # Run all analyses in parallel
-            image_score = await self._analyze_images(cluster_data)
-            location_score = await self._verify_location_context(cluster_data)
-            temporal_score = await self._check_temporal_consistency(cluster_data)
-            news_score = await self._correlate_with_news(cluster_data)
-            text_score = await self._analyze_text_coherence(cluster_data)
+            image_score, location_score, temporal_score, news_score, text_score = await asyncio.gather(
+                self._analyze_images(cluster_data),
+                self._verify_location_context(cluster_data),
+                self._check_temporal_consistency(cluster_data),
+                self._correlate_with_news(cluster_data),
+                self._analyze_text_coherence(cluster_data),
+            )
             
             # Weighted scoring system
             weights = {
@@ -124,7 +157,6 @@ class MultiModelAnalyzer:
             if not reports_with_images:
                 return 0.5  # Neutral score if no images
             
-            scores = []
             hazard_type = cluster_data["hazard_type"].lower()
             
             # Expected labels for each hazard type
@@ -139,58 +171,11 @@ class MultiModelAnalyzer:
             
             expected_labels = hazard_labels.get(hazard_type, ["damage", "disaster"])
             
-            for report in reports_with_images:
-                try:
-                    image_url = report.get("image_url", "")
-                    
-                    # If S3 URL, use it directly; otherwise skip
-                    if not image_url or not image_url.startswith("http"):
-                        scores.append(0.5)
-                        continue
-                    
-                    # Use Rekognition to detect labels in the image
-                    # Note: For S3 images, use S3Object parameter; for URLs, download first
-                    response = self.rekognition.detect_labels(
-                        Image={'S3Object': {'Bucket': settings.S3_BUCKET, 'Name': image_url.split('/')[-1]}} 
-                        if 's3.amazonaws.com' in image_url else
-                        {'Bytes': self._download_image(image_url)},
-                        MaxLabels=20,
-                        MinConfidence=60
-                    )
-                    
-                    detected_labels = [label['Name'].lower() for label in response['Labels']]
-                    
-                    # Check for scene consistency
-                    matches = sum(1 for label in expected_labels if any(label in dl for dl in detected_labels))
-                    consistency_score = min(matches / len(expected_labels), 1.0)
-                    
-                    # Use Rekognition moderation to detect inappropriate/fake content
-                    moderation = self.rekognition.detect_moderation_labels(
-                        Image={'S3Object': {'Bucket': settings.S3_BUCKET, 'Name': image_url.split('/')[-1]}}
-                        if 's3.amazonaws.com' in image_url else
-                        {'Bytes': self._download_image(image_url)},
-                        MinConfidence=60
-                    )
-                    
-                    # Lower score if moderation flags found
-                    moderation_penalty = len(moderation['ModerationLabels']) * 0.1
-                    
-                    # Image quality check
-                    quality_response = self.rekognition.detect_faces(
-                        Image={'S3Object': {'Bucket': settings.S3_BUCKET, 'Name': image_url.split('/')[-1]}}
-                        if 's3.amazonaws.com' in image_url else
-                        {'Bytes': self._download_image(image_url)}
-                    )
-                    
-                    # If faces detected with high quality, likely authentic photo
-                    quality_bonus = 0.1 if quality_response.get('FaceDetails') else 0
-                    
-                    image_score = max(0.0, min(1.0, consistency_score - moderation_penalty + quality_bonus))
-                    scores.append(image_score)
-                    
-                except Exception as img_error:
-                    logger.warning(f"Failed to analyze individual image: {img_error}")
-                    scores.append(0.5)  # Neutral if analysis fails
+            # Every image in the cluster is analysed concurrently
+            scores = await asyncio.gather(*(
+                self._score_image(report.get("image_url", ""), expected_labels)
+                for report in reports_with_images
+            ))
             
             # Bonus for multiple corroborating images
             if len(scores) >= 2:
@@ -203,15 +188,64 @@ class MultiModelAnalyzer:
             logger.error(f"Image analysis failed: {e}")
             return 0.5
     
-    def _download_image(self, url: str) -> bytes:
-        """Download image from URL for Rekognition analysis"""
+    async def _score_image(self, image_url: str, expected_labels: List[str]) -> float:
+        """Labels, moderation and face checks for one image, issued concurrently"""
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.content
-        except Exception as e:
-            logger.error(f"Failed to download image: {e}")
-            raise
+            # If S3 URL, use it directly; otherwise skip
+            if not image_url or not image_url.startswith("http"):
+                return 0.5
+            
+            # The bytes are usually cached already (single-report scoring fetched them);
+            # their hash keys the verdict cache, so reposted images skip Rekognition
+            media = await _run_blocking(fetch_media, image_url)
+            
+            # Note: For S3 images, use S3Object parameter; for URLs, hand the
+            # same downloaded buffer to all three calls
+            if 's3.amazonaws.com' in image_url:
+                image = {'S3Object': {'Bucket': settings.S3_BUCKET, 'Name': image_url.split('/')[-1]}}
+            elif media is not None:
+                image = {'Bytes': media.data}
+            else:
+                raise Exception(f"Failed to download image: {image_url}")
+            
+            key = verdict_key("rekognition_image", image=media.sha256 if media else image_url, texts=expected_labels)
+            cached = get_verdict(key)
+            if cached is not None:
+                return cached
+            
+            def detect(method, **kwargs):
+                return method(Image=image, **kwargs)
+            
+            response, moderation, quality_response = await asyncio.gather(
+                # Use Rekognition to detect labels in the image
+                _run_blocking(detect, self.rekognition.detect_labels, MaxLabels=20, MinConfidence=60,
+                              slots=_rekognition_slots),
+                # Use Rekognition moderation to detect inappropriate/fake content
+                _run_blocking(detect, self.rekognition.detect_moderation_labels, MinConfidence=60,
+                              slots=_rekognition_slots),
+                # Image quality check
+                _run_blocking(detect, self.rekognition.detect_faces, slots=_rekognition_slots),
+            )
+            
+            detected_labels = [label['Name'].lower() for label in response['Labels']]
+            
+            # Check for scene consistency
+            matches = sum(1 for label in expected_labels if any(label in dl for dl in detected_labels))
+            consistency_score = min(matches / len(expected_labels), 1.0)
+            
+            # Lower score if moderation flags found
+            moderation_penalty = len(moderation['ModerationLabels']) * 0.1
+            
+            # If faces detected with high quality, likely authentic photo
+            quality_bonus = 0.1 if quality_response.get('FaceDetails') else 0
+            
+            score = max(0.0, min(1.0, consistency_score - moderation_penalty + quality_bonus))
+            set_verdict(key, score)
+            return score
+            
+        except Exception as img_error:
+            logger.warning(f"Failed to analyze individual image: {img_error}")
+            return 0.5  # Neutral if analysis fails
     
     async def _verify_location_context(self, cluster_data: Dict) -> float:
         """
@@ -355,7 +389,8 @@ class MultiModelAnalyzer:
             if tavily_api_key:
                 try:
                     # Tavily Search API
-                    search_response = requests.post(
+                    search_response = await _run_blocking(
+                        requests.post,
                         "https://api.tavily.com/search",
                         json={
                             "api_key": tavily_api_key,
@@ -413,6 +448,12 @@ class MultiModelAnalyzer:
             if not descriptions or all(not d for d in descriptions):
                 return 0.4  # Low score for missing descriptions
             
+            # Copy-pasted forwards normalize to the same texts
+            key = verdict_key("claude_text_coherence", texts=descriptions, hazard_type=cluster_data["hazard_type"])
+            cached = get_verdict(key)
+            if cached is not None:
+                return cached
+            
             # Use Claude for text analysis
             prompt = f"""Analyze these disaster report descriptions for authenticity:
 
@@ -426,7 +467,9 @@ Evaluate:
 
 Respond with only a score from 0.0 to 1.0 indicating authenticity."""
 
-            response = self.bedrock.invoke_model(
+            response = await _run_blocking(
+                self.bedrock.invoke_model,
+                slots=_bedrock_slots,
                 modelId="anthropic.claude-3-haiku-20240307-v1:0",
                 body=json.dumps({
                     "anthropic_version": "bedrock-2023-05-31",
@@ -443,8 +486,9 @@ Respond with only a score from 0.0 to 1.0 indicating authenticity."""
             
             # Extract score
             try:
-                score = float(score_text)
-                return max(0.0, min(1.0, score))
+                score = max(0.0, min(1.0, float(score_text)))
+                set_verdict(key, score)
+                return score
             except:
                 return 0.65  # Default if parsing fails
                 
@@ -475,7 +519,9 @@ Overall Authenticity: {final_score:.0%}
 
 Provide a 2-3 sentence summary for emergency responders. Be concise and actionable."""
 
-            response = self.bedrock.invoke_model(
+            response = await _run_blocking(
+                self.bedrock.invoke_model,
+                slots=_bedrock_slots,
                 modelId="anthropic.claude-3-sonnet-20240229-v1:0",
                 body=json.dumps({
                     "anthropic_version": "bedrock-2023-05-31",
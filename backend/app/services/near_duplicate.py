@@ -0,0 +1,162 @@
+"""
+Near-duplicate detection for incoming reports.
+
+Descriptions get a 64-bit SimHash over word shingles and the first image a
+64-bit difference hash (dHash), so forwarded text and re-shared photos land
+within a few bits of each other. Each hash is split into LSH bands stored in a
+GIN-indexed array: two hashes within the distance threshold are guaranteed to
+share a band, so the lookup is one indexed query for candidates followed by
+exact Hamming checks. A duplicate links to the earliest matching report
+(its canonical) and inherits that report's analysis instead of being scored.
+"""
+import hashlib
+import io
+import logging
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlalchemy import or_
+
+from app.core.config import settings
+from app.models.report import Report
+from app.models.report_fingerprint import ReportFingerprint
+from app.services.spatial_clustering import haversine
+from app.services.verdict_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+TEXT_BANDS = 4   # 16-bit bands: distance <= 3 always shares one
+IMAGE_BANDS = 8  # 8-bit bands: distance <= 7 always shares one
+SHINGLE_SIZE = 2
+
+_MASK64 = (1 << HASH_BITS) - 1
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def simhash(text: Optional[str]) -> Optional[int]:
+    """SimHash of word shingles; None for descriptions too short to tell copies apart"""
+    words = normalize_text(text).split()
+    if len(words) < settings.DEDUP_MIN_TEXT_TOKENS:
+        return None
+    shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    weights = [0] * HASH_BITS
+    for shingle in shingles:
+        h = _hash64(shingle)
+        for bit in range(HASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    return sum(1 << bit for bit in range(HASH_BITS) if weights[bit] > 0)
+
+
+def dhash(data: bytes) -> Optional[int]:
+    """Difference hash of an image (9x8 grayscale, adjacent-pixel gradients); None if it can't be decoded"""
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as image:
+            pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    except Exception as e:
+        logger.warning(f"Perceptual hash failed: {e}")
+        return None
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+def bands(value: int, count: int) -> List[int]:
+    width = HASH_BITS // count
+    mask = (1 << width) - 1
+    return [(i << width) | ((value >> (i * width)) & mask) for i in range(count)]
+
+
+def _to_signed(value: Optional[int]) -> Optional[int]:
+    # BIGINT is signed; keep the same 64 bits
+    if value is None:
+        return None
+    return value - (1 << HASH_BITS) if value >= (1 << (HASH_BITS - 1)) else value
+
+
+def _to_unsigned(value: Optional[int]) -> Optional[int]:
+    return None if value is None else value & _MASK64
+
+
+def _is_duplicate(candidate: ReportFingerprint, text_hash: Optional[int], image_hash: Optional[int]) -> bool:
+    other_text = _to_unsigned(candidate.text_simhash)
+    other_image = _to_unsigned(candidate.image_phash)
+    if image_hash is not None and other_image is not None:
+        # Both have photos: the photo decides (same forward, different picture is a new report)
+        return hamming(image_hash, other_image) <= settings.DEDUP_IMAGE_MAX_DISTANCE
+    if text_hash is not None and other_text is not None:
+        return hamming(text_hash, other_text) <= settings.DEDUP_TEXT_MAX_DISTANCE
+    return False
+
+
+def find_canonical(db, report: Report, text_hash: Optional[int], image_hash: Optional[int]) -> Optional[int]:
+    """Earliest earlier report that report duplicates (following its own canonical link), or None"""
+    band_filters = []
+    if text_hash is not None:
+        band_filters.append(ReportFingerprint.text_bands.overlap(bands(text_hash, TEXT_BANDS)))
+    if image_hash is not None:
+        band_filters.append(ReportFingerprint.image_bands.overlap(bands(image_hash, IMAGE_BANDS)))
+    if not band_filters or report.latitude is None:
+        return None
+
+    radius_deg = settings.DEDUP_RADIUS_KM / 111.0 * 1.5  # generous box; haversine below is exact
+    candidates = db.query(ReportFingerprint).filter(
+        ReportFingerprint.hazard_type == report.hazard_type,
+        ReportFingerprint.created_at >= report.created_at - timedelta(hours=settings.DEDUP_WINDOW_HOURS),
+        ReportFingerprint.created_at <= report.created_at,
+        ReportFingerprint.report_id < report.id,
+        ReportFingerprint.latitude.between(report.latitude - radius_deg, report.latitude + radius_deg),
+        or_(*band_filters),
+    ).order_by(ReportFingerprint.created_at, ReportFingerprint.report_id).limit(50).all()
+
+    for candidate in candidates:
+        if candidate.latitude is None or candidate.longitude is None:
+            continue
+        if haversine(report.latitude, report.longitude, candidate.latitude, candidate.longitude) > settings.DEDUP_RADIUS_KM:
+            continue
+        if _is_duplicate(candidate, text_hash, image_hash):
+            linked = db.query(Report.duplicate_of_id).filter(Report.id == candidate.report_id).scalar()
+            return linked or candidate.report_id
+    return None
+
+
+def fingerprint_report(db, report: Report, image_data: Optional[bytes] = None) -> Optional[int]:
+    """
+    Store report's fingerprint (once) and link it to its canonical report.
+    Returns the canonical report id if report is a near-duplicate.
+    """
+    existing = db.get(ReportFingerprint, report.id)
+    if existing is not None:
+        return report.duplicate_of_id
+
+    text_hash = simhash(report.description)
+    image_hash = dhash(image_data) if image_data else None
+    db.add(ReportFingerprint(
+        report_id=report.id,
+        hazard_type=report.hazard_type,
+        latitude=report.latitude,
+        longitude=report.longitude,
+        created_at=report.created_at,
+        text_simhash=_to_signed(text_hash),
+        image_phash=_to_signed(image_hash),
+        text_bands=bands(text_hash, TEXT_BANDS) if text_hash is not None else None,
+        image_bands=bands(image_hash, IMAGE_BANDS) if image_hash is not None else None,
+    ))
+
+    canonical_id = find_canonical(db, report, text_hash, image_hash)
+    if canonical_id:
+        report.duplicate_of_id = canonical_id
+        logger.info(f"Report {report.id} is a near-duplicate of report {canonical_id}")
+    db.commit()
+    return canonical_id
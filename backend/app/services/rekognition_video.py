@@ -1,7 +1,10 @@
+import asyncio
 import boto3
+import json
 import time
 import logging
-from typing import Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -31,7 +34,7 @@ IRRELEVANT_LABELS = [
 ]
 
 
-def analyze_video_for_disaster(s3_bucket: str, s3_key: str, hazard_type: str, lat: float, lon: float, state: str = None, max_wait_seconds: int = 300) -> Dict:
+def analyze_video_for_disaster(s3_bucket: str, s3_key: str, hazard_type: str, lat: float, lon: float, state: str = None, max_wait_seconds: int = 300, context: Optional[Tuple[Dict, Dict, Dict]] = None) -> Dict:
     """
     Analyze video using AWS Rekognition with contextual verification.
     Combines visual analysis with weather, seasonal, and news data.
@@ -44,23 +47,20 @@ def analyze_video_for_disaster(s3_bucket: str, s3_key: str, hazard_type: str, la
         lon: Longitude of report location
         state: State/region for news checking
         max_wait_seconds: Maximum time to wait for analysis (default 5 minutes)
+        context: (weather, season, news) results the caller already gathered
     
     Returns:
         Dictionary with authenticity analysis results including contextual verification
     """
-    from app.services.context_verifier import (
-        check_weather_context,
-        check_seasonal_context,
-        check_news_context,
-        calculate_combined_score
-    )
-    
-    # Run contextual checks first (fast, don't wait for video processing)
-    logger.info(f"Running contextual verification for video: {hazard_type} at ({lat}, {lon})")
-    
-    weather_ctx = check_weather_context(lat, lon, hazard_type)
-    season_ctx = check_seasonal_context(hazard_type)
-    news_ctx = check_news_context(lat, lon, hazard_type, state)
+    if context:
+        weather_ctx, season_ctx, news_ctx = context
+    else:
+        from app.services.verification_pipeline import gather_context
+        
+        # Run contextual checks first, concurrently (fast, don't wait for video processing)
+        logger.info(f"Running contextual verification for video: {hazard_type} at ({lat}, {lon})")
+        ctx = asyncio.run(gather_context(hazard_type, lat, lon, state))
+        weather_ctx, season_ctx, news_ctx = ctx.weather, ctx.season, ctx.news
     
     logger.info(f"Context checks: Weather={weather_ctx['weather_score']}, Season={season_ctx['season_score']}, News={news_ctx['news_score']}")
     
@@ -326,3 +326,204 @@ def extract_s3_info_from_url(url: str) -> Optional[tuple]:
     except Exception as e:
         logger.error(f"Error parsing S3 URL {url}: {e}")
         return None
+
+
+# ── Asynchronous video jobs ──────────────────────────────────────────────────
+# Nothing waits on Rekognition: submit_video_analysis starts the job and records
+# it; a scheduler tick (poll_video_jobs) or the SNS completion notification
+# (handle_rekognition_notification) picks the result up and writes it back.
+
+def _start_label_detection(s3_bucket: str, s3_key: str) -> str:
+    params = {
+        "Video": {"S3Object": {"Bucket": s3_bucket, "Name": s3_key}},
+        "MinConfidence": 60.0,  # Only return labels with 60%+ confidence
+        "Features": ["GENERAL_LABELS"],
+    }
+    if settings.REKOGNITION_SNS_TOPIC_ARN and settings.REKOGNITION_SNS_ROLE_ARN:
+        params["NotificationChannel"] = {
+            "SNSTopicArn": settings.REKOGNITION_SNS_TOPIC_ARN,
+            "RoleArn": settings.REKOGNITION_SNS_ROLE_ARN,
+        }
+    return rekognition.start_label_detection(**params)["JobId"]
+
+
+def submit_video_analysis(report_id: int, s3_bucket: str, s3_key: str, hazard_type: str,
+                          lat: float, lon: float, context: Tuple[Dict, Dict, Dict],
+                          breakdown: Optional[Dict] = None) -> str:
+    """Start label detection for a report's video and record the job. Returns the Rekognition job id."""
+    from app.db.session import BackgroundSessionLocal
+    from app.models.video_job import VideoAnalysisJob
+
+    weather_ctx, season_ctx, news_ctx = context
+    job_id = _start_label_detection(s3_bucket, s3_key)
+    logger.info(f"Rekognition job {job_id} started for report {report_id}")
+
+    db = BackgroundSessionLocal()
+    try:
+        db.add(VideoAnalysisJob(
+            report_id=report_id,
+            rekognition_job_id=job_id,
+            s3_bucket=s3_bucket,
+            s3_key=s3_key,
+            hazard_type=hazard_type,
+            latitude=lat,
+            longitude=lon,
+            context_json=json.dumps({
+                "weather": weather_ctx,
+                "season": season_ctx,
+                "news": news_ctx,
+                "breakdown": breakdown or {},
+            }),
+        ))
+        db.commit()
+    finally:
+        db.close()
+    return job_id
+
+
+def _all_labels(job_id: str, first_page: Dict) -> Dict:
+    labels = list(first_page.get('Labels', []))
+    page = first_page
+    while page.get('NextToken'):
+        page = rekognition.get_label_detection(JobId=job_id, NextToken=page['NextToken'], MaxResults=1000)
+        labels.extend(page.get('Labels', []))
+    return {"Labels": labels}
+
+
+def _finish_job(db, job, status: str, analysis: Dict, context: Dict, error: str = None):
+    from app.models.report import Report
+
+    now = datetime.now(timezone.utc)
+    job.status = status
+    job.completed_at = now
+    job.error = error
+
+    report = db.get(Report, job.report_id)
+    if report:
+        score = analysis.get("authenticity_score", 0.5)
+        report.ai_authenticity_score = score
+        report.ai_analysis_summary = analysis.get("summary", "Video analysis complete")
+
+        breakdown = dict(context.get("breakdown") or {})
+        timings = dict(breakdown.get("stage_timings_ms") or {})
+        if job.created_at:
+            timings["video_job"] = round((now - job.created_at).total_seconds() * 1000, 1)
+        breakdown["stage_timings_ms"] = timings
+        breakdown["video_job_status"] = status
+        report.ai_analysis_breakdown = json.dumps(breakdown)
+
+        if score <= 0.25:
+            report.status = "false"
+            report.is_verified = False
+
+    db.commit()
+    logger.info(f"Rekognition job {job.rekognition_job_id} for report {job.report_id}: {status}")
+
+
+def resume_video_job(db, job, first_page: Optional[Dict] = None) -> bool:
+    """Check a job once (no waiting) and write the result back if it is done. Returns True when finished."""
+    context = json.loads(job.context_json or "{}")
+    weather_ctx = context.get("weather") or {}
+    season_ctx = context.get("season") or {}
+    news_ctx = context.get("news") or {}
+
+    page = first_page or rekognition.get_label_detection(JobId=job.rekognition_job_id, MaxResults=1000)
+    status = page['JobStatus']
+    job.last_polled_at = datetime.now(timezone.utc)
+
+    if status == 'SUCCEEDED':
+        analysis = _process_rekognition_results_with_context(
+            _all_labels(job.rekognition_job_id, page), job.hazard_type, weather_ctx, season_ctx, news_ctx
+        )
+        _finish_job(db, job, "succeeded", analysis, context)
+        return True
+
+    if status == 'FAILED':
+        analysis = _default_video_response_with_context(
+            "Video analysis failed", weather_ctx, season_ctx, news_ctx
+        )
+        _finish_job(db, job, "failed", analysis, context, error=page.get('StatusMessage'))
+        return True
+
+    age = datetime.now(timezone.utc) - job.created_at if job.created_at else timedelta(0)
+    if age > timedelta(seconds=settings.VIDEO_JOB_TIMEOUT_SECONDS):
+        analysis = _default_video_response_with_context(
+            "Video analysis timed out - manual review required", weather_ctx, season_ctx, news_ctx
+        )
+        _finish_job(db, job, "timed_out", analysis, context)
+        return True
+
+    db.commit()
+    return False
+
+
+def _claim_open_job(db, **filters):
+    """Lock one in-progress job for this transaction, skipping jobs another poller holds"""
+    from app.models.video_job import VideoAnalysisJob
+
+    return (
+        db.query(VideoAnalysisJob)
+        .filter_by(status="in_progress", **filters)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+
+
+def poll_video_jobs():
+    """Scheduler tick: one status check per open job, each in its own short transaction"""
+    from app.db.session import BackgroundSessionLocal
+    from app.models.video_job import VideoAnalysisJob
+
+    db = BackgroundSessionLocal()
+    try:
+        job_ids = [
+            job_id for (job_id,) in db.query(VideoAnalysisJob.id)
+            .filter(VideoAnalysisJob.status == "in_progress")
+            .order_by(VideoAnalysisJob.created_at)
+            .limit(settings.VIDEO_JOB_POLL_BATCH)
+            .all()
+        ]
+        db.rollback()
+
+        finished = 0
+        for job_id in job_ids:
+            try:
+                job = _claim_open_job(db, id=job_id)
+                if job is None:
+                    db.rollback()
+                    continue
+                if resume_video_job(db, job):
+                    finished += 1
+            except Exception as e:
+                logger.error(f"Polling video job {job_id} failed: {e}")
+                db.rollback()
+        if job_ids:
+            logger.info(f"Video job poll: {len(job_ids)} open, {finished} finished")
+    finally:
+        db.close()
+
+
+def handle_rekognition_notification(message: Dict) -> bool:
+    """
+    Completion message published by Rekognition to SNS
+    ({"JobId": ..., "Status": "SUCCEEDED" | "FAILED", ...}).
+    Returns True if a tracked job was finished.
+    """
+    from app.db.session import BackgroundSessionLocal
+
+    job_id = message.get("JobId")
+    if not job_id:
+        return False
+
+    db = BackgroundSessionLocal()
+    try:
+        job = _claim_open_job(db, rekognition_job_id=job_id)
+        if job is None:
+            return False  # unknown, already finished, or being handled by the poller
+        return resume_video_job(db, job)
+    except Exception as e:
+        logger.error(f"Handling Rekognition notification for {job_id} failed: {e}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
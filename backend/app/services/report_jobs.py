@@ -0,0 +1,132 @@
+"""
+Job handlers for report post-processing, run by app.worker.
+Handlers raise to have the queue retry them with backoff.
+"""
+import json
+import logging
+
+from app.models.report import Report
+from app.services.job_queue import enqueue, priority_for_severity, register
+
+logger = logging.getLogger(__name__)
+
+SCORE_REPORT = "score_report"
+GEOCODE_REPORT = "geocode_report"
+
+
+def enqueue_report_jobs(db, report, state=None, needs_geocode=False):
+    """Queue AI scoring (and online geocoding if the offline lookup missed) in one commit"""
+    priority = priority_for_severity(report.severity)
+    if needs_geocode:
+        enqueue(db, GEOCODE_REPORT, {
+            "report_id": report.id,
+            "latitude": report.latitude,
+            "longitude": report.longitude,
+        }, priority=priority, commit=False)
+    enqueue(db, SCORE_REPORT, {
+        "report_id": report.id,
+        "description": report.description or "",
+        "hazard_type": report.hazard_type,
+        "image_url": report.media[0].file_path if report.media else None,
+        "latitude": report.latitude,
+        "longitude": report.longitude,
+        "state": state,
+    }, priority=priority, commit=False)
+    db.commit()
+
+
+@register(SCORE_REPORT)
+def score_report(db, payload, job):
+    from app.services.bedrock_ai import analyze_single_report
+
+    report_id = payload["report_id"]
+    report = db.query(Report).filter(Report.id == report_id).first()
+    if not report:
+        return  # deleted while queued
+
+    # Near-duplicates inherit their canonical report's analysis instead of being scored
+    canonical_id = _find_duplicate(db, report, payload["image_url"])
+    if canonical_id and _inherit_analysis(db, report, canonical_id, job):
+        return
+
+    # Run the deep forensic analysis with contextual verification
+    result = analyze_single_report(
+        payload["description"], payload["hazard_type"], payload["image_url"],
+        payload["latitude"], payload["longitude"], payload.get("state"), report_id=report_id
+    )
+    # Retry whole-pipeline failures; the last attempt keeps the safe fallback score
+    if result.get("analysis_failed") and job["attempts"] < job["max_attempts"]:
+        raise RuntimeError(result.get("preliminary_summary", "Analysis failed"))
+
+    report.ai_authenticity_score = result.get("authenticity_score", 0.5)
+    report.ai_analysis_summary = result.get("preliminary_summary", "Analysis failed.")
+    if result.get("analysis_breakdown"):
+        report.ai_analysis_breakdown = json.dumps(result["analysis_breakdown"])
+
+    if result.get("recommended_status") == "false":
+        # Hides the report from the public map. bump_map_version() would not
+        # help here: the version is per API process and this runs in the worker,
+        # so the map catches up when its snapshots expire (MAP_CACHE_TTL_SECONDS).
+        report.status = "false"
+        report.is_verified = False
+
+    db.commit()
+
+
+def _find_duplicate(db, report, image_url):
+    """Fingerprint the report and return its canonical report id, if any"""
+    from app.services.media_fetch import fetch_media, media_type_for
+    from app.services.near_duplicate import fingerprint_report
+
+    try:
+        image_data = None
+        if image_url and media_type_for(image_url) != "video":
+            media = fetch_media(image_url)  # shared cache: scoring reuses this download
+            image_data = media.data if media else None
+        return fingerprint_report(db, report, image_data)
+    except Exception as e:
+        # Dedup is an optimisation; never let it block scoring
+        logger.error(f"Near-duplicate check failed for report {report.id}: {e}")
+        db.rollback()
+        return None
+
+
+def _inherit_analysis(db, report, canonical_id, job):
+    """Copy the canonical report's verdict; False if this report has to be scored itself"""
+    canonical = db.query(Report).filter(Report.id == canonical_id).first()
+    if canonical is None:
+        return False
+    if canonical.ai_authenticity_score is None:
+        if job["attempts"] < job["max_attempts"]:
+            raise RuntimeError(f"Waiting for canonical report {canonical_id} to be scored")
+        return False  # canonical never got a score; fall back to scoring this one
+
+    breakdown = {}
+    if canonical.ai_analysis_breakdown:
+        try:
+            breakdown = json.loads(canonical.ai_analysis_breakdown)
+        except ValueError:
+            pass
+    report.ai_authenticity_score = canonical.ai_authenticity_score
+    report.ai_analysis_summary = f"Near-duplicate of report #{canonical_id}. {canonical.ai_analysis_summary or ''}".strip()
+    report.ai_analysis_breakdown = json.dumps({**breakdown, "duplicate_of": canonical_id})
+    if canonical.status == "false":
+        # Map staleness bounded by MAP_CACHE_TTL_SECONDS, as in score_report
+        report.status = "false"
+        report.is_verified = False
+    db.commit()
+    return True
+
+
+@register(GEOCODE_REPORT)
+def geocode_report(db, payload, job):
+    from app.services.geocode import get_district_from_coords
+
+    report = db.query(Report).filter(Report.id == payload["report_id"]).first()
+    if not report or report.district:
+        return
+
+    district = get_district_from_coords(payload["latitude"], payload["longitude"], db=db)
+    if district:
+        report.district = district
+        db.commit()
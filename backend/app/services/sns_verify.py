@@ -0,0 +1,67 @@
+"""
+Amazon SNS HTTP(S) message verification.
+Checks the signing certificate comes from SNS and the signature covers the
+canonical message fields, as described in the SNS developer guide.
+"""
+import base64
+import logging
+import re
+from functools import lru_cache
+from typing import Dict
+from urllib.parse import urlparse
+
+import httpx
+from cryptography import x509
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+
+logger = logging.getLogger(__name__)
+
+_CERT_HOST = re.compile(r"^sns\.[a-z0-9-]+\.amazonaws\.com(\.cn)?$")
+
+_SIGNED_FIELDS = {
+    "Notification": ["Message", "MessageId", "Subject", "Timestamp", "TopicArn", "Type"],
+    "SubscriptionConfirmation": ["Message", "MessageId", "SubscribeURL", "Timestamp", "Token", "TopicArn", "Type"],
+    "UnsubscribeConfirmation": ["Message", "MessageId", "SubscribeURL", "Timestamp", "Token", "TopicArn", "Type"],
+}
+
+
+@lru_cache(maxsize=16)
+def _signing_certificate(url: str) -> x509.Certificate:
+    response = httpx.get(url, timeout=5)
+    response.raise_for_status()
+    return x509.load_pem_x509_certificate(response.content)
+
+
+def _string_to_sign(envelope: Dict) -> bytes:
+    parts = []
+    for key in _SIGNED_FIELDS[envelope["Type"]]:
+        if key in envelope and envelope[key] is not None:
+            parts.append(f"{key}\n{envelope[key]}\n")
+    return "".join(parts).encode("utf-8")
+
+
+def verify_sns_message(envelope: Dict) -> bool:
+    try:
+        if envelope.get("Type") not in _SIGNED_FIELDS:
+            return False
+        cert_url = envelope.get("SigningCertURL", "")
+        parsed = urlparse(cert_url)
+        if parsed.scheme != "https" or not _CERT_HOST.match(parsed.hostname or ""):
+            return False
+
+        digest = hashes.SHA256() if envelope.get("SignatureVersion") == "2" else hashes.SHA1()
+        _signing_certificate(cert_url).public_key().verify(
+            base64.b64decode(envelope["Signature"]),
+            _string_to_sign(envelope),
+            padding.PKCS1v15(),
+            digest,
+        )
+        return True
+    except (InvalidSignature, KeyError, ValueError) as e:
+        logger.warning(f"SNS signature verification failed: {e}")
+        return False
+    except httpx.HTTPError as e:
+        logger.error(f"Could not fetch SNS signing certificate: {e}")
+        return False
@@ -0,0 +1,161 @@
+"""
+Spatial clustering of hazard reports.
+Hotspots are computed inside PostGIS with ST_ClusterDBSCAN so the database
+does the pairwise distance work over its own geometry decoding.
+In-process grouping (the scheduled cluster job) uses a per-hazard grid index.
+"""
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# WGS 84 / India NSF LCC — metric projection with low distortion across India,
+# so DBSCAN's eps can be expressed directly in metres.
+INDIA_METRIC_SRID = 7755
+
+# Reports within eps of each other are chained into one cluster (minpoints=1,
+# so every report belongs to a hotspot). Clustering is partitioned by hazard
+# type, and the cluster keeps the severity of its earliest report unless it
+# has 3+ reports, in which case it is escalated to critical.
+HOTSPOT_SQL = text(f"""
+    WITH active AS (
+        SELECT
+            id,
+            hazard_type,
+            severity,
+            created_at,
+            ST_Y(location) AS lat,
+            ST_X(location) AS lon,
+            ST_ClusterDBSCAN(
+                ST_Transform(location, {INDIA_METRIC_SRID}), :eps_m, 1
+            ) OVER (PARTITION BY hazard_type) AS cluster_id
+        FROM reports
+        WHERE status != 'false'
+          AND location IS NOT NULL
+          AND (CAST(:district AS TEXT) IS NULL OR district ILIKE '%' || CAST(:district AS TEXT) || '%')
+    )
+    SELECT
+        hazard_type,
+        COUNT(*)                                        AS report_count,
+        AVG(lat)                                        AS center_lat,
+        AVG(lon)                                        AS center_lon,
+        (ARRAY_AGG(severity ORDER BY created_at, id))[1] AS first_severity,
+        ARRAY_AGG(id ORDER BY created_at, id)           AS report_ids
+    FROM active
+    GROUP BY hazard_type, cluster_id
+    ORDER BY report_count DESC
+""")
+
+
+def find_hotspots(db: Session, radius_km: float = 80.0, district: Optional[str] = None) -> Tuple[int, List[Dict]]:
+    """
+    Cluster active (non-false) reports into hotspots inside PostGIS.
+
+    Returns:
+        (total_active_reports, hotspots) — hotspots sorted by report_count descending,
+        each with center_lat, center_lon, hazard_type, severity, report_count, reports
+    """
+    rows = db.execute(HOTSPOT_SQL, {"eps_m": radius_km * 1000.0, "district": district}).all()
+
+    hotspots = [
+        {
+            "center_lat": row.center_lat,
+            "center_lon": row.center_lon,
+            "hazard_type": row.hazard_type,
+            "severity": "critical" if row.report_count >= 3 else row.first_severity,
+            "report_count": row.report_count,
+            "reports": list(row.report_ids),
+        }
+        for row in rows
+    ]
+    total = sum(h["report_count"] for h in hotspots)
+    return total, hotspots
+
+
+EARTH_RADIUS_KM = 6371
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    R = EARTH_RADIUS_KM
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
+    # Clamp 'a' to prevent floating-point errors causing domain error in asin
+    return R * 2 * math.asin(math.sqrt(min(1.0, a)))
+
+
+def _grid_cell_size(radius_km: float, max_abs_lat: float) -> Tuple[float, float]:
+    """
+    Cell size in degrees such that any two points within radius_km are at most
+    one cell apart on each axis.
+
+    Latitude: great-circle distance is at least R·|Δφ|.
+    Longitude: hav(d/R) >= cos φ1 · cos φ2 · hav(Δλ) >= cos²(φmax) · hav(Δλ),
+    so |Δλ| <= 2·asin(sin(d/2R) / cos φmax).
+    """
+    slack = 1 + 1e-9  # absorb float rounding at cell boundaries
+    angular = radius_km / EARTH_RADIUS_KM
+    lat_size = math.degrees(angular) * slack
+
+    cos_max = math.cos(math.radians(min(max_abs_lat, 90.0)))
+    ratio = math.sin(angular / 2) / cos_max if cos_max > 0 else float("inf")
+    if ratio >= 1:
+        return lat_size, 360.0  # Near the poles: a single longitude column
+    lon_size = math.degrees(2 * math.asin(ratio)) * slack
+    return lat_size, lon_size
+
+
+def group_by_radius(points: Sequence[Tuple[str, float, float]], radius_km: float) -> List[List[int]]:
+    """
+    Seed-based grouping of (hazard_type, lat, lon) points.
+
+    Walks points in order; each unassigned point seeds a group that takes every
+    later-unassigned point of the same hazard type within radius_km of the seed.
+    This is the same result as the pairwise nested loop, but candidates come
+    from the 3x3 neighbouring cells of a per-hazard grid, so the work is
+    proportional to local density instead of O(n²). Longitudes are not wrapped
+    at the antimeridian.
+
+    Returns groups as lists of indices into `points`, in seed order.
+    """
+    if not points:
+        return []
+
+    max_abs_lat = max(abs(lat) for _, lat, _ in points)
+    lat_size, lon_size = _grid_cell_size(radius_km, max_abs_lat)
+
+    def cell_of(lat, lon):
+        return math.floor(lat / lat_size), math.floor(lon / lon_size)
+
+    grid: Dict[str, Dict[Tuple[int, int], List[int]]] = defaultdict(lambda: defaultdict(list))
+    for idx, (hazard_type, lat, lon) in enumerate(points):
+        grid[hazard_type][cell_of(lat, lon)].append(idx)
+
+    groups = []
+    assigned = set()
+    for i, (hazard_type, lat1, lon1) in enumerate(points):
+        if i in assigned:
+            continue
+        assigned.add(i)
+
+        cells = grid[hazard_type]
+        row, col = cell_of(lat1, lon1)
+        members = []
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                for j in cells.get((row + d_row, col + d_col), ()):
+                    if j in assigned:
+                        continue
+                    _, lat2, lon2 = points[j]
+                    if haversine(lat1, lon1, lat2, lon2) <= radius_km:
+                        members.append(j)
+
+        members.sort()
+        assigned.update(members)
+        groups.append([i] + members)
+
+    return groups
@@ -0,0 +1,103 @@
+"""
+Cache of model verdicts keyed by content, not by report.
+
+Reposted images and copy-pasted forwards produce the same Nova Pro,
+Rekognition and Claude inputs; their verdicts are reused instead of paying for
+another model call. Keys hash the image bytes and/or normalized text together
+with the hazard type and a coarse region (the only other prompt inputs), so a
+cached verdict is one the model would have been asked to produce anyway.
+Only successful model responses are cached; fallbacks never are.
+"""
+import hashlib
+import json
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.geohash import encode as geohash_encode
+
+_MISSING = object()
+
+_verdicts = TTLCache(maxsize=settings.VERDICT_CACHE_MAXSIZE, ttl=settings.VERDICT_CACHE_TTL_SECONDS)
+_hits: Counter = Counter()
+_misses: Counter = Counter()
+
+_URL = re.compile(r"https?://\S+")
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Case, accents/width variants, punctuation, links and whitespace don't change a verdict"""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = _URL.sub(" ", text)
+    text = _NON_WORD.sub(" ", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+def region_of(lat: Optional[float], lon: Optional[float]) -> str:
+    if lat is None or lon is None:
+        return ""
+    return geohash_encode(lat, lon, settings.VERDICT_CACHE_REGION_PRECISION)
+
+
+def verdict_key(
+    model: str,
+    *,
+    image: Union[bytes, str, None] = None,
+    texts: Iterable[str] = (),
+    hazard_type: Optional[str] = None,
+    region: str = "",
+) -> tuple:
+    digest = hashlib.sha256()
+    if image is not None:
+        digest.update(image if isinstance(image, bytes) else image.encode())
+    digest.update(b"\0")
+    digest.update(json.dumps(
+        [sorted(normalize_text(t) for t in texts), (hazard_type or "").lower(), region],
+        ensure_ascii=False,
+    ).encode())
+    return model, digest.hexdigest()
+
+
+def get_verdict(key: tuple) -> Any:
+    """Cached verdict or None; counts a hit or miss for the model in key[0]"""
+    value = _verdicts.get(key, _MISSING)
+    if value is _MISSING:
+        _misses[key[0]] += 1
+        return None
+    _hits[key[0]] += 1
+    return value
+
+
+def set_verdict(key: tuple, value: Any) -> None:
+    _verdicts.set(key, value)
+
+
+def get_or_compute(key: tuple, compute: Callable[[], Any]) -> Any:
+    """
+    Blocking callers: concurrent misses on one key share a single model call.
+    Exceptions propagate and nothing is cached.
+    """
+    computed = []
+
+    def load():
+        computed.append(True)
+        return compute()
+
+    value = _verdicts.get_or_set(key, load)
+    (_misses if computed else _hits)[key[0]] += 1
+    return value
+
+
+def verdict_cache_stats() -> Dict:
+    return {
+        **_verdicts.stats(),
+        "by_model": {
+            model: {"hits": _hits[model], "misses": _misses[model]}
+            for model in sorted(set(_hits) | set(_misses))
+        },
+    }
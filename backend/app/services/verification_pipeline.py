@@ -0,0 +1,153 @@
+"""
+Async context-verification pipeline for single-report and video scoring.
+
+Weather, seasonal and news checks run concurrently with the media download.
+Each stage has its own deadline and all of them share one total budget; a
+source that is slow or down yields a neutral partial result instead of
+holding up the rest. Per-stage timings end up in ai_analysis_breakdown.
+"""
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {"mp4", "mov", "webm"}
+
+# Stage threads live outside the event loop's default executor: asyncio.run()
+# joins that executor on exit, which would make a timed-out stage block the caller.
+_executor = ThreadPoolExecutor(max_workers=settings.AI_PIPELINE_WORKERS, thread_name_prefix="verify")
+
+# Neutral results used when a stage misses its deadline
+WEATHER_TIMEOUT_RESULT = {
+    "weather_match": True,
+    "current_weather": "Unknown",
+    "location_name": "Unknown",
+    "weather_score": 0.5,
+    "note": "Weather check timed out"
+}
+NEWS_TIMEOUT_RESULT = {
+    "news_found": True,
+    "news_score": 0.5,
+    "note": "News check timed out",
+    "sources": []
+}
+
+
+@dataclass
+class VerificationContext:
+    weather: Dict
+    season: Dict
+    news: Dict
+    media: Tuple[Optional[str], Optional[str]] = (None, None)  # (base64 data, media type)
+    deadline: float = 0.0  # monotonic time at which the total budget runs out
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def context_score(self) -> float:
+        return (
+            self.weather["weather_score"] * 0.4 +
+            self.season["season_score"] * 0.3 +
+            self.news["news_score"] * 0.3
+        )
+
+    def breakdown(self, visual_score: Optional[float] = None) -> Dict:
+        data = {
+            "weather_score": self.weather["weather_score"],
+            "season_score": self.season["season_score"],
+            "news_score": self.news["news_score"],
+            "stage_timings_ms": dict(self.timings_ms),
+            "timed_out": list(self.timed_out),
+            "partial": bool(self.timed_out),
+        }
+        if visual_score is not None:
+            data["visual_score"] = visual_score
+        return data
+
+
+def media_type_from_url(url: str) -> str:
+    ext = url.split('.')[-1].lower().split('?')[0]
+    return "video" if ext in VIDEO_EXTENSIONS else ext
+
+
+async def run_stage(
+    ctx: VerificationContext,
+    name: str,
+    fn: Callable,
+    *args,
+    stage_deadline: float,
+    fallback: Any = None,
+    **kwargs
+) -> Any:
+    """Run a blocking stage in a worker thread under min(stage deadline, remaining budget)"""
+    timeout = min(stage_deadline, ctx.remaining())
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+        return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+        ctx.timed_out.append(name)
+        logger.warning(f"Verification stage '{name}' exceeded {timeout:.1f}s; continuing with partial result")
+        return fallback
+    except Exception as e:
+        logger.error(f"Verification stage '{name}' failed: {e}")
+        return fallback
+    finally:
+        ctx.timings_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def gather_context(
+    hazard_type: str,
+    lat: float,
+    lon: float,
+    state: Optional[str] = None,
+    media_url: Optional[str] = None,
+) -> VerificationContext:
+    """Weather + season + news (+ media download for images), concurrently"""
+    from app.services.context_verifier import (
+        check_weather_context,
+        check_seasonal_context,
+        check_news_context,
+    )
+    from app.services.bedrock_ai import fetch_media_base64
+
+    started = time.perf_counter()
+    ctx = VerificationContext(
+        weather=WEATHER_TIMEOUT_RESULT,
+        season=check_seasonal_context(hazard_type),  # local computation, no I/O
+        news=NEWS_TIMEOUT_RESULT,
+        deadline=time.monotonic() + settings.AI_TOTAL_BUDGET_SECONDS,
+    )
+
+    stages = [
+        run_stage(ctx, "weather", check_weather_context, lat, lon, hazard_type,
+                  stage_deadline=settings.AI_WEATHER_DEADLINE_SECONDS, fallback=WEATHER_TIMEOUT_RESULT),
+        run_stage(ctx, "news", check_news_context, lat, lon, hazard_type, state,
+                  stage_deadline=settings.AI_NEWS_DEADLINE_SECONDS, fallback=NEWS_TIMEOUT_RESULT),
+    ]
+    # Videos are analysed in place on S3, so only images are downloaded
+    download_media = bool(media_url) and media_type_from_url(media_url) != "video"
+    if download_media:
+        stages.append(run_stage(ctx, "media_download", fetch_media_base64, media_url,
+                                stage_deadline=settings.AI_MEDIA_DEADLINE_SECONDS, fallback=(None, None)))
+
+    results = await asyncio.gather(*stages)
+    ctx.weather, ctx.news = results[0], results[1]
+    if download_media:
+        ctx.media = results[2]
+    elif media_url:
+        ctx.media = (None, "video")
+
+    ctx.timings_ms["context_total"] = round((time.perf_counter() - started) * 1000, 1)
+    return ctx
@@ -0,0 +1,101 @@
+"""
+Background job worker: claims jobs from the `jobs` table and runs them on a
+bounded thread pool. Run as many of these as scoring throughput needs.
+
+Usage:
+    python -m app.worker
+    python -m app.worker --concurrency 8
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import app.db.base  # registers all models
+import app.services.report_jobs  # registers job handlers
+
+from app.core.config import settings
+from app.db.session import BackgroundSessionLocal
+from app.services import job_queue
+from app.services.geocode import get_district_index
+
+logger = logging.getLogger("app.worker")
+
+
+class Worker:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+
+    def _run(self, job):
+        db = BackgroundSessionLocal()
+        try:
+            job_queue.execute(db, job)
+        except Exception as e:
+            logger.error(f"Worker could not record outcome of job {job['id']}: {e}")
+        finally:
+            db.close()
+            self.slots.release()
+
+    def _free_slots(self) -> int:
+        # Take every free slot now; each is released when its job finishes
+        free = 0
+        while free < self.concurrency and self.slots.acquire(blocking=False):
+            free += 1
+        return free
+
+    def run(self):
+        logger.info(f"Worker {self.worker_id} started with concurrency {self.concurrency}")
+        get_district_index()  # geocode jobs use it; load (or warn) before the first one
+        last_sweep = 0.0
+        while not self.stopping.is_set():
+            free = self._free_slots()
+            jobs = []
+            db = BackgroundSessionLocal()
+            try:
+                if time.monotonic() - last_sweep > settings.JOB_LOCK_TIMEOUT_SECONDS / 2:
+                    job_queue.requeue_stale(db)
+                    last_sweep = time.monotonic()
+                # Never claim more than we can start: the rest stays queued for other workers
+                jobs = job_queue.claim(db, self.worker_id, free)
+            except Exception as e:
+                logger.error(f"Claiming jobs failed: {e}")
+                db.rollback()
+            finally:
+                db.close()
+
+            for _ in range(free - len(jobs)):
+                self.slots.release()
+            for job in jobs:
+                self.pool.submit(self._run, job)
+
+            if len(jobs) < free:
+                # Queue drained (or all slots busy): wait before polling again
+                self.stopping.wait(settings.JOB_POLL_INTERVAL_SECONDS)
+            elif not jobs:
+                self.stopping.wait(0.1)
+
+        logger.info("Worker stopping; waiting for running jobs")
+        self.pool.shutdown(wait=True)
+
+    def stop(self, *_):
+        self.stopping.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = Worker(args.concurrency)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
@@ -0,0 +1,40 @@
+"""
+Add persisted report clusters to an existing database: creates the
+report_clusters table and the reports.cluster_id column + index.
+Pending reports inside the lookback window are attached on the next
+cluster job run; older ones are listed individually by /ai/clusters.
+Safe to re-run.
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.db.base  # registers all models
+
+from app.db.session import engine
+from app.models.report_cluster import ReportCluster
+from sqlalchemy import text
+
+STATEMENTS = [
+    "ALTER TABLE reports ADD COLUMN IF NOT EXISTS cluster_id INTEGER REFERENCES report_clusters(id) ON DELETE SET NULL;",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reports_cluster_id ON reports (cluster_id);",
+]
+
+def migrate():
+    print("Adding report clusters...")
+    try:
+        ReportCluster.__table__.create(bind=engine, checkfirst=True)
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in STATEMENTS:
+                conn.execute(text(statement))
+        print("✓ report_clusters table and reports.cluster_id ready!")
+
+    except Exception as e:
+        print(f"✗ Error adding report clusters: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,38 @@
+"""
+Add near-duplicate tracking to an existing database: creates the
+report_fingerprints table and the reports.duplicate_of_id column + index.
+Reports created before this are not fingerprinted. Safe to re-run.
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.db.base  # registers all models
+
+from app.db.session import engine
+from app.models.report_fingerprint import ReportFingerprint
+from sqlalchemy import text
+
+STATEMENTS = [
+    "ALTER TABLE reports ADD COLUMN IF NOT EXISTS duplicate_of_id INTEGER REFERENCES reports(id) ON DELETE SET NULL;",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reports_duplicate_of_id ON reports (duplicate_of_id);",
+]
+
+def migrate():
+    print("Adding near-duplicate tracking...")
+    try:
+        ReportFingerprint.__table__.create(bind=engine, checkfirst=True)
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in STATEMENTS:
+                conn.execute(text(statement))
+        print("✓ report_fingerprints table and reports.duplicate_of_id ready!")
+
+    except Exception as e:
+        print(f"✗ Error adding near-duplicate tracking: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,39 @@
+"""
+Add full-text search to an existing database: the generated
+social_posts.search_vector column (filled for existing rows by the ALTER) and
+its GIN index. Safe to re-run.
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.db.base  # registers all models
+
+from app.db.session import engine
+from sqlalchemy import text
+
+STATEMENTS = [
+    """ALTER TABLE social_posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+       GENERATED ALWAYS AS (to_tsvector('english', coalesce(source, '') || ' ' || coalesce(content, ''))) STORED;""",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_social_posts_search_vector ON social_posts USING gin (search_vector);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_social_posts_published_at_id ON social_posts (published_at, id);",
+    "ANALYZE social_posts;",
+]
+
+def migrate():
+    print("Adding social_posts.search_vector...")
+    try:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in STATEMENTS:
+                conn.execute(text(statement))
+        print("✓ search_vector populated and indexed!")
+
+    except Exception as e:
+        print(f"✗ Error adding search_vector: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,41 @@
+"""
+Add the harvester's dedupe key to an existing database: social_posts.url_hash
+(sha256 of url, backfilled), a unique index on it, and the feed_states table.
+Rows sharing a URL are collapsed to the oldest first. Safe to re-run.
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.db.base  # registers all models
+
+from app.db.session import engine
+from app.models.feed_state import FeedState
+from sqlalchemy import text
+
+STATEMENTS = [
+    "ALTER TABLE social_posts ADD COLUMN IF NOT EXISTS url_hash VARCHAR(64);",
+    "UPDATE social_posts SET url_hash = encode(sha256(convert_to(url, 'UTF8')), 'hex') WHERE url_hash IS NULL AND url IS NOT NULL;",
+    """DELETE FROM social_posts p USING social_posts q
+       WHERE p.url_hash = q.url_hash AND p.id > q.id;""",
+    "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS social_posts_url_hash_key ON social_posts (url_hash);",
+]
+
+def migrate():
+    print("Adding social_posts.url_hash...")
+    try:
+        FeedState.__table__.create(bind=engine, checkfirst=True)
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in STATEMENTS:
+                conn.execute(text(statement))
+        print("✓ url_hash backfilled and indexed, feed_states ready!")
+
+    except Exception as e:
+        print(f"✗ Error adding url_hash: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
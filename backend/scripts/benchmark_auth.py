@@ -0,0 +1,76 @@
+"""
+Benchmark per-request user resolution: uncached DB lookup vs the resolved-user
+cache vs token claims (no lookup).
+
+Runs the deps functions directly against the configured database, for an
+existing account, so the numbers are the per-request saving without HTTP noise.
+
+Usage:
+    python scripts/benchmark_auth.py --email admin@tatsahayk.gov.in --iterations 2000
+"""
+import sys
+import os
+import argparse
+import statistics
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.db.base  # registers all models
+
+from app.api import deps
+from app.crud import user as crud_user
+from app.db.session import SessionLocal
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            fn(db)
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+    samples.sort()
+    return statistics.fmean(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def run(email, iterations):
+    db = SessionLocal()
+    try:
+        user = crud_user.get_user_by_email(db, email=email)
+        if user is None:
+            sys.exit(f"No user with email {email}")
+        claims = {"sub": user.email, "uid": user.id, "role": user.role,
+                  "district": user.district, "state": user.state}
+    finally:
+        db.close()
+
+    def uncached(db):
+        deps.invalidate_cached_user(email)
+        deps._resolve_user(db, email)
+
+    def cached(db):
+        deps._resolve_user(db, email)
+
+    def from_claims(db):
+        deps._principal_from_claims(claims)
+
+    cases = [("DB lookup (before)", uncached), ("user cache", cached), ("token claims", from_claims)]
+    print(f"{'resolution':>20} | {'mean ms':>8} | {'p95 ms':>8}")
+    baseline = None
+    for label, fn in cases:
+        mean, p95 = timed(fn, iterations)
+        baseline = baseline or mean
+        print(f"{label:>20} | {mean:>8.3f} | {p95:>8.3f}   saves {baseline - mean:.3f} ms/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.email, args.iterations)
@@ -0,0 +1,131 @@
+"""
+Benchmark /reports/hotspots clustering: PostGIS ST_ClusterDBSCAN vs the
+previous pure-Python greedy O(n²) loop.
+
+Synthetic reports are inserted inside a transaction that is rolled back,
+so the database is left untouched.
+
+Usage:
+    python scripts/benchmark_hotspots.py --sizes 1000 10000 100000
+"""
+import sys
+import os
+import argparse
+import math
+import random
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.db.base  # registers all models
+
+from sqlalchemy import insert
+from app.db.session import SessionLocal
+from app.models.report import Report
+from app.services.spatial_clustering import find_hotspots
+
+BENCH_DISTRICT = "__hotspot_benchmark__"
+HAZARDS = ["Flood", "Cyclone", "Tsunami", "Storm", "Oil Spill", "Earthquake"]
+SEVERITIES = ["low", "medium", "high", "critical"]
+
+
+def calculate_distance(lat1, lon1, lat2, lon2):
+    R = 6371.0
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (math.sin(dlat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+         math.sin(dlon / 2) ** 2)
+    return R * 2 * math.atan2(math.sqrt(min(1.0, a)), math.sqrt(1 - min(1.0, a)))
+
+
+def legacy_cluster_reports(reports, max_distance_km=80.0):
+    """The previous /reports/hotspots implementation, kept verbatim as the baseline."""
+    clusters = []
+    visited = set()
+    for i, report in enumerate(reports):
+        if i in visited:
+            continue
+        cluster = {
+            "center_lat": report.latitude,
+            "center_lon": report.longitude,
+            "hazard_type": report.hazard_type,
+            "severity": report.severity,
+            "report_count": 1,
+            "reports": [report.id]
+        }
+        visited.add(i)
+        for j, other in enumerate(reports):
+            if j not in visited and other.hazard_type == report.hazard_type:
+                dist = calculate_distance(
+                    report.latitude, report.longitude,
+                    other.latitude, other.longitude
+                )
+                if dist <= max_distance_km:
+                    cluster["report_count"] += 1
+                    cluster["reports"].append(other.id)
+                    visited.add(j)
+                    n = cluster["report_count"]
+                    cluster["center_lat"] = ((cluster["center_lat"] * (n - 1)) + other.latitude) / n
+                    cluster["center_lon"] = ((cluster["center_lon"] * (n - 1)) + other.longitude) / n
+                    if cluster["report_count"] >= 3:
+                        cluster["severity"] = "critical"
+        clusters.append(cluster)
+    return clusters
+
+
+def synthetic_reports(n, seed=42):
+    """Reports scattered around a few dozen event centres along the Indian coast."""
+    rng = random.Random(seed)
+    centres = [(rng.uniform(8.0, 23.0), rng.uniform(68.5, 88.0)) for _ in range(40)]
+    rows = []
+    for _ in range(n):
+        lat, lon = rng.choice(centres)
+        lat += rng.gauss(0, 0.6)
+        lon += rng.gauss(0, 0.6)
+        rows.append({
+            "hazard_type": rng.choice(HAZARDS),
+            "severity": rng.choice(SEVERITIES),
+            "status": "pending",
+            "district": BENCH_DISTRICT,
+            "location": f"SRID=4326;POINT({lon} {lat})",
+        })
+    return rows
+
+
+def run(sizes, radius_km, legacy_max):
+    print(f"{'reports':>8} | {'postgis (s)':>11} | {'legacy (s)':>10} | {'speedup':>7} | hotspots")
+    for n in sizes:
+        db = SessionLocal()
+        try:
+            db.execute(insert(Report), synthetic_reports(n))
+            db.flush()
+
+            start = time.perf_counter()
+            _, hotspots = find_hotspots(db, radius_km=radius_km, district=BENCH_DISTRICT)
+            postgis_s = time.perf_counter() - start
+
+            legacy_s = None
+            if n <= legacy_max:
+                start = time.perf_counter()
+                reports = db.query(Report).filter(Report.district == BENCH_DISTRICT).all()
+                legacy_cluster_reports(reports, max_distance_km=radius_km)
+                legacy_s = time.perf_counter() - start
+
+            legacy_col = f"{legacy_s:>10.3f}" if legacy_s is not None else f"{'skipped':>10}"
+            speedup = f"{legacy_s / postgis_s:>6.1f}x" if legacy_s is not None else f"{'-':>7}"
+            print(f"{n:>8} | {postgis_s:>11.3f} | {legacy_col} | {speedup} | {len(hotspots)}")
+        finally:
+            db.rollback()
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--radius-km", type=float, default=80.0)
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="Skip the O(n²) baseline above this many reports")
+    args = parser.parse_args()
+    run(args.sizes, args.radius_km, args.legacy_max)
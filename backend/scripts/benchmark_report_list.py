@@ -0,0 +1,148 @@
+"""
+Count the SQL statements one /reports page costs, per page size.
+
+Runs what GET /reports does for a page (crud.report.list_reports, the
+confirmed-ids lookup and the endpoint serializers) in full and minimal mode,
+next to the previous per-row pattern (lazy owner/media loads and one
+confirmation lookup per report). Full and minimal must cost the same number
+of statements at every page size; the script exits non-zero if they don't.
+
+Synthetic users, reports, media and confirmations are inserted inside a
+transaction that is rolled back, so the database is left untouched.
+
+Usage:
+    python scripts/benchmark_report_list.py --page-sizes 1 10 50 100
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.db.base  # registers all models
+
+from sqlalchemy import event, insert
+from app.api.deps import TokenPrincipal
+from app.api.v1.endpoints.reports import serialize_minimal_report, serialize_report
+from app.crud import report as crud_report
+from app.db.session import SessionLocal, engine
+from app.models.confirmation import ReportConfirmation
+from app.models.media import Media
+from app.models.report import Report
+from app.models.user import User
+
+BENCH_DISTRICT = "__report_list_benchmark__"
+HAZARDS = ["Flood", "Cyclone", "Tsunami", "Storm", "Oil Spill", "Earthquake"]
+SEVERITIES = ["low", "medium", "high", "critical"]
+MEDIA_PER_REPORT = 3
+OWNERS = 25
+
+
+class StatementCounter:
+    """Counts statements sent through the engine while active"""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, *_):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *_):
+        event.remove(engine, "before_cursor_execute", self._on_execute)
+
+
+def seed(db, n, seed=42):
+    rng = random.Random(seed)
+    user_ids = db.execute(insert(User).returning(User.id), [
+        {"email": f"bench{i}@{BENCH_DISTRICT}", "full_name": f"Bench User {i}", "hashed_password": "-"}
+        for i in range(OWNERS)
+    ]).scalars().all()
+    report_ids = db.execute(insert(Report).returning(Report.id), [
+        {
+            "user_id": rng.choice(user_ids),
+            "hazard_type": rng.choice(HAZARDS),
+            "severity": rng.choice(SEVERITIES),
+            "status": "pending",
+            "district": BENCH_DISTRICT,
+            "location": f"SRID=4326;POINT({rng.uniform(68.5, 88.0)} {rng.uniform(8.0, 23.0)})",
+        }
+        for _ in range(n)
+    ]).scalars().all()
+    db.execute(insert(Media), [
+        {"report_id": report_id, "file_path": f"https://example.invalid/{report_id}/{k}.jpg", "file_type": "image/jpeg"}
+        for report_id in report_ids for k in range(MEDIA_PER_REPORT)
+    ])
+    viewer_id = user_ids[0]
+    db.execute(insert(ReportConfirmation), [
+        {"report_id": report_id, "user_id": viewer_id} for report_id in report_ids[::3]
+    ])
+    db.flush()
+    return TokenPrincipal(id=viewer_id, email=f"bench0@{BENCH_DISTRICT}", role="citizen")
+
+
+def page(db, viewer, limit, minimal):
+    """What GET /reports does for one page"""
+    reports = crud_report.list_reports(db, district=BENCH_DISTRICT, limit=limit, minimal=minimal)
+    confirmed_ids = crud_report.get_confirmed_report_ids(db, viewer.id, [r.id for r in reports])
+    if minimal:
+        return [serialize_minimal_report(r, confirmed_ids) for r in reports]
+    return [serialize_report(r, confirmed_ids=confirmed_ids) for r in reports]
+
+
+def legacy_page(db, viewer, limit):
+    """The per-row pattern the list query layer replaced"""
+    reports = (
+        db.query(Report)
+        .filter(Report.district == BENCH_DISTRICT)
+        .order_by(Report.created_at.desc(), Report.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [serialize_report(r, viewer, db) for r in reports]
+
+
+def measure(db, fn):
+    db.expunge_all()  # nothing served from the identity map
+    with StatementCounter() as counter:
+        start = time.perf_counter()
+        rows = fn()
+        elapsed = time.perf_counter() - start
+    return counter.count, elapsed, len(rows)
+
+
+def run(page_sizes):
+    db = SessionLocal()
+    try:
+        viewer = seed(db, max(page_sizes))
+        print(f"{'page':>5} | {'full (q / ms)':>14} | {'minimal (q / ms)':>16} | {'per-row (q / ms)':>16}")
+        full_counts, minimal_counts = set(), set()
+        for limit in page_sizes:
+            full_q, full_s, _ = measure(db, lambda: page(db, viewer, limit, minimal=False))
+            minimal_q, minimal_s, _ = measure(db, lambda: page(db, viewer, limit, minimal=True))
+            legacy_q, legacy_s, _ = measure(db, lambda: legacy_page(db, viewer, limit))
+            full_counts.add(full_q)
+            minimal_counts.add(minimal_q)
+            print(f"{limit:>5} | {full_q:>4} / {full_s * 1000:>7.1f} | {minimal_q:>6} / {minimal_s * 1000:>7.1f} | {legacy_q:>6} / {legacy_s * 1000:>7.1f}")
+    finally:
+        db.rollback()
+        db.close()
+
+    if len(full_counts) == 1 and len(minimal_counts) == 1:
+        print(f"✓ Constant queries per page: full={full_counts.pop()}, minimal={minimal_counts.pop()}")
+    else:
+        print(f"✗ Query count grows with page size: full={sorted(full_counts)}, minimal={sorted(minimal_counts)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[1, 10, 50, 100])
+    args = parser.parse_args()
+    run(args.page_sizes)
@@ -0,0 +1,95 @@
+"""
+Build app/data/india_districts.geojson for the offline reverse geocoder.
+
+Run once during setup (and again to pick up boundary changes). Without it,
+every report is reverse geocoded through Nominatim at 1 request/second.
+
+Takes any district-level GeoJSON for India, from a URL or a local file
+(defaults to the public geohacker/india district export; DataMeet or GADM
+level-2 exports work too), keeps only the district/state names, simplifies
+the polygons and writes a compact FeatureCollection to
+DISTRICT_BOUNDARIES_PATH (or the default path).
+
+Usage:
+    python scripts/build_district_boundaries.py
+    python scripts/build_district_boundaries.py source_districts.geojson \\
+        --district-key dtname --state-key st_nm --tolerance 0.001
+"""
+import sys
+import os
+import argparse
+import json
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from shapely.geometry import mapping, shape
+from shapely.validation import make_valid
+
+from app.services.geocode import DISTRICT_KEYS, STATE_KEYS, DistrictIndex, boundaries_path
+
+DEFAULT_SOURCE = "https://raw.githubusercontent.com/geohacker/india/master/district/india_district.geojson"
+
+# A point that must resolve once the file is built (Chennai)
+SANITY_CHECK = (13.0827, 80.2707)
+
+
+def load_source(source):
+    if source.startswith(("http://", "https://")):
+        print(f"Downloading {source}...")
+        response = httpx.get(source, timeout=120, follow_redirects=True, headers={"User-Agent": "TatSahayk/1.0"})
+        response.raise_for_status()
+        return response.json()
+    with open(source, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build(source, output, district_key, state_key, tolerance):
+    collection = load_source(source)
+
+    features = []
+    skipped = 0
+    for feature in collection.get("features", []):
+        props = feature.get("properties") or {}
+        district = props.get(district_key) if district_key else next((props[k] for k in DISTRICT_KEYS if props.get(k)), None)
+        state = props.get(state_key) if state_key else next((props[k] for k in STATE_KEYS if props.get(k)), None)
+        if not district or not feature.get("geometry"):
+            skipped += 1
+            continue
+
+        geom = make_valid(shape(feature["geometry"]))
+        if tolerance:
+            geom = geom.simplify(tolerance, preserve_topology=True)
+        features.append({
+            "type": "Feature",
+            "properties": {"district": str(district).strip(), "state": str(state).strip() if state else None},
+            "geometry": mapping(geom),
+        })
+
+    if not features:
+        print(f"✗ No districts found in {source} ({skipped} features skipped); check --district-key")
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f, separators=(",", ":"))
+
+    print(f"✓ Wrote {len(features)} districts to {output} ({skipped} features skipped)")
+
+    hit = DistrictIndex.from_geojson(output).lookup(*SANITY_CHECK)
+    if hit:
+        print(f"✓ Sanity check: {SANITY_CHECK} -> {hit[0]}, {hit[1]}")
+    else:
+        print(f"✗ Sanity check: {SANITY_CHECK} is not inside any district; is the source India-wide?")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE, help="GeoJSON URL or file (default: %(default)s)")
+    parser.add_argument("--output", default=str(boundaries_path()))
+    parser.add_argument("--district-key", default=None, help="Property holding the district name (auto-detected if omitted)")
+    parser.add_argument("--state-key", default=None, help="Property holding the state name (auto-detected if omitted)")
+    parser.add_argument("--tolerance", type=float, default=0.001, help="Simplification tolerance in degrees (0 to disable)")
+    args = parser.parse_args()
+    build(args.source, args.output, args.district_key, args.state_key, args.tolerance)
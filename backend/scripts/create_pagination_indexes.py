@@ -0,0 +1,34 @@
+"""
+Create the composite indexes used by keyset pagination
+(reports feed and social feed). Safe to re-run.
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import engine
+from sqlalchemy import text
+
+INDEXES = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reports_created_at_id ON reports (created_at, id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_social_posts_published_at_id ON social_posts (published_at, id);",
+]
+
+def create_indexes():
+    print("Creating pagination indexes...")
+    try:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in INDEXES:
+                conn.execute(text(statement))
+                print(f"  - {statement.split(' ON ')[0].split()[-1]}")
+        print("✓ Indexes created successfully!")
+        
+    except Exception as e:
+        print(f"✗ Error creating indexes: {e}")
+        raise
+
+if __name__ == "__main__":
+    create_indexes()
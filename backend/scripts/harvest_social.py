@@ -1,12 +1,30 @@
+"""
+Social/news harvester: pulls the disaster RSS feeds below into social_posts.
+
+Feeds are fetched concurrently on a pooled HTTP client with conditional GETs
+(ETag / Last-Modified from feed_states), so unchanged feeds cost a 304. Each
+run's entries are deduplicated against social_posts.url_hash in one query and
+inserted in bulk with ON CONFLICT DO NOTHING. Per-feed latency and item counts
+are kept in feed_states and last_harvest_stats (/metrics).
+
+Usage:
+    python scripts/harvest_social.py
+"""
+import hashlib
 import feedparser
+import httpx
 import sys
 import os
-from datetime import datetime
-from time import mktime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 sys.path.append(os.getcwd())
 
-from app.db.session import SessionLocal
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.db.session import BackgroundSessionLocal
+from app.models.feed_state import FeedState
 from app.models.social import SocialPost
 
 # --- CONFIGURATION ---
@@ -69,54 +87,176 @@ def is_relevant_content(title, summary):
     
     return False
 
+# Pooled client shared by every run
+_http = httpx.Client(
+    timeout=settings.HARVEST_TIMEOUT_SECONDS,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=settings.HARVEST_CONCURRENCY),
+    headers={"User-Agent": "TatSahayk-Harvester/1.0"},
+)
+
+# Numbers from the most recent run, for /metrics
+last_harvest_stats = {}
+
+def url_hash(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+def fetch_feed(url, etag=None, last_modified=None):
+    """Conditional GET of one feed; a 304 comes back with no entries"""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    start = time.perf_counter()
+    result = {"status": None, "entries": [], "etag": etag, "last_modified": last_modified, "error": None}
+    try:
+        response = _http.get(url, headers=headers)
+        result["status"] = response.status_code
+        if response.status_code != 304:
+            response.raise_for_status()
+            result["entries"] = feedparser.parse(response.content).entries
+            result["etag"] = response.headers.get("ETag")
+            result["last_modified"] = response.headers.get("Last-Modified")
+    except httpx.HTTPError as e:
+        result["error"] = str(e)[:500]
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+def _post_row(entry, source, digest):
+    """social_posts row for a feed entry, or None if it is not relevant"""
+    # 1. Parse Date (feedparser normalises to UTC)
+    published_time = datetime.now(timezone.utc)
+    if entry.get("published_parsed"):
+        published_time = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+
+    # 2. Clean Content
+    title = entry.get("title", "")
+    content_text = title
+    summary = entry.get("summary", "")
+    if summary:
+        content_text += f"\n\n{summary}"
+
+    # 3. Filter irrelevant content
+    if not is_relevant_content(title, summary):
+        return None
+
+    return {
+        "source": source,
+        "author": entry.get("source", {}).get("title", "Unknown"),
+        "content": content_text,
+        "url": entry.link,
+        "url_hash": digest,
+        "published_at": published_time,
+    }
+
 def harvest():
-    db = SessionLocal()
+    db = BackgroundSessionLocal()
     print("Starting Social Harvest...")
+    started = time.perf_counter()
 
-    count = 0
-    filtered_count = 0
-    
-    for feed_info in RSS_FEEDS:
-        print(f"   Reading feed: {feed_info['source']}...")
-        feed = feedparser.parse(feed_info["url"])
-
-        for entry in feed.entries:
-            # 1. Check if we already have this post (Prevent Duplicates)
-            exists = db.query(SocialPost).filter(SocialPost.url == entry.link).first()
-            if exists:
-                continue
+    try:
+        states = {state.url: state for state in db.query(FeedState).all()}
+
+        def fetch(feed_info):
+            state = states.get(feed_info["url"])
+            return fetch_feed(
+                feed_info["url"],
+                etag=state.etag if state else None,
+                last_modified=state.last_modified if state else None,
+            )
 
-            # 2. Parse Date
-            published_time = datetime.now()
-            if hasattr(entry, "published_parsed") and entry.published_parsed:
-                published_time = datetime.fromtimestamp(mktime(entry.published_parsed))
+        with ThreadPoolExecutor(max_workers=settings.HARVEST_CONCURRENCY) as pool:
+            results = list(pool.map(fetch, RSS_FEEDS))
 
-            # 3. Clean Content
-            content_text = entry.title
-            summary = ""
-            if hasattr(entry, "summary"):
-                summary = entry.summary
-                content_text += f"\n\n{summary}"
+        # Entries from every feed, deduplicated within the batch
+        candidates = {}
+        for feed_info, result in zip(RSS_FEEDS, results):
+            for entry in result["entries"]:
+                if entry.get("link"):
+                    candidates.setdefault(url_hash(entry.link), (feed_info, entry))
 
-            # 4. Filter irrelevant content
-            if not is_relevant_content(entry.title, summary):
+        # One indexed lookup against what we already have
+        existing = set()
+        if candidates:
+            existing = {
+                digest for (digest,) in
+                db.query(SocialPost.url_hash).filter(SocialPost.url_hash.in_(list(candidates))).all()
+            }
+
+        rows, feed_of = [], {}
+        filtered_count = 0
+        for digest, (feed_info, entry) in candidates.items():
+            if digest in existing:
+                continue
+            row = _post_row(entry, feed_info["source"], digest)
+            if row is None:
                 filtered_count += 1
                 continue
+            rows.append(row)
+            feed_of[digest] = feed_info["url"]
 
-            # 5. Save to DB
-            post = SocialPost(
-                source=feed_info["source"],
-                author=entry.get("source", {}).get("title", "Unknown"),
-                content=content_text,
-                url=entry.link,
-                published_at=published_time
-            )
-            db.add(post)
-            count += 1
-    
-    db.commit()
-    db.close()
-    print(f"Harvest Complete. Added {count} new posts. Filtered out {filtered_count} irrelevant posts.")
+        # A concurrent run may have inserted some of these meanwhile
+        inserted = []
+        if rows:
+            inserted = db.execute(
+                insert(SocialPost).values(rows)
+                .on_conflict_do_nothing(index_elements=["url_hash"])
+                .returning(SocialPost.url_hash)
+            ).scalars().all()
+        new_per_feed = {}
+        for digest in inserted:
+            new_per_feed[feed_of[digest]] = new_per_feed.get(feed_of[digest], 0) + 1
+
+        now = datetime.now(timezone.utc)
+        feed_stats = []
+        for feed_info, result in zip(RSS_FEEDS, results):
+            state = states.get(feed_info["url"])
+            if state is None:
+                state = FeedState(url=feed_info["url"])
+                db.add(state)
+            state.source = feed_info["source"]
+            if result["error"] is None:
+                state.etag, state.last_modified = result["etag"], result["last_modified"]
+            state.last_status = result["status"]
+            state.last_fetched_at = now
+            state.last_latency_ms = result["latency_ms"]
+            state.last_item_count = len(result["entries"])
+            state.last_new_count = new_per_feed.get(feed_info["url"], 0)
+            state.last_error = result["error"]
+
+            feed_stats.append({
+                "url": feed_info["url"],
+                "source": feed_info["source"],
+                "status": result["status"],
+                "latency_ms": result["latency_ms"],
+                "items": len(result["entries"]),
+                "new": state.last_new_count,
+                "error": result["error"],
+            })
+            print(f"   {feed_info['source']}: HTTP {result['status']}, {len(result['entries'])} items, "
+                  f"{state.last_new_count} new ({result['latency_ms']:.0f} ms)"
+                  + (f" - {result['error']}" if result["error"] else ""))
+
+        db.commit()
+
+        duration = time.perf_counter() - started
+        last_harvest_stats.update({
+            "finished_at": now.isoformat(),
+            "duration_seconds": round(duration, 3),
+            "entries": len(candidates),
+            "already_stored": len(existing),
+            "filtered": filtered_count,
+            "inserted": len(inserted),
+            "feeds": feed_stats,
+        })
+        print(f"Harvest Complete in {duration:.2f}s. Added {len(inserted)} new posts. Filtered out {filtered_count} irrelevant posts.")
+    except Exception as e:
+        db.rollback()
+        print(f"Harvest failed: {e}")
+    finally:
+        db.close()
 
 if __name__ == "__main__":
-    harvest()
\ No newline at end of file
+    harvest()
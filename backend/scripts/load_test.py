@@ -0,0 +1,85 @@
+"""
+Concurrency / latency load test for read endpoints.
+
+Fires requests at increasing concurrency levels and reports throughput and
+p50/p95/p99 latency, so sync (threadpool) and async endpoint builds can be
+compared against the same database.
+
+Usage:
+    python scripts/load_test.py --base-url http://localhost:8000 \\
+        --path "/api/v1/reports/?minimal=true&all_reports=true" \\
+        --concurrency 10 50 100 200 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_level(client, url, concurrency, total, headers):
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(url, headers=headers)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+    }
+
+
+async def main(args):
+    url = args.base_url.rstrip("/") + args.path
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+
+    print(f"GET {url}")
+    print(f"{'conc':>5} | {'reqs':>6} | {'errors':>6} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8}")
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for level in args.concurrency:
+            r = await run_level(client, url, level, args.requests, headers)
+            print(f"{r['concurrency']:>5} | {r['requests']:>6} | {r['errors']:>6} | {r['rps']:>8.1f} | "
+                  f"{r['p50']:>8.1f} | {r['p95']:>8.1f} | {r['p99']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/v1/reports/?minimal=true&all_reports=true")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument("--token", default=None, help="Optional bearer token")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,56 @@
+"""
+Local stand-in for a Rekognition completion notification.
+
+Finishes an open video_analysis_jobs row with a fabricated label-detection
+result instead of calling AWS, so the write-back path can be exercised
+without Rekognition or SNS.
+
+Usage:
+    python scripts/simulate_video_job.py --report-id 42 --labels Water Flood Rain
+    python scripts/simulate_video_job.py --report-id 42 --failed
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.db.base  # registers all models
+
+from app.db.session import SessionLocal
+from app.models.video_job import VideoAnalysisJob
+from app.services.rekognition_video import resume_video_job
+
+
+def simulate(report_id, labels, failed):
+    db = SessionLocal()
+    try:
+        job = db.query(VideoAnalysisJob).filter(
+            VideoAnalysisJob.report_id == report_id,
+            VideoAnalysisJob.status == "in_progress"
+        ).with_for_update().first()
+        if job is None:
+            sys.exit(f"No open video job for report {report_id}")
+
+        if failed:
+            page = {"JobStatus": "FAILED", "StatusMessage": "Simulated failure"}
+        else:
+            page = {
+                "JobStatus": "SUCCEEDED",
+                "Labels": [{"Timestamp": i * 1000, "Label": {"Name": name, "Confidence": 90.0}}
+                           for i, name in enumerate(labels)],
+            }
+        resume_video_job(db, job, first_page=page)
+        print(f"Job {job.rekognition_job_id} -> {job.status}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--report-id", type=int, required=True)
+    parser.add_argument("--labels", nargs="*", default=["Water", "Flood"])
+    parser.add_argument("--failed", action="store_true")
+    args = parser.parse_args()
+    simulate(args.report_id, args.labels, args.failed)
@@ -20,6 +20,15 @@ const LocationPrompt = ({ user, onClose }) => {
     fetchLocation();
   }, []);
 
+  // The backend returns a token carrying the new district/state; keep it so
+  // location-scoped requests don't keep using the old claims
+  const saveLocation = async (district, state) => {
+    const res = await axiosInstance.patch('/auth/update-location', { district, state });
+    if (res.data?.access_token) {
+      localStorage.setItem('token', res.data.access_token);
+    }
+  };
+
   const fetchLocation = async () => {
     setLoading(true);
     setError('');
@@ -48,7 +57,7 @@ const LocationPrompt = ({ user, onClose }) => {
 
             if (district && state) {
               // Update user location in backend
-              await axiosInstance.patch('/auth/update-location', { district, state });
+              await saveLocation(district, state);
               toast.success(`Location set to ${district}, ${state}`);
               onClose();
             } else {
@@ -83,10 +92,7 @@ const LocationPrompt = ({ user, onClose }) => {
 
     setLoading(true);
     try {
-      await axiosInstance.patch('/auth/update-location', { 
-      district: location.district, 
-      state: location.state 
-    });
+      await saveLocation(location.district, location.state);
       toast.success(`Location set to ${location.district}, ${location.state}`);
       onClose();
     } catch (err) {